@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for the checklist engine.
+
+Run a benchmark from the repository root, eg.
+
+    python -m benchmarks bench_rule_plan
+
+Benchmarks use benchmarks.settings and run against a fresh in-memory SQLite test database,
+which is set up by benchmarks.__main__ before the benchmark is imported.
+"""
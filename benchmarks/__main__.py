@@ -0,0 +1,38 @@
+"""
+Sets up Django and a test database, then runs a benchmark module's main function, eg.
+
+    python -m benchmarks bench_rule_plan
+    python -m benchmarks suite --compare baseline.json
+
+Any arguments after the module name are passed on to it.
+"""
+import importlib
+import os
+import sys
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    from django.db import connection
+    connection.creation.create_test_db(verbosity=0)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        sys.exit('Usage: python -m benchmarks <module> [arguments]')
+
+    name, args = argv[0], argv[1:]
+    # Benchmark modules import models, so Django must be set up first.
+    setup_django()
+    module = importlib.import_module('benchmarks.{}'.format(name))
+    sys.argv = [module.__file__] + args
+    module.main()
+
+
+if __name__ == '__main__':
+    main()
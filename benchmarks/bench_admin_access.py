@@ -0,0 +1,59 @@
+"""
+Compares the cost of checking that an editor can access the Wagtail admin, which the checklist API
+does on every request, for editors in more and more groups with more and more permissions.
+Each check loads the user again, as a new request would. The queries column is the number of queries
+made by has_perm / can_access_admin.
+"""
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.generators import create_editor
+from wagtail_checklist.permissions import ADMIN_PERMISSION, can_access_admin
+
+CHECKS = 200
+
+
+def bench_all_permissions(user_id):
+    # This is what the checklist API used to do on every request.
+    user = User.objects.get(pk=user_id)
+    assert ADMIN_PERMISSION in user.get_all_permissions()
+
+
+def bench_has_perm(user_id):
+    user = User.objects.get(pk=user_id)
+    assert user.has_perm(ADMIN_PERMISSION)
+
+
+def bench_can_access_admin(user_id):
+    user = User.objects.get(pk=user_id)
+    assert can_access_admin(user)
+
+
+def count_queries(func, user_id):
+    with CaptureQueriesContext(connection) as context:
+        func(user_id)
+
+    # Leave out the query which loads the user, which the auth middleware makes anyway.
+    return len(context) - 1
+
+
+def main():
+    print('{:>7} {:>12} {:>15} {:>15} {:>15} {:>8}'.format(
+        'groups', 'perms/group', 'all (us)', 'has_perm (us)', 'cached (us)', 'queries'
+    ))
+    for num_groups, permissions_per_group in ((1, 10), (5, 50), (20, 200)):
+        cache.clear()
+        user = create_editor(num_groups, permissions_per_group, username='editor_{}'.format(num_groups))
+        results = []
+        for func in (bench_all_permissions, bench_has_perm, bench_can_access_admin):
+            func(user.pk)  # Warm the cache
+            results.append(timeit.timeit(lambda: func(user.pk), number=CHECKS) / CHECKS * 1e6)
+
+        queries = '{}/{}'.format(count_queries(bench_has_perm, user.pk), count_queries(bench_can_access_admin, user.pk))
+        print('{:>7} {:>12} {:>15.1f} {:>15.1f} {:>15.1f} {:>8}'.format(
+            num_groups, permissions_per_group, *results, queries
+        ))
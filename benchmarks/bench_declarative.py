@@ -0,0 +1,72 @@
+"""
+Compares checking many pages against simple rules written as functions, against the same rules written
+declaratively: page by page with check_rules, and all at once with check_rules_bulk, as the audit does.
+"""
+import re
+import timeit
+
+from wagtail.core.models import Page
+
+from benchmarks.generators import build_rich_text, reset_registries
+from benchmarks.models import BenchNewsPage
+from wagtail_checklist.declarative import LengthRule, RegexRule, RequiredRule
+from wagtail_checklist.rules import check_rules, check_rules_bulk, register_error_rule, register_warning_rule
+
+REPEATS = 3
+SLUG_RE = re.compile(r'^[a-z0-9-]+$')
+
+
+def register_function_rules():
+    reset_registries()
+
+    @register_error_rule(BenchNewsPage, 'title', 'Title is required', fields=['title'])
+    def validate_title_required(page, parent):
+        return bool(page.title and page.title.strip())
+
+    @register_error_rule(BenchNewsPage, 'title', 'Title is too long', fields=['title'])
+    def validate_title_length(page, parent):
+        return len(page.title) <= 20
+
+    @register_warning_rule(BenchNewsPage, 'title', 'Title is too short', fields=['title'])
+    def validate_title_minimum_length(page, parent):
+        return len(page.title) >= 10
+
+    @register_error_rule(BenchNewsPage, 'slug', 'Slug is invalid', fields=['slug'])
+    def validate_slug(page, parent):
+        return SLUG_RE.search(page.slug) is not None
+
+    @register_warning_rule(BenchNewsPage, 'body', 'Body is too short', fields=['body'])
+    def validate_body_length(page, parent):
+        return len(page.body) >= 100
+
+
+def register_declarative_rules():
+    reset_registries()
+    register_error_rule(BenchNewsPage, 'title', 'Title is required')(RequiredRule('title'))
+    register_error_rule(BenchNewsPage, 'title', 'Title is too long')(LengthRule('title', max=20))
+    register_warning_rule(BenchNewsPage, 'title', 'Title is too short')(LengthRule('title', min=10))
+    register_error_rule(BenchNewsPage, 'slug', 'Slug is invalid')(RegexRule('slug', SLUG_RE.pattern))
+    register_warning_rule(BenchNewsPage, 'body', 'Body is too short')(LengthRule('body', min=100))
+
+
+def check_each(pages, parent):
+    for page in pages:
+        check_rules(BenchNewsPage, page, parent)
+
+
+def main():
+    parent = Page(title='News', slug='news')
+    print('{:>7} {:>16} {:>16} {:>16}'.format('pages', 'functions (ms)', 'declarative (ms)', 'bulk (ms)'))
+    for num_pages in (100, 1000, 5000):
+        pages = [
+            BenchNewsPage(title='News story {}'.format(i), slug='news-story-{}'.format(i), body=build_rich_text(2, i))
+            for i in range(num_pages)
+        ]
+        parents = [parent] * num_pages
+
+        register_function_rules()
+        functions = min(timeit.repeat(lambda: check_each(pages, parent), number=1, repeat=REPEATS))
+        register_declarative_rules()
+        declarative = min(timeit.repeat(lambda: check_each(pages, parent), number=1, repeat=REPEATS))
+        bulk = min(timeit.repeat(lambda: check_rules_bulk(BenchNewsPage, pages, parents), number=1, repeat=REPEATS))
+        print('{:>7} {:>16.1f} {:>16.1f} {:>16.1f}'.format(num_pages, functions * 1e3, declarative * 1e3, bulk * 1e3))
@@ -0,0 +1,29 @@
+"""
+Compares building the edit handler and form class for a page with a wide StreamField
+on every request against the per-class cache in wagtail_checklist.forms.
+"""
+import timeit
+
+from benchmarks.models import WideStreamFieldPage
+from wagtail_checklist.forms import clear_form_class_cache, get_form_class
+
+REQUESTS = 50
+
+
+def build_uncached():
+    WideStreamFieldPage.get_edit_handler.cache_clear()
+    edit_handler = WideStreamFieldPage.get_edit_handler()
+    edit_handler.get_form_class()
+
+
+def build_cached():
+    get_form_class(WideStreamFieldPage)
+
+
+def main():
+    clear_form_class_cache()
+    uncached = timeit.timeit(build_uncached, number=REQUESTS) / REQUESTS
+    cached = timeit.timeit(build_cached, number=REQUESTS) / REQUESTS
+    print('{:>10} {:>16}'.format('', 'ms per request'))
+    print('{:>10} {:>16.3f}'.format('uncached', uncached * 1e3))
+    print('{:>10} {:>16.3f}'.format('cached', cached * 1e3))
@@ -0,0 +1,61 @@
+"""
+Compares checking a page against section-specific rules which check the section themselves, against the same
+rules registered with a guard, which skips the rules for other sections before any of them are checked.
+"""
+import timeit
+
+from wagtail.core.models import Page
+
+from benchmarks.generators import build_rich_text, reset_registries
+from benchmarks.models import BenchNewsPage
+from wagtail_checklist.rules import check_rules, register_warning_rule
+
+REPEATS = 5
+NUMBER = 20
+RULES_PER_SECTION = 10
+
+
+def make_rule(section, threshold):
+    def validate_body_length(page, parent):
+        if parent.slug != section:
+            return True
+
+        return len(page.body) >= threshold
+
+    return validate_body_length
+
+
+def make_guard(section):
+    def is_in_section(page, parent):
+        return parent.slug == section
+
+    return is_in_section
+
+
+def register_section_rules(sections, guarded):
+    reset_registries()
+    for section in sections:
+        guard = make_guard(section) if guarded else None
+        for i in range(RULES_PER_SECTION):
+            message = 'Body should be longer for {} ({})'.format(section, i)
+            register_warning_rule(BenchNewsPage, 'body', message, when=guard)(make_rule(section, i * 10))
+
+
+def main():
+    page = BenchNewsPage(title='News story', slug='news-story', body=build_rich_text(5, 0))
+    print('{:>9} {:>7} {:>16} {:>12} {:>17}'.format(
+        'sections', 'rules', 'unguarded (ms)', 'guarded (ms)', 'checked (guarded)'
+    ))
+    for num_sections in (1, 4, 16):
+        sections = ['section-{}'.format(i) for i in range(num_sections)]
+        parent = Page(title='Section 0', slug=sections[0])
+
+        register_section_rules(sections, guarded=False)
+        unguarded = min(timeit.repeat(lambda: check_rules(BenchNewsPage, page, parent), number=NUMBER, repeat=REPEATS))
+        register_section_rules(sections, guarded=True)
+        guarded = min(timeit.repeat(lambda: check_rules(BenchNewsPage, page, parent), number=NUMBER, repeat=REPEATS))
+        num_checked = len(check_rules(BenchNewsPage, page, parent)[1])
+        print('{:>9} {:>7} {:>16.2f} {:>12.2f} {:>17}'.format(
+            num_sections, num_sections * RULES_PER_SECTION, unguarded / NUMBER * 1e3, guarded / NUMBER * 1e3,
+            num_checked,
+        ))
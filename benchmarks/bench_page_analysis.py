@@ -0,0 +1,44 @@
+"""
+Compares the latency of check_rules when each rule parses the page body itself, against rules
+which share the page analysis, as the number of rules reading the body grows.
+"""
+import timeit
+
+from wagtail.core.models import Page
+
+from benchmarks.generators import build_rich_text, reset_registries
+from benchmarks.models import BenchNewsPage
+from wagtail_checklist.analysis import PageAnalysis
+from wagtail_checklist.rules import check_rules, register_error_rule
+
+NUM_PARAGRAPHS = 200
+REPEATS = 20
+
+
+def validate_body_parsed(page, parent):
+    # This is what each rule had to do before the analysis was shared.
+    return 'mongoose' not in PageAnalysis(page).field('body').words
+
+
+def validate_body_analysed(page, parent, analysis):
+    return 'mongoose' not in analysis.field('body').words
+
+
+def register_rules(num_rules, uses_analysis):
+    reset_registries()
+    func = validate_body_analysed if uses_analysis else validate_body_parsed
+    for i in range(num_rules):
+        register_error_rule(BenchNewsPage, 'body', 'Body rule {}'.format(i), uses_analysis=uses_analysis)(func)
+
+
+def main():
+    page = BenchNewsPage(title='A very long article', body=build_rich_text(NUM_PARAGRAPHS))
+    parent = Page(title='Articles', slug='articles')
+    print('{:>6} {:>18} {:>18}'.format('rules', 'parsed (ms)', 'shared (ms)'))
+    for num_rules in (1, 5, 20, 50):
+        timings = []
+        for uses_analysis in (False, True):
+            register_rules(num_rules, uses_analysis)
+            timings.append(timeit.timeit(lambda: check_rules(BenchNewsPage, page, parent), number=REPEATS) / REPEATS)
+
+        print('{:>6} {:>18.2f} {:>18.2f}'.format(num_rules, *(timing * 1e3 for timing in timings)))
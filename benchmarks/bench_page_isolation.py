@@ -0,0 +1,52 @@
+"""
+Compares the latency and peak memory of check_rules in each page isolation mode,
+for a page with a large StreamField body.
+"""
+import time
+import tracemalloc
+
+from django.test import override_settings
+from wagtail.core.models import Page
+
+from benchmarks.generators import build_stream_page, reset_registries
+from benchmarks.models import WideStreamFieldPage
+from wagtail_checklist.rules import check_rules, register_error_rule
+
+NUM_RULES = 40
+NUM_BLOCKS = 500
+REPEATS = 5
+
+
+def register_rules():
+    reset_registries()
+    for i in range(NUM_RULES):
+        register_error_rule(WideStreamFieldPage, 'body', 'Body rule {}'.format(i))(validate_body_not_empty)
+
+
+def validate_body_not_empty(page, parent):
+    return len(page.body) > 0
+
+
+def measure(isolation, page, parent):
+    with override_settings(WAGTAIL_CHECKLIST_ISOLATION=isolation):
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            check_rules(WideStreamFieldPage, page, parent)
+        latency = (time.perf_counter() - start) / REPEATS
+
+        tracemalloc.start()
+        check_rules(WideStreamFieldPage, page, parent)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return latency, peak
+
+
+def main():
+    register_rules()
+    page = build_stream_page(NUM_BLOCKS)
+    parent = Page(title='Articles', slug='articles')
+    print('{:>10} {:>14} {:>16}'.format('isolation', 'latency (ms)', 'peak memory (KB)'))
+    for isolation in ('rule', 'request'):
+        latency, peak = measure(isolation, page, parent)
+        print('{:>10} {:>14.2f} {:>16.0f}'.format(isolation, latency * 1e3, peak / 1024))
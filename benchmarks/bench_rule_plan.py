@@ -0,0 +1,32 @@
+"""
+Compares the cost of looking up the rules for a Page class by walking the registries (get_rules)
+against looking up a compiled RulePlan (get_rule_plan), as the number of registered classes grows.
+"""
+import timeit
+
+from benchmarks.generators import build_registries
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.rules import get_rule_plan, get_rules
+
+RULES_PER_CLASS = 5
+LOOKUPS = 1000
+
+
+def bench_registry_walk(page_class):
+    # This is what check_rules used to do on every request.
+    get_rules(page_class, rule_module.error_rules_registry)
+    get_rules(page_class, rule_module.warning_rules_registry)
+
+
+def bench_rule_plan(page_class):
+    get_rule_plan(page_class)
+
+
+def main():
+    print('{:>8} {:>18} {:>18}'.format('classes', 'walk (us/lookup)', 'plan (us/lookup)'))
+    for num_classes in (10, 60, 250, 1000):
+        page_class = build_registries(num_classes, RULES_PER_CLASS)
+        get_rule_plan(page_class)  # Warm the cache
+        walk = timeit.timeit(lambda: bench_registry_walk(page_class), number=LOOKUPS)
+        plan = timeit.timeit(lambda: bench_rule_plan(page_class), number=LOOKUPS)
+        print('{:>8} {:>18.2f} {:>18.2f}'.format(num_classes, walk / LOOKUPS * 1e6, plan / LOOKUPS * 1e6))
@@ -0,0 +1,60 @@
+"""
+Compares finding banned terms in a page body by searching for each term in turn, as rules do by hand,
+against a compiled TermMatcher, as the term list grows. Compiling a matcher is a one-off cost,
+paid when the rule is registered.
+"""
+import random
+import string
+import timeit
+
+from benchmarks.generators import build_text
+from wagtail_checklist.terms import TermMatcher
+
+TEXT_WORDS = 2000
+REPEATS = 5
+
+
+def build_terms(num_terms, seed=0):
+    """
+    Returns `num_terms` made up terms, one in ten of which are two words long.
+    """
+    generator = random.Random(seed)
+
+    def build_word():
+        return ''.join(generator.choice(string.ascii_lowercase) for _ in range(generator.randint(5, 10)))
+
+    return [build_word() + (' ' + build_word() if i % 10 == 0 else '') for i in range(num_terms)]
+
+
+def find_terms_naively(terms, text):
+    # This is what the README's banned words example does.
+    lower_text = text.lower()
+    return [term for term in terms if term in lower_text]
+
+
+def time_call(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEATS)) * 1e3
+
+
+def main():
+    text = build_text(TEXT_WORDS)
+    # The words and substrings columns time TermMatcher.find, with and without whole_words.
+    print('{:>7} {:>11} {:>14} {:>14} {:>14} {:>14}'.format(
+        'terms', 'naive (ms)', 'words (ms)', 'build (ms)', 'substr (ms)', 'build (ms)'
+    ))
+    for num_terms in (100, 1000, 20000, 100000):
+        terms = build_terms(num_terms)
+        # Make sure there is something to find.
+        text_with_terms = text + ' ' + terms[-1]
+        word_matcher = TermMatcher(terms)
+        substring_matcher = TermMatcher(terms, whole_words=False)
+        assert set(word_matcher.find(text_with_terms)) <= set(find_terms_naively(terms, text_with_terms))
+
+        print('{:>7} {:>11.2f} {:>14.2f} {:>14.2f} {:>14.2f} {:>14.2f}'.format(
+            num_terms,
+            time_call(lambda: find_terms_naively(terms, text_with_terms)),
+            time_call(lambda: word_matcher.find(text_with_terms)),
+            time_call(lambda: TermMatcher(terms)),
+            time_call(lambda: substring_matcher.find(text_with_terms)),
+            time_call(lambda: TermMatcher(terms, whole_words=False)),
+        ))
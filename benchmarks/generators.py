@@ -0,0 +1,207 @@
+"""
+Synthetic pages, page data and rule registries for the benchmarks.
+"""
+import json
+import random
+
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from wagtail.core.models import Page
+
+from benchmarks.models import NUM_BLOCK_TYPES, BenchBlogPage, BenchNewsPage, WideStreamFieldPage
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.rules import Rule, dont_check_rule, register_error_rule, register_warning_rule
+
+WORDS = ['mongoose', 'news', 'article', 'checklist', 'editor', 'publish', 'page', 'rule', 'draft', 'title']
+
+
+def reset_registries():
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def always_pass(page, parent):
+    return True
+
+
+class BenchPage:
+    """
+    Stands in for Page - registry lookups only care about the class hierarchy.
+    """
+    pass
+
+
+def build_registries(num_classes, rules_per_class):
+    """
+    Populate the rule registries with `num_classes` page classes, each with some rules.
+    Returns the most-derived page class.
+    """
+    reset_registries()
+    page_class = BenchPage
+    for i in range(num_classes):
+        # Alternate between deepening the hierarchy and adding siblings which don't apply.
+        base = page_class if i % 2 else BenchPage
+        cls = type('BenchPage{}'.format(i), (base,), {})
+        if i % 2:
+            page_class = cls
+        rule_module.error_rules_registry[cls] = [
+            Rule(always_pass, 'field{}'.format(j), 'Error {}'.format(j)) for j in range(rules_per_class)
+        ]
+        rule_module.warning_rules_registry[cls] = [
+            Rule(always_pass, 'field{}'.format(j), 'Warning {}'.format(j)) for j in range(rules_per_class)
+        ]
+        rule_module.ignored_rules_registry[cls] = {'field0'}
+
+    return page_class
+
+
+def build_text(num_words, seed=0):
+    """
+    Returns `num_words` words of filler text. The same seed always gives the same text.
+    """
+    generator = random.Random(seed)
+    return ' '.join(generator.choice(WORDS) for _ in range(num_words))
+
+
+def build_rich_text(num_paragraphs, seed=0):
+    return ''.join('<p>{}</p>'.format(build_text(50, seed=seed + i)) for i in range(num_paragraphs))
+
+
+def build_stream_data(num_blocks, items_per_block=3):
+    """
+    Returns the JSON data for a WideStreamFieldPage body with `num_blocks` blocks.
+    """
+    return [
+        {
+            'type': 'block_{}'.format(i % NUM_BLOCK_TYPES),
+            'value': {
+                'heading': 'Heading {}'.format(i),
+                'text': '<p>{}</p>'.format(build_text(30, seed=i)),
+                'items': [build_text(3, seed=i + j) for j in range(items_per_block)],
+            },
+        }
+        for i in range(num_blocks)
+    ]
+
+
+def build_stream_page(num_blocks):
+    """
+    Returns an unsaved WideStreamFieldPage with a body of `num_blocks` blocks.
+    """
+    return WideStreamFieldPage(
+        title='A very long article', slug='a-very-long-article', body=json.dumps(build_stream_data(num_blocks))
+    )
+
+
+def build_stream_form_data(num_blocks, items_per_block=3):
+    """
+    Returns the form data which the Wagtail editor posts for a WideStreamFieldPage with `num_blocks` blocks.
+    """
+    data = {'title': 'A very long article', 'slug': 'a-very-long-article', 'body-count': str(num_blocks)}
+    for i, block in enumerate(build_stream_data(num_blocks, items_per_block)):
+        prefix = 'body-{}'.format(i)
+        data.update({
+            prefix + '-deleted': '',
+            prefix + '-order': str(i),
+            prefix + '-type': block['type'],
+            prefix + '-id': '',
+            prefix + '-value-heading': block['value']['heading'],
+            prefix + '-value-text': get_contentstate(block['value']['text']),
+            prefix + '-value-items-count': str(items_per_block),
+        })
+        for j, item in enumerate(block['value']['items']):
+            item_prefix = '{}-value-items-{}'.format(prefix, j)
+            data.update({item_prefix + '-deleted': '', item_prefix + '-order': str(j), item_prefix + '-value': item})
+
+    return data
+
+
+def get_contentstate(html):
+    """
+    Returns Draftail's contentstate JSON for a single plain paragraph, as posted by the editor.
+    """
+    text = html.replace('<p>', '').replace('</p>', '')
+    block = {'key': 'a', 'type': 'unstyled', 'depth': 0, 'text': text, 'inlineStyleRanges': [], 'entityRanges': []}
+    return json.dumps({'blocks': [block], 'entityMap': {}})
+
+
+def create_site_root():
+    """
+    Returns a new root page, which synthetic pages can be added under.
+    """
+    root = Page(title='Benchmarks')
+    Page.add_root(instance=root)
+    return root
+
+
+def create_demo_pages(parent, num_pages, num_paragraphs=5):
+    """
+    Creates `num_pages` pages under `parent`, alternating between blog and news pages.
+    Returns the ids of the new pages.
+    """
+    page_ids = []
+    for i in range(num_pages):
+        page_class = BenchNewsPage if i % 2 else BenchBlogPage
+        page = page_class(title='Page number {}'.format(i), body=build_rich_text(num_paragraphs, seed=i))
+        parent.add_child(instance=page)
+        page_ids.append(page.pk)
+
+    return page_ids
+
+
+def create_superuser():
+    user, _ = User.objects.get_or_create(username='benchmarks', defaults={'is_superuser': True})
+    return user
+
+
+def create_editor(num_groups, permissions_per_group, username='editor'):
+    """
+    Creates a user who can access the Wagtail admin through one of `num_groups` groups,
+    each of which has `permissions_per_group` permissions, like editors on a large site.
+    """
+    content_type = ContentType.objects.get_for_model(BenchBlogPage)
+    permissions = [
+        Permission.objects.get_or_create(
+            content_type=content_type, codename='bench_{}'.format(i), defaults={'name': 'Bench {}'.format(i)}
+        )[0]
+        for i in range(permissions_per_group)
+    ]
+    admin_permission = Permission.objects.get(content_type__app_label='wagtailadmin', codename='access_admin')
+
+    user = User.objects.create(username=username)
+    for i in range(num_groups):
+        group = Group.objects.create(name='{} group {}'.format(username, i))
+        group.permissions.add(*permissions)
+        user.groups.add(group)
+
+    group.permissions.add(admin_permission)
+    return user
+
+
+def register_demo_rules():
+    """
+    Registers the same rules as the demo site, for BenchBlogPage and BenchNewsPage.
+    """
+    reset_registries()
+
+    @register_warning_rule(Page, 'title', 'Title should be 10 characters or more.', fields=['title'])
+    def validate_page_title_minimum_length(page, parent):
+        return page.title and len(page.title) >= 10
+
+    @register_error_rule(Page, 'title', 'Title cannot be longer than 20 characters.', fields=['title'])
+    def validate_page_title_maximum_length(page, parent):
+        return page.title and len(page.title) < 21
+
+    @register_warning_rule(BenchNewsPage, 'body', 'Body should contain the word "news".', fields=['body'])
+    def validate_news_body(page, parent):
+        return 'news' in page.body.lower()
+
+    @register_error_rule(
+        Page, 'banned words', 'The body cannot contain the word "mongoose".', fields=['body'], uses_analysis=True
+    )
+    def validate_body_banned_words(page, parent, analysis):
+        return 'mongoose' not in analysis.field('body').lower_text
+
+    dont_check_rule(BenchBlogPage, 'banned words')
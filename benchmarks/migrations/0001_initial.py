@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-16 18:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+import wagtail.core.blocks
+import wagtail.core.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('wagtailcore', '0041_group_collection_permissions_verbose_name_plural'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WideStreamFieldPage',
+            fields=[
+                ('page_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='wagtailcore.Page')),
+                ('body', wagtail.core.fields.StreamField([('block_0', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_1', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_2', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_3', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_4', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_5', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_6', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_7', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_8', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_9', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_10', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_11', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_12', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_13', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_14', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_15', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_16', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_17', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_18', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_19', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_20', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_21', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_22', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_23', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_24', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_25', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_26', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_27', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_28', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_29', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_30', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_31', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_32', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_33', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_34', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_35', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_36', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_37', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_38', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))])), ('block_39', wagtail.core.blocks.StructBlock([('heading', wagtail.core.blocks.CharBlock()), ('text', wagtail.core.blocks.RichTextBlock()), ('items', wagtail.core.blocks.ListBlock(wagtail.core.blocks.CharBlock()))]))])),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=('wagtailcore.page',),
+        ),
+    ]
@@ -0,0 +1,51 @@
+"""
+Page models used by the benchmarks.
+"""
+from wagtail.admin.edit_handlers import FieldPanel, StreamFieldPanel
+from wagtail.core import blocks
+from wagtail.core.fields import RichTextField, StreamField
+from wagtail.core.models import Page
+
+NUM_BLOCK_TYPES = 40
+
+
+class WideStreamFieldPage(Page):
+    """
+    A page with a StreamField which has many block types, which makes its form expensive to build.
+    """
+    body = StreamField([
+        ('block_{}'.format(i), blocks.StructBlock([
+            ('heading', blocks.CharBlock()),
+            ('text', blocks.RichTextBlock()),
+            ('items', blocks.ListBlock(blocks.CharBlock())),
+        ]))
+        for i in range(NUM_BLOCK_TYPES)
+    ])
+
+    content_panels = Page.content_panels + [
+        StreamFieldPanel('body'),
+    ]
+
+
+class BenchBlogPage(Page):
+    """
+    Mirrors the demo site's BlogPage.
+    """
+    body = RichTextField(features=['bold', 'h2'])
+
+    content_panels = [
+        FieldPanel('title', classname='full title'),
+        FieldPanel('body', classname='full'),
+    ]
+
+
+class BenchNewsPage(Page):
+    """
+    Mirrors the demo site's NewsPage.
+    """
+    body = RichTextField(features=['bold', 'h2'])
+
+    content_panels = [
+        FieldPanel('title', classname='full title'),
+        FieldPanel('body', classname='full'),
+    ]
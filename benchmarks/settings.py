@@ -0,0 +1,10 @@
+from test_settings import *  # noqa
+
+INSTALLED_APPS = INSTALLED_APPS + ['benchmarks']  # noqa
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
@@ -0,0 +1,291 @@
+"""
+Runs every benchmark case, and saves or compares the results against a baseline.
+
+    python -m benchmarks suite --save baseline.json
+    python -m benchmarks suite --compare baseline.json
+    python -m benchmarks suite --filter check_rules
+
+Each case is timed several times, and the median and fastest times are reported. When comparing,
+cases whose median is more than --threshold times slower than the baseline are flagged as regressions,
+and the command exits with status 1. Baselines only make sense on the machine which saved them.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from collections import OrderedDict
+
+import django
+import wagtail
+from django.contrib.auth.models import User
+from django.test import Client, override_settings
+from django.urls import reverse
+from wagtail.core.models import Page
+
+from benchmarks.generators import (build_registries, build_stream_form_data, build_stream_page, create_demo_pages,
+                                   create_editor, create_site_root, create_superuser, register_demo_rules,
+                                   reset_registries)
+from benchmarks.models import WideStreamFieldPage
+from wagtail_checklist.forms import get_form_class
+from wagtail_checklist.permissions import can_access_admin
+from wagtail_checklist.rules import check_rules, get_rule_plan, get_rules, register_error_rule
+from wagtail_checklist.serializers import BatchChecklistSerializer
+
+REPEATS = 5
+# Each timing runs a case enough times to take at least this many seconds.
+MIN_TIMING_SECONDS = 0.2
+
+# Benchmark cases, in the order they are run. Each is a function which sets up the case,
+# and returns a function to time.
+cases = OrderedDict()
+
+
+def case(name):
+    def wrapper(func):
+        cases[name] = func
+        return func
+
+    return wrapper
+
+
+for num_classes, rules_per_class in ((10, 5), (250, 5), (250, 50)):
+    @case('get_rules[classes={},rules={}]'.format(num_classes, rules_per_class))
+    def setup_get_rules(num_classes=num_classes, rules_per_class=rules_per_class):
+        from wagtail_checklist import rules as rule_module
+        page_class = build_registries(num_classes, rules_per_class)
+        return lambda: get_rules(page_class, rule_module.error_rules_registry)
+
+    @case('get_rule_plan[classes={},rules={}]'.format(num_classes, rules_per_class))
+    def setup_get_rule_plan(num_classes=num_classes, rules_per_class=rules_per_class):
+        page_class = build_registries(num_classes, rules_per_class)
+        get_rule_plan(page_class)
+        return lambda: get_rule_plan(page_class)
+
+
+def validate_body_length(page, parent):
+    return len(page.body) > 0
+
+
+def validate_title_length(page, parent):
+    return len(page.title) > 0
+
+
+for num_blocks in (10, 200):
+    for isolation in ('request', 'rule'):
+        @case('check_rules[blocks={},isolation={}]'.format(num_blocks, isolation))
+        def setup_check_rules(num_blocks=num_blocks, isolation=isolation):
+            reset_registries()
+            for i in range(10):
+                register_error_rule(WideStreamFieldPage, 'body', 'Body rule {}'.format(i))(validate_body_length)
+
+            page = build_stream_page(num_blocks)
+            parent = Page(title='Articles', slug='articles')
+
+            def run():
+                with override_settings(WAGTAIL_CHECKLIST_ISOLATION=isolation):
+                    check_rules(WideStreamFieldPage, page, parent)
+
+            return run
+
+
+for num_blocks in (10, 50):
+    @case('form_validation[blocks={}]'.format(num_blocks))
+    def setup_form_validation(num_blocks=num_blocks):
+        _, form_class = get_form_class(WideStreamFieldPage)
+        data = build_stream_form_data(num_blocks)
+        parent = Page(title='Articles', slug='articles')
+
+        def run():
+            form = form_class(data, instance=WideStreamFieldPage(), parent_page=parent)
+            assert form.is_valid(), form.errors
+
+        return run
+
+
+for num_blocks in (10, 50):
+    @case('api_post[blocks={}]'.format(num_blocks))
+    def setup_api_post(num_blocks=num_blocks):
+        reset_registries()
+        for i in range(10):
+            register_error_rule(WideStreamFieldPage, 'body', 'Body rule {}'.format(i))(validate_body_length)
+
+        page = build_stream_page(num_blocks)
+        create_site_root().add_child(instance=page)
+        client = Client()
+        client.force_login(create_superuser())
+        url = reverse('wagtail_checklist_api')
+        data = json.dumps({
+            'url': 'http://localhost/admin/pages/{}/edit/'.format(page.pk),
+            'action': 'EDIT',
+            'page': build_stream_form_data(num_blocks),
+        })
+
+        def run():
+            # Identical requests would otherwise be answered from the result cache.
+            with override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=0):
+                response = client.post(url, data=data, content_type='application/json')
+                assert response.status_code == 200, response.content
+
+        return run
+
+
+@case('api_post[page]')
+def setup_plain_api_post():
+    reset_registries()
+    for i in range(10):
+        register_error_rule(Page, 'title', 'Title rule {}'.format(i))(validate_title_length)
+
+    parent = create_site_root()
+    client = Client()
+    client.force_login(create_superuser())
+    url = reverse('wagtail_checklist_api')
+    data = json.dumps({
+        'url': 'http://localhost/admin/pages/add/wagtailcore/page/{}/'.format(parent.pk),
+        'action': 'CREATE',
+        'page': {'title': 'A plain page', 'slug': 'a-plain-page'},
+    })
+
+    def run():
+        with override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=0):
+            response = client.post(url, data=data, content_type='application/json')
+            assert response.status_code == 200, response.content
+
+    return run
+
+
+@case('demo_api_post[news]')
+def setup_demo_api_post():
+    register_demo_rules()
+    parent = create_site_root()
+    client = Client()
+    client.force_login(create_superuser())
+    url = reverse('wagtail_checklist_api')
+    data = json.dumps({
+        'url': 'http://localhost/admin/pages/add/benchmarks/benchnewspage/{}/'.format(parent.pk),
+        'action': 'CREATE',
+        'page': {'title': 'Breaking news', 'slug': 'breaking-news', 'body': '<p>Some news</p>'},
+    })
+
+    def run():
+        with override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=0):
+            response = client.post(url, data=data, content_type='application/json')
+            assert response.status_code == 200, response.content
+
+    return run
+
+
+@case('admin_access[groups=20,perms=200]')
+def setup_admin_access():
+    user_id = create_editor(20, 200).pk
+    return lambda: can_access_admin(User.objects.get(pk=user_id))
+
+
+for num_pages in (50, 500):
+    @case('demo_saved_pages[pages={}]'.format(num_pages))
+    def setup_demo_saved_pages(num_pages=num_pages):
+        register_demo_rules()
+        page_ids = create_demo_pages(create_site_root(), num_pages)
+        serializer = BatchChecklistSerializer()
+        return lambda: list(serializer.iter_saved_page_checklists(page_ids))
+
+
+def time_case(func):
+    """
+    Returns a list of REPEATS timings of `func`, in seconds per call.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < MIN_TIMING_SECONDS and number < 10 ** 6:
+        number *= 2
+
+    return [total / number for total in timer.repeat(repeat=REPEATS, number=number)]
+
+
+def run_cases(name_filter=None):
+    """
+    Runs the cases whose names contain `name_filter`, and returns their median and fastest times in ms.
+    Cases which fail are reported and left out of the results.
+    """
+    results = OrderedDict()
+    for name, setup in cases.items():
+        if name_filter and name_filter not in name:
+            continue
+
+        try:
+            timings = time_case(setup())
+        except Exception as e:
+            # A broken case shouldn't stop the others from being measured.
+            print('{:<45} failed: {!r}'.format(name, e))
+            continue
+
+        results[name] = {'median': statistics.median(timings) * 1000, 'min': min(timings) * 1000}
+        print_result(name, results[name])
+
+    return results
+
+
+def print_result(name, result, baseline=None, threshold=None):
+    line = '{:<45} {:>12.4f} {:>12.4f}'.format(name, result['median'], result['min'])
+    if baseline:
+        ratio = result['median'] / baseline['median']
+        flag = 'REGRESSION' if ratio > threshold else ''
+        line += ' {:>12.4f} {:>8.2f}x {}'.format(baseline['median'], ratio, flag)
+
+    print(line)
+
+
+def get_environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'wagtail': wagtail.__version__,
+        'machine': platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints each result next to its baseline, and returns the names of the cases which have regressed.
+    """
+    print('\n{:<45} {:>12} {:>12} {:>12} {:>9}'.format('case', 'median (ms)', 'min (ms)', 'baseline', 'ratio'))
+    regressions = []
+    for name, result in results.items():
+        case_baseline = baseline['results'].get(name)
+        print_result(name, result, case_baseline, threshold)
+        if case_baseline and result['median'] / case_baseline['median'] > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Runs the checklist benchmarks.')
+    parser.add_argument('--filter', help='Only run cases whose names contain this text.')
+    parser.add_argument('--save', metavar='PATH', help='Save the results as a baseline.')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results against a saved baseline.')
+    parser.add_argument(
+        '--threshold', type=float, default=1.25,
+        help='Flag cases whose median is this many times slower than the baseline.'
+    )
+    args = parser.parse_args(argv)
+
+    print('{:<45} {:>12} {:>12}'.format('case', 'median (ms)', 'min (ms)'))
+    results = run_cases(args.filter)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': get_environment(), 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if baseline['environment'] != get_environment():
+            print('\nWarning: the baseline was saved in a different environment: {}'.format(baseline['environment']))
+
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('\n{} cases regressed: {}'.format(len(regressions), ', '.join(regressions)))
+            sys.exit(1)
@@ -31,7 +31,7 @@ class NewsPage(Page):
 #   - make the checklist button turn yellow
 #   - show an error message in the modal
 #   - not block publish
-@register_warning_rule(Page, 'title', 'Title should be 10 characters or more.')
+@register_warning_rule(Page, 'title', 'Title should be 10 characters or more.', fields=['title'])
 def validate_page_title_minimum_length(page, parent):
     """
     Ensure the page title is at least 10 characters long
@@ -43,7 +43,7 @@ def validate_page_title_minimum_length(page, parent):
 #   - make the checklist button turn red
 #   - show an error message in the modal
 #   - block publish (via HTML only)
-@register_error_rule(Page, 'title', 'Title cannot be longer than 20 characters.')
+@register_error_rule(Page, 'title', 'Title cannot be longer than 20 characters.', fields=['title'])
 def validate_page_title_maximum_length(page, parent):
     """
     Ensure the page title is at least 10 characters long
@@ -53,7 +53,7 @@ def validate_page_title_maximum_length(page, parent):
 
 # You can create rules that only apply to particular Page subclasses.
 # For example, this rule will apply to NewsPage and not BlogPage
-@register_warning_rule(NewsPage, 'body', 'Body should contain the word \"news\".')
+@register_warning_rule(NewsPage, 'body', 'Body should contain the word \"news\".', fields=['body'])
 def validate_page_title_minimum_length(page, parent):
     """
     Ensure our news page articles are newsworthy by warning users if there is no "news"
@@ -71,11 +71,15 @@ def validate_page_title_minimum_length(page, parent):
 # As a result:
 #   - 'mongoose' in the body of a NewsPage will be invalid
 #   - 'mongoose' in the body of a BlogPage will be valid
-@register_error_rule(Page, 'banned words', 'The body cannot contain the word \"mongoose\".')
-def validate_body_banned_words(page, parent):
+# This rule also uses the page analysis, which parses the body once for every rule which asks for it.
+# Like a substring check on the body, it also catches words such as 'mongooses'.
+@register_error_rule(
+    Page, 'banned words', 'The body cannot contain the word \"mongoose\".', fields=['body'], uses_analysis=True
+)
+def validate_body_banned_words(page, parent, analysis):
     """
     Ensure there are no banned words in the page body
     """
-    return 'mongoose' not in page.body.lower()
+    return 'mongoose' not in analysis.field('body').lower_text
 
 dont_check_rule(BlogPage, 'banned words')
@@ -1,59 +1,253 @@
 import Cookies from 'js-cookie'
 import { isEditPage, isCreatePage, getCurrentURL } from './utils'
 
-module.exports = {
-  checklist: {
-    get: () => {
-      // Figure out whether we are on a 'create' or 'edit' page,
-      let action
-      const currentUrl = getCurrentURL()
-      if (isEditPage()) {
-        action = 'EDIT'
-      } else if (isCreatePage()) {
-        action = 'CREATE'
-      } else {
-        console.error(`Current URL ${currentUrl} is not a valid checklist URL`)
-        return
-      }
+// Fingerprint of the last checked page data, sent back so the API only re-checks changed rules.
+let fingerprint = null
+// The page data which was checked to give `fingerprint`, so later requests only send the changes.
+let fingerprintPageData = null
 
-      // Read form data
-      const form = $('#page-edit-form')
-      if (!form) {
-        console.error('No form found on page')
-        return
-      }
+// The WebSocket connection to the checklist consumer, and the page data it was last sent.
+let socket = null
+let socketPageData = null
+// Callbacks for the check which is waiting on the WebSocket.
+let socketCheck = null
+// The number of aborted checks whose results are still to arrive on the WebSocket, and should be ignored.
+// The server answers messages in order, so these always arrive before the current check's results.
+let socketSkip = 0
+
+// Build the request body from the editor form.
+const getRequestBody = () => {
+  // Figure out whether we are on a 'create' or 'edit' page,
+  let action
+  const currentUrl = getCurrentURL()
+  if (isEditPage()) {
+    action = 'EDIT'
+  } else if (isCreatePage()) {
+    action = 'CREATE'
+  } else {
+    console.error(`Current URL ${currentUrl} is not a valid checklist URL`)
+    return
+  }
 
-      const pageData = form.serializeArray().reduce((acc,val) => {
-          acc[val['name']] = val['value']
-          return acc
-      }, {})
+  // Read form data
+  const form = $('#page-edit-form')
+  if (!form) {
+    console.error('No form found on page')
+    return
+  }
+
+  const pageData = form.serializeArray().reduce((acc,val) => {
+      acc[val['name']] = val['value']
+      return acc
+  }, {})
+
+  if (!window.CHECKLIST || !window.CHECKLIST.API_URL) {
+    throw Error(`Configuration error: wagtail_checklist could not read window.CHECKLIST: ${window.CHECKLIST}`)
+  }
+
+  return {
+    url: currentUrl,
+    action: action,
+    page: pageData,
+    fingerprint: fingerprint,
+  }
+}
 
-      const body = {
-        url: currentUrl,
-        action: action,
-        page: pageData,
+// Set localStorage.checklistProfile to ask the API for a breakdown of the time taken by each phase,
+// which is logged to the console. Requires the WAGTAIL_CHECKLIST_PROFILING setting.
+const getHeaders = () => {
+  const headers = {
+    'X-CSRFToken': Cookies.get('csrftoken'),
+    'Content-Type': 'application/json; charset=utf-8',
+  }
+  if (window.localStorage && window.localStorage.getItem('checklistProfile')) {
+    headers['X-Checklist-Profile'] = '1'
+  }
+  return headers
+}
+
+const post = (url, body, signal) => fetch(url, {
+  method: 'POST',
+  signal: signal,
+  credentials: 'include',
+  headers: getHeaders(),
+  body: JSON.stringify(body),
+})
+.then(r => {
+  if (!r.ok) {
+    const error = Error(r.statusText)
+    error.status = r.status
+    throw error
+  }
+  return r
+})
+
+// Find the fields which have changed or been removed between two sets of page data.
+const getChanges = (previous, current) => {
+  const changed = {}
+  for (let name in current) {
+    if (previous[name] !== current[name]) {
+      changed[name] = current[name]
+    }
+  }
+  const removed = Object.keys(previous).filter(name => !(name in current))
+  return { changed, removed }
+}
+
+// POST only the fields which have changed since the last checked page data.
+// If the server no longer has that page data, POST the full page instead.
+const postChanges = (url, body, signal) => {
+  if (!fingerprint || !fingerprintPageData) {
+    return post(url, body, signal)
+  }
+  const { changed, removed } = getChanges(fingerprintPageData, body.page)
+  const changesBody = { url: body.url, action: body.action, fingerprint: body.fingerprint, changed, removed }
+  return post(url, changesBody, signal).catch(error => {
+    if (error.status === 409) {
+      return post(url, body, signal)
+    }
+    throw error
+  })
+}
+
+// Remember the fingerprint of the checked page data for the next request.
+const updateFingerprint = (body, data) => {
+  if (data.profile) {
+    console.table(data.profile.phases)
+    console.table(data.profile.rules)
+  }
+  fingerprint = data.fingerprint || null
+  fingerprintPageData = fingerprint ? body.page : null
+  return data
+}
+
+// Build a message with only the fields which have changed since the last message on the socket.
+const getSocketMessage = body => {
+  if (!socketPageData) {
+    return { url: body.url, action: body.action, page: body.page }
+  }
+  return getChanges(socketPageData, body.page)
+}
+
+const connectSocket = () => new Promise((resolve, reject) => {
+  if (socket && socket.readyState === WebSocket.OPEN) {
+    resolve(socket)
+    return
+  }
+  const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
+  const newSocket = new WebSocket(`${protocol}//${window.location.host}${window.CHECKLIST.WEBSOCKET_URL}`)
+  newSocket.onopen = () => {
+    socket = newSocket
+    socketPageData = null
+    resolve(socket)
+  }
+  newSocket.onerror = reject
+  newSocket.onclose = () => {
+    socket = null
+    socketSkip = 0
+    if (socketCheck) {
+      socketCheck.reject(Error('Checklist connection closed'))
+      socketCheck = null
+    }
+  }
+  newSocket.onmessage = e => {
+    const { event, data } = JSON.parse(e.data)
+    if (socketSkip) {
+      if (event === 'done' || event === 'error') {
+        socketSkip -= 1
       }
+      return
+    }
+    if (!socketCheck) return
+    if (event === 'result') {
+      socketCheck.onResult(data)
+    } else if (event === 'done') {
+      socketCheck.resolve(data)
+      socketCheck = null
+    } else if (event === 'error') {
+      // The server could not apply the message, so send the full page next time.
+      socketPageData = null
+      socketCheck.reject(Error(JSON.stringify(data.error)))
+      socketCheck = null
+    }
+  }
+})
+
+// Send the page, or the fields which have changed, over the WebSocket.
+const streamSocket = (body, onResult, signal) => connectSocket()
+.then(socket => new Promise((resolve, reject) => {
+  const check = { onResult, resolve, reject }
+  socketCheck = check
+  signal.addEventListener('abort', () => {
+    if (socketCheck === check) {
+      socketCheck = null
+      socketSkip += 1
+      reject(new DOMException('Checklist check was aborted', 'AbortError'))
+    }
+  })
+  socket.send(JSON.stringify(getSocketMessage(body)))
+  socketPageData = body.page
+}))
 
-      if (!window.CHECKLIST || !window.CHECKLIST.API_URL) {
-        throw Error(`Configuration error: wagtail_checklist could not read window.CHECKLIST: ${window.CHECKLIST}`)
+// POST the page and read the results from a stream of server-sent events.
+const streamHTTP = (body, onResult, signal) => postChanges(window.CHECKLIST.STREAM_URL, body, signal)
+.then(r => {
+  const reader = r.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  let done = null
+  const read = () => reader.read().then(chunk => {
+    buffer += decoder.decode(chunk.value || new Uint8Array(), { stream: !chunk.done })
+    const messages = buffer.split('\n\n')
+    buffer = messages.pop()
+    for (let message of messages) {
+      const lines = message.split('\n')
+      const event = lines[0].slice('event: '.length)
+      const data = JSON.parse(lines[1].slice('data: '.length))
+      if (event === 'result') {
+        onResult(data)
+      } else if (event === 'done') {
+        done = data
       }
+    }
+    if (chunk.done) {
+      if (!done) {
+        throw Error('Checklist stream ended early')
+      }
+      return done
+    }
+    return read()
+  })
+  return read()
+})
+
+const isAbortError = error => error.name === 'AbortError'
 
-      return fetch(window.CHECKLIST.API_URL, {
-        method: 'POST',
-        credentials: 'include',
-        headers: {
-          'X-CSRFToken': Cookies.get('csrftoken'),
-          'Content-Type': 'application/json; charset=utf-8',
-        },
-        body: JSON.stringify(body),
-      })
-      .then(r => {
-        if (!r.ok) {
-          throw Error(r.statusText)
-        }
-        return r
-      })
+module.exports = {
+  checklist: {
+    // Read the request body from the editor form, or undefined if it can't be read.
+    getBody: getRequestBody,
+    get: () => {
+      const body = getRequestBody()
+      if (!body) return
+
+      return postChanges(window.CHECKLIST.API_URL, body)
       .then(r => r.json())
-    }
-  }
+      .then(data => updateFingerprint(body, data))
+    },
+    // Check the page data in `body`, calling onResult with each rule result as soon as it has been checked.
+    // Uses a WebSocket when one is configured, and otherwise a stream of server-sent events.
+    // The check is cancelled when `signal` (from an AbortController) is aborted.
+    // Returns a promise of the full checklist.
+    stream: (body, onResult, signal) => {
+      const check = window.CHECKLIST.WEBSOCKET_URL
+        ? streamSocket(body, onResult, signal).catch(error => {
+          if (isAbortError(error)) throw error
+          return streamHTTP(body, onResult, signal)
+        })
+        : streamHTTP(body, onResult, signal)
+      return check.then(data => updateFingerprint(body, data))
+    },
+  },
+  isAbortError,
 }
@@ -6,11 +6,17 @@ import ChecklistModal from './modal'
 
 import api from './api'
 import { VALIDATION_TYPES } from './constants'
-import { debounce, isEditPage, isCreatePage } from './utils'
+import { adaptiveDebounce, isEditPage, isCreatePage } from './utils'
 
 import styles from './styles/checklist-button.css'
 
 const SECOND = 1000 // ms
+// Delays between the editor's last change and checking the page
+const DEFAULT_DELAY = 2 * SECOND
+const MIN_DELAY = 0.5 * SECOND
+const MAX_DELAY = 5 * SECOND
+// The delay, as a multiple of the average time taken to check the page
+const LATENCY_FACTOR = 3
 
 class App extends Component {
 
@@ -29,29 +35,101 @@ class App extends Component {
   }
 
   componentDidMount() {
-    // If the user interacts with the document, then send a debouced API request
+    // If the user interacts with the document, then check the form after a debounce,
     // except when they click the footer - we do not want "publish" clicks to fire this event
-    const debouncedFetch = debounce(2 * SECOND)(this.fetchChecklist)
-    debouncedFetch()
+    const debouncedCheck = adaptiveDebounce(this.getDebounceDelay)(this.checkForChanges)
+    debouncedCheck()
 
     const footer = document.querySelector('footer')
     // Event handler for user interaction
     const onChange = e => {
       if (footer.contains(e.target)) return
-      // Lock the publish button
+      // Lock the publish button straight away, in case the form has changed. It is unlocked again
+      // once the check finds that it hasn't, or the changed page has been checked.
       this.updatePublishButton(false)
-      debouncedFetch()
+      debouncedCheck()
     }
-    // Fire on click, keypress or paste, anywhere but the footer
+    // Fire on input, click, keypress or paste, anywhere but the footer. Clicks and key presses are
+    // needed for widgets which update hidden inputs without firing events, eg. choosers and StreamFields.
+    document.addEventListener('input', onChange)
+    document.addEventListener('change', onChange)
     document.addEventListener('click', onChange)
     document.addEventListener('keydown', onChange)
     document.addEventListener('paste', onChange)
   }
 
-  fetchChecklist = () => {
-    api.checklist.get()
-    .then(data => this.updateChecklist(data.checklist))
-    .catch(console.error)
+  // Wait for a few round trips to the server between checks, so editors on a slow connection
+  // or with slow rules don't queue up requests, within MIN_DELAY and MAX_DELAY.
+  getDebounceDelay = () => {
+    if (this.latency === undefined) return DEFAULT_DELAY
+    return Math.min(MAX_DELAY, Math.max(MIN_DELAY, LATENCY_FACTOR * this.latency))
+  }
+
+  // Check the page if the form has changed since the last check.
+  checkForChanges = () => {
+    const body = api.checklist.getBody()
+    if (!body) return
+
+    // Compare the whole form rather than a hash of it, since a collision would unlock publishing
+    // for page data which hasn't been checked.
+    const formData = body.url + JSON.stringify(body.page)
+    if (formData === this.checkedFormData) {
+      // The form is the same as when it was last checked. Unless that check is still running,
+      // which unlocks the publish button when it finishes, restore the button from its checklist.
+      if (!this.abortController) {
+        this.updatePublishButton(!this.state.hasFailed)
+      }
+      return
+    }
+    this.checkedFormData = formData
+    this.fetchChecklist(body)
+  }
+
+  fetchChecklist = body => {
+    // Lock the publish button until the page has been checked
+    this.updatePublishButton(false)
+
+    // Cancel the previous check, since its results are out of date
+    if (this.abortController) {
+      this.abortController.abort()
+    }
+    const abortController = new AbortController()
+    this.abortController = abortController
+
+    // Show each rule result as soon as it arrives, replacing the result for the same rule
+    // from the last check, until the full checklist arrives.
+    const results = {}
+    const onResult = result => {
+      if (abortController.signal.aborted) return
+      results[result.key] = result
+      const checklist = Object.assign({}, this.state.checklist)
+      for (let key in results) {
+        const { name, isValid, hasError, type, message } = results[key]
+        checklist[name] = (checklist[name] || [])
+          .filter(validation => validation.message !== message)
+          .concat([{ isValid, hasError, type, message }])
+      }
+      this.updateChecklist(checklist, true)
+    }
+    const startTime = Date.now()
+    api.checklist.stream(body, onResult, abortController.signal)
+    .then(data => {
+      // Keep a moving average of the time taken to check the page
+      const latency = Date.now() - startTime
+      this.latency = this.latency === undefined ? latency : 0.7 * this.latency + 0.3 * latency
+      this.updateChecklist(data.checklist)
+    })
+    .catch(error => {
+      if (api.isAbortError(error)) return
+      // Check the page again after the next change, even if the form is the same as before.
+      this.checkedFormData = null
+      console.error(error)
+    })
+    .then(() => {
+      if (this.abortController === abortController) {
+        this.abortController = null
+      }
+    })
   }
 
   updatePublishButton = canPublish => {
@@ -63,7 +141,7 @@ class App extends Component {
     }
   }
 
-  updateChecklist = checklist => {
+  updateChecklist = (checklist, isPartial = false) => {
     let numPassed = 0
     let numFailed = 0
     let hasWarnings = false
@@ -82,8 +160,9 @@ class App extends Component {
         hasWarnings |= !validation.isValid && validation.type === VALIDATION_TYPES.WARNING
       }
     }
-    // Lock the publish button if there is a failed validation, otherwise unlock it
-    this.updatePublishButton(!hasFailed)
+    // Lock the publish button if there is a failed validation, otherwise unlock it,
+    // but only once every rule has been checked.
+    this.updatePublishButton(!hasFailed && !isPartial)
     this.setState({
       numPassed: numPassed,
       numFailed: numFailed,
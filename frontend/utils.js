@@ -16,8 +16,20 @@ const debounce = delay => {
   }
 }
 
+// Debounce user input, with a delay which can change between calls
+const adaptiveDebounce = getDelay => {
+  let timer = null
+  return func => {
+      return (...args) => {
+        clearTimeout(timer)
+        timer = setTimeout(() => func( ...args), getDelay())
+      }
+  }
+}
+
 
 module.exports = {
+  adaptiveDebounce,
   debounce,
   getCurrentURL,
   isEditPage,
@@ -12,7 +12,7 @@ setup(
     name='wagtail-checklist',
     version=__version__,
 
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*', 'testapp', 'testapp.*']),
     include_package_data=True,
 
     description='A checklist for the Wagtail CMS editor.',
@@ -11,6 +11,8 @@ INSTALLED_APPS = [
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
+    'wagtail_checklist',
+    'testapp',
 ]
 
 MIDDLEWARE = [
@@ -0,0 +1,3 @@
+"""
+Page models used by the tests.
+"""
@@ -0,0 +1,15 @@
+from django.db import models
+from wagtail.core import blocks
+from wagtail.core.fields import StreamField
+from wagtail.core.models import Page
+
+
+class ArticlePage(Page):
+    """
+    A Page subclass, for tests which need a specific page type.
+    """
+    subtitle = models.CharField(max_length=255, blank=True)
+    body = StreamField([
+        ('heading', blocks.CharBlock()),
+        ('paragraph', blocks.TextBlock()),
+    ], blank=True)
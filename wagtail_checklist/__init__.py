@@ -1,2 +1,4 @@
 VERSION = (0, 0, 1)
 __version__ = '.'.join([str(x) for x in VERSION])
+
+default_app_config = 'wagtail_checklist.apps.WagtailChecklistConfig'
@@ -0,0 +1,185 @@
+"""
+A shared analysis of a page's fields, for rules which parse the same content.
+
+Rules registered with `uses_analysis=True` are passed a PageAnalysis as a third argument. It is
+created once per check, and shared by all of the check's rules, so work such as parsing the body's
+HTML is done once on first use rather than once per rule:
+
+    @register_error_rule(ArticlePage, 'body', 'Body cannot contain "mongoose"', uses_analysis=True)
+    def validate_body_banned_words(page, parent, analysis):
+        return 'mongoose' not in analysis.field('body').words
+
+The analysis describes the page as it was before any rules ran, and must not be modified by rules.
+"""
+import re
+import threading
+from html import escape
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+from wagtail.core.blocks import StreamValue
+from wagtail.core.rich_text import RichText
+
+WORD_RE = re.compile(r'\w+')
+
+
+class lazy_property:
+    """
+    Like property, but the value is only computed once, on first access, and then stored on the instance.
+    Instances must have a `lock`, so that threads checking rules in parallel don't compute the same value twice.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        with instance.lock:
+            try:
+                return instance.__dict__[self.name]
+            except KeyError:
+                value = instance.__dict__[self.name] = self.func(instance)
+                return value
+
+
+class PageAnalysis:
+    """
+    Lazily computed analyses of a page's fields, shared by the rules in a check.
+    """
+    def __init__(self, page):
+        self.page = page
+        # Shared with each FieldAnalysis. Re-entrant, since analyses build on each other.
+        self.lock = threading.RLock()
+        self.fields = {}
+
+    def field(self, name):
+        """
+        Returns the FieldAnalysis for the page's field (or other attribute) called `name`.
+        """
+        with self.lock:
+            try:
+                return self.fields[name]
+            except KeyError:
+                analysis = self.fields[name] = FieldAnalysis(getattr(self.page, name), self.lock)
+                return analysis
+
+    def __getstate__(self):
+        # Rules checked by a process pool are sent the page, and analyse it again in the worker process.
+        return {'page': self.page}
+
+    def __setstate__(self, state):
+        self.__init__(state['page'])
+
+
+class FieldAnalysis:
+    """
+    Lazily computed analyses of a single field value, which may be a string of HTML, RichText or a StreamValue.
+    """
+    def __init__(self, value, lock):
+        self.value = value
+        self.lock = lock
+
+    @lazy_property
+    def html(self):
+        """
+        The field's HTML. For a StreamField, this is the HTML of every text value in its blocks, in order.
+        """
+        return ''.join(iter_html(self.value))
+
+    @lazy_property
+    def dom(self):
+        """
+        The field's HTML, parsed by BeautifulSoup.
+        """
+        return BeautifulSoup(self.html, 'html.parser')
+
+    @lazy_property
+    def text(self):
+        """
+        The field's text, without HTML tags and with whitespace collapsed.
+        This doesn't need the DOM, which is slower to build.
+        """
+        parser = TextParser()
+        parser.feed(self.html)
+        parser.close()
+        return ' '.join(' '.join(parser.parts).split())
+
+    @lazy_property
+    def lower_text(self):
+        return self.text.lower()
+
+    @lazy_property
+    def words(self):
+        """
+        A tuple of the lowercased words in the field's text.
+        """
+        return tuple(WORD_RE.findall(self.lower_text))
+
+    @lazy_property
+    def blocks(self):
+        """
+        A dict of the values of a StreamField's top level blocks, keyed by block type, in order.
+        Empty if the field is not a StreamField.
+        """
+        blocks = {}
+        if isinstance(self.value, StreamValue):
+            for child in self.value:
+                blocks.setdefault(child.block_type, []).append(child.value)
+
+        return blocks
+
+
+class TextParser(HTMLParser):
+    """
+    Collects the text in a string of HTML, leaving out scripts and styles.
+    """
+    SKIPPED_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipped_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self.skipped_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self.skipped_depth:
+            self.skipped_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skipped_depth:
+            self.parts.append(data)
+
+
+def iter_html(value):
+    """
+    Yields the HTML of each piece of text in `value`, searching through StreamField blocks, struct blocks and lists.
+    """
+    if isinstance(value, RichText):
+        yield value.source
+    elif isinstance(value, str):
+        yield value
+    elif isinstance(value, StreamValue):
+        for child in value:
+            yield from iter_html_block(child.value)
+
+
+def iter_html_block(value):
+    # Text in blocks may be plain, so it is escaped and given its own paragraph to keep words apart.
+    if isinstance(value, RichText):
+        yield value.source
+    elif isinstance(value, str):
+        yield '<p>{}</p>'.format(escape(value))
+    elif isinstance(value, StreamValue):
+        yield from iter_html(value)
+    elif isinstance(value, dict):
+        for child_value in value.values():
+            yield from iter_html_block(child_value)
+    elif isinstance(value, (list, tuple)):
+        for child_value in value:
+            yield from iter_html_block(child_value)
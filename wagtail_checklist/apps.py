@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class WagtailChecklistConfig(AppConfig):
+    name = 'wagtail_checklist'
+    verbose_name = 'Wagtail checklist'
+
+    def ready(self):
+        from . import permissions, status
+        permissions.connect_signals()
+        status.connect_signals()
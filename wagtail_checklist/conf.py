@@ -0,0 +1,81 @@
+"""
+Settings for the checklist app.
+
+Each setting can be overridden in the Django settings module by prefixing its name
+with WAGTAIL_CHECKLIST_, eg. WAGTAIL_CHECKLIST_ISOLATION = 'rule'
+"""
+from django.conf import settings
+
+DEFAULTS = {
+    # How page instances are protected from rules that modify them:
+    #   - 'request': copy the page and parent once per request, shared by all rules
+    #   - 'rule': copy the page and parent once for every rule
+    # Rules registered with mutates_page=True always receive their own copy.
+    'ISOLATION': 'request',
+    # How rules are run:
+    #   - 'serial': one after another, in the request thread
+    #   - 'thread': fanned out over a pool of threads
+    #   - 'process': fanned out over a pool of processes - rule functions must be importable
+    'EXECUTOR': 'serial',
+    # The number of workers in the thread / process pool, None uses the concurrent.futures default.
+    'MAX_WORKERS': None,
+    # Seconds to wait for each rule when using a pool, counted from when a worker starts the rule,
+    # after which it is reported as an error. None waits forever. This has no effect on the 'serial' executor.
+    'RULE_TIMEOUT': None,
+    # The Django cache alias used to store checklist data between requests.
+    'CACHE': 'default',
+    # Seconds to remember whether a user can access the Wagtail admin. Changes to users' groups and
+    # permissions take effect straight away. 0 checks the user's permissions on every request.
+    'PERMISSION_CACHE_TIMEOUT': 60,
+    # Seconds to keep the page data and results of a request, so the next request only
+    # re-checks rules whose fields have changed.
+    'SNAPSHOT_TIMEOUT': 300,
+    # The Django cache alias used to store finished checklists. Use a dedicated cache to control
+    # eviction, eg. with the MAX_ENTRIES option of the local memory cache.
+    'RESULT_CACHE': 'default',
+    # Seconds to keep a finished checklist, so that an identical request returns it straight away.
+    # Rules which read anything other than the page data can give stale results for this long, so
+    # the result cache is disabled (0) unless this is set.
+    'RESULT_CACHE_TIMEOUT': 0,
+    # The maximum number of pages which can be checked by one request to the batch API.
+    'BATCH_MAX_PAGES': 500,
+    # When a page is saved or published, its stored checklist status is refreshed:
+    #   - 'async': in a background thread, once the transaction has committed
+    #   - 'sync': straight away, in the saving thread
+    #   - None: never - statuses can still be saved with `checklist_audit --save-status`
+    # Refreshing checks every rule on each save, so it is off unless this is set.
+    'STATUS_REFRESH': None,
+    # Dotted path to the class which saves checklist statuses.
+    'STATUS_STORE': 'wagtail_checklist.status.DatabaseStatusStore',
+    # Check error rules on the server when a page is published from the editor, and save the page
+    # as a draft instead if one fails.
+    'PUBLISH_ENFORCEMENT': False,
+    # Seconds to spend checking error rules when a page is published. Rules still running after this
+    # (or after RULE_TIMEOUT) are not waited for, and fail, so the page is saved as a draft instead.
+    'PUBLISH_TIME_BUDGET': 2,
+    # Dotted paths to the classes which record the time taken by each rule, see timings.py.
+    'TIMING_SINKS': ['wagtail_checklist.timings.AggregatingTimingSink'],
+    # The number of recent timings kept for each rule by the AggregatingTimingSink.
+    'TIMING_SAMPLES': 1000,
+    # Rules which take longer than this many seconds are logged as warnings. None disables the warnings.
+    'SLOW_RULE_THRESHOLD': 1,
+    # Where the StatsdTimingSink sends timings, and the prefix of its metric names.
+    'STATSD_HOST': 'localhost',
+    'STATSD_PORT': 8125,
+    'STATSD_PREFIX': 'wagtail_checklist.rules',
+    # Include a breakdown of the time taken by each phase in checklist API responses:
+    #   - 'header': for requests with an X-Checklist-Profile header
+    #   - 'always': for every request
+    #   - None: never
+    'PROFILING': None,
+    # The URL of wagtail_checklist.consumers.ChecklistConsumer, eg. '/admin/checklist/ws/'.
+    # When None, the editor streams results over HTTP instead of a WebSocket.
+    'WEBSOCKET_URL': None,
+}
+
+
+def get_setting(name):
+    """
+    Returns the value of a checklist setting, falling back to its default.
+    """
+    return getattr(settings, 'WAGTAIL_CHECKLIST_' + name, DEFAULTS[name])
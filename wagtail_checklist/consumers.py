@@ -0,0 +1,37 @@
+"""
+A WebSocket consumer for the editor checklist. Requires Django Channels.
+
+Each connection keeps a ChecklistSession, so the editor only sends the form fields which have
+changed, and receives each rule result as soon as it has been checked.
+"""
+from channels.generic.websocket import JsonWebsocketConsumer
+from rest_framework import serializers
+from wagtail.core.models import Page
+
+from .permissions import can_access_admin
+from .serializers import ChecklistEvents
+from .sessions import ChecklistSession
+
+
+class ChecklistConsumer(JsonWebsocketConsumer):
+    """
+    Receives Wagtail Page data, or changes to it, from the admin edit / create page.
+    Sends an event for each validation error / warning, followed by the full checklist.
+    """
+    def connect(self):
+        user = self.scope.get('user')
+        if not can_access_admin(user):
+            self.close()
+            return
+
+        self.session = ChecklistSession()
+        self.accept()
+
+    def receive_json(self, content, **kwargs):
+        try:
+            for event, data in self.session.iter_events(content):
+                self.send_json({'event': event, 'data': data})
+        except serializers.ValidationError as e:
+            self.send_json({'event': ChecklistEvents.ERROR, 'data': {'error': e.detail}})
+        except Page.DoesNotExist:
+            self.send_json({'event': ChecklistEvents.ERROR, 'data': {'error': 'Page not found'}})
@@ -0,0 +1,146 @@
+"""
+Declarative rules, for the simple checks which make up most checklists.
+
+Each of these checks the value of a single field, and is registered like a rule function:
+
+    register_error_rule(Article, 'title', 'Title cannot be longer than 20 characters.')(LengthRule('title', max=20))
+
+Since they only read their field, the engine checks them without copying the page, reading each
+field once for all of its declarative rules, and without the executor. When many saved pages are
+checked at once (see check_rules_bulk), each field is read into a column for all of the pages,
+and each rule checks the whole column at once.
+"""
+import re
+from abc import ABC, abstractmethod
+
+
+class FieldRule(ABC):
+    """
+    Checks the value of one field of a page. Subclasses must implement check_value, and may implement check_values
+    to check a column of values faster than one at a time.
+    """
+    def __init__(self, field):
+        self.field = field
+
+    def __call__(self, page, parent):
+        return self.check_value(getattr(page, self.field))
+
+    @abstractmethod
+    def check_value(self, value):
+        """
+        Returns True if `value` passes this rule.
+        """
+
+    def check_values(self, values):
+        """
+        Returns a list of booleans, for whether each of `values` passes this rule.
+        """
+        return [self.check_value(value) for value in values]
+
+    def get_params(self):
+        """
+        Returns the parameters which identify this rule, along with its field.
+        """
+        return {}
+
+    def __repr__(self):
+        params = ''.join(', {}={!r}'.format(name, value) for name, value in sorted(self.get_params().items()))
+        return '{}({!r}{})'.format(type(self).__name__, self.field, params)
+
+
+class RequiredRule(FieldRule):
+    """
+    Passes if the field has a value: not None, not blank text and not an empty list, StreamField, etc.
+    """
+    def check_value(self, value):
+        if value is None:
+            return False
+
+        if isinstance(value, str):
+            return bool(value.strip())
+
+        try:
+            return len(value) > 0
+        except TypeError:
+            return True
+
+
+class LengthRule(FieldRule):
+    """
+    Passes if the length of the field's value is at least `min` and at most `max`. A value of None has a length of 0.
+    """
+    def __init__(self, field, min=None, max=None):
+        if min is None and max is None:
+            raise ValueError('LengthRule for {} needs a min or a max'.format(field))
+
+        super().__init__(field)
+        self.min = min
+        self.max = max
+
+    def check_value(self, value):
+        return self.check_values([value])[0]
+
+    def check_values(self, values):
+        low = 0 if self.min is None else self.min
+        high = float('inf') if self.max is None else self.max
+        return [low <= (0 if value is None else len(value)) <= high for value in values]
+
+    def get_params(self):
+        return {'min': self.min, 'max': self.max}
+
+
+class RegexRule(FieldRule):
+    """
+    Passes if `pattern` is found in the field's text, or if it isn't found when `must_match` is False.
+    A value of None is treated as empty text.
+    """
+    def __init__(self, field, pattern, flags=0, must_match=True):
+        super().__init__(field)
+        self.pattern = pattern
+        self.flags = flags
+        self.must_match = must_match
+        self.regex = re.compile(pattern, flags)
+
+    def check_value(self, value):
+        return self.check_values([value])[0]
+
+    def check_values(self, values):
+        search = self.regex.search
+        if self.must_match:
+            return [search('' if value is None else str(value)) is not None for value in values]
+
+        return [search('' if value is None else str(value)) is None for value in values]
+
+    def get_params(self):
+        return {'pattern': self.pattern, 'flags': int(self.flags), 'must_match': self.must_match}
+
+
+class RangeRule(FieldRule):
+    """
+    Passes if the field's value is at least `min` and at most `max`.
+    A value of None passes, so use a RequiredRule as well if the field must be filled in.
+    """
+    def __init__(self, field, min=None, max=None):
+        if min is None and max is None:
+            raise ValueError('RangeRule for {} needs a min or a max'.format(field))
+
+        super().__init__(field)
+        self.min = min
+        self.max = max
+
+    def check_value(self, value):
+        return self.check_values([value])[0]
+
+    def check_values(self, values):
+        low = self.min
+        high = self.max
+        if low is None:
+            return [value is None or value <= high for value in values]
+
+        if high is None:
+            return [value is None or low <= value for value in values]
+
+        return [value is None or low <= value <= high for value in values]
+
+    def get_params(self):
+        return {'min': self.min, 'max': self.max}
@@ -0,0 +1,323 @@
+"""
+Runs checklist rules, either one after another or fanned out over a pool of threads or processes.
+
+The executor is chosen with the EXECUTOR, MAX_WORKERS and RULE_TIMEOUT settings (see conf.py).
+If any of the rules are async, they are awaited concurrently in an event loop instead, with sync
+rules run on the pool (or a thread pool, for the 'serial' executor).
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from .conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_SERIAL = 'serial'
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+
+POOL_CLASSES = {
+    EXECUTOR_THREAD: ThreadPoolExecutor,
+    EXECUTOR_PROCESS: ProcessPoolExecutor,
+}
+
+# Pools are expensive to start, so they are shared by all requests in this process.
+executor_pools = {
+    # ('thread', 8): <ThreadPoolExecutor>,
+}
+executor_pools_lock = threading.Lock()
+
+# Seconds between checks for rules which have been picked up by a worker, whose timeouts start then.
+START_POLL_INTERVAL = 0.01
+
+
+def get_pool(executor_type, max_workers):
+    """
+    Returns the shared pool for the given executor type and worker count, starting it if required.
+    """
+    try:
+        pool_class = POOL_CLASSES[executor_type]
+    except KeyError:
+        raise ValueError('Unknown checklist executor {}'.format(executor_type))
+
+    key = (executor_type, max_workers)
+    with executor_pools_lock:
+        try:
+            return executor_pools[key]
+        except KeyError:
+            pool = pool_class(max_workers=max_workers)
+            executor_pools[key] = pool
+            return pool
+
+
+def run_rules(rules, page_copies):
+    """
+    Checks each rule against a copy of the page from `page_copies`.
+    Returns a list of RuleResults, in the same order as `rules`.
+    """
+    results = [None] * len(rules)
+    for index, result in iter_rule_results(rules, page_copies):
+        results[index] = result
+
+    return results
+
+
+def iter_rule_results(rules, page_copies, executor_type=None, timeout=None, budget=None):
+    """
+    Checks each rule against a copy of the page from `page_copies`.
+    Yields (index in `rules`, RuleResult) tuples as soon as each rule has been checked.
+
+    `executor_type` and `timeout` default to the EXECUTOR and RULE_TIMEOUT settings. When using a pool,
+    each rule has `timeout` seconds from when a worker starts it, so rules waiting for a free worker
+    are not timed out. If `budget` is given, rules which haven't finished `budget` seconds after
+    they were submitted are not waited for, however long they have been running.
+    Rules which have not started when the caller stops iterating are cancelled.
+    """
+    executor_type = executor_type or get_setting('EXECUTOR')
+    if timeout is None:
+        timeout = get_setting('RULE_TIMEOUT')
+
+    if any(rule.is_async for rule in rules):
+        yield from iter_async_rule_results(rules, page_copies, executor_type, timeout, budget)
+        return
+
+    if executor_type == EXECUTOR_SERIAL:
+        for index, rule in enumerate(rules):
+            yield index, rule.check(*page_copies.get(rule))
+
+        return
+
+    if not rules:
+        return
+
+    pool = get_pool(executor_type, get_setting('MAX_WORKERS'))
+    futures = {pool.submit(rule.check, *page_copies.get(rule)): index for index, rule in enumerate(rules)}
+    deadlines = RuleDeadlines(timeout, get_queue_budget(timeout, budget, len(rules)))
+    pending = set(futures)
+    try:
+        while pending:
+            done, _ = wait(pending, timeout=deadlines.get_wait_timeout(pending), return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=futures.get):
+                pending.remove(future)
+                index = futures[future]
+                try:
+                    yield index, future.result()
+                except Exception:
+                    # Rule exceptions are caught by Rule.check, so this is a failure to run the rule at all,
+                    # eg. a rule function which cannot be sent to a process pool.
+                    rule = rules[index]
+                    logger.exception('Failed to run rule %s - %s', rule.name, rule.message)
+                    yield index, rule.error_result()
+
+            # Timed out rules keep running in the background, but we don't wait for them.
+            for future in sorted(deadlines.get_timed_out(pending), key=futures.get):
+                pending.remove(future)
+                future.cancel()
+                rule = rules[futures[future]]
+                logger.warning('Timed out after %ss while checking rule %s - %s', timeout, rule.name, rule.message)
+                yield futures[future], rule.timeout_result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def get_queue_budget(timeout, budget, num_rules):
+    """
+    Returns the seconds to wait for a batch of rules to be started by the pool's workers, or None to wait forever.
+    With a timeout, this is as long as the rules would take one at a time, so that rules which have timed out
+    but are still running can't hold up the rest of the batch forever.
+    """
+    if timeout is None:
+        return budget
+
+    queue_budget = timeout * num_rules
+    return queue_budget if budget is None else min(budget, queue_budget)
+
+
+class RuleDeadlines:
+    """
+    Tracks when each of a batch of pool futures started running, to time each one out separately.
+    A future counts as started when it is first seen running, which is within START_POLL_INTERVAL
+    of a thread starting it, or when a process pool queues it for its next free worker.
+    """
+    def __init__(self, timeout, budget):
+        self.timeout = timeout
+        self.start_time = time.monotonic()
+        self.budget_deadline = None if budget is None else self.start_time + budget
+        self.start_times = {}
+
+    def get_wait_timeout(self, pending):
+        """
+        Returns the seconds to wait for a future to finish before checking for timed out futures again.
+        """
+        now = time.monotonic()
+        deadlines = [] if self.budget_deadline is None else [self.budget_deadline]
+        if self.timeout is not None:
+            for future in pending:
+                start_time = self.start_times.get(future)
+                if start_time is None:
+                    deadlines.append(now + START_POLL_INTERVAL)
+                else:
+                    deadlines.append(start_time + self.timeout)
+
+        if not deadlines:
+            return None
+
+        return max(min(deadlines) - now, 0)
+
+    def get_timed_out(self, pending):
+        """
+        Returns the futures in `pending` which have run out of time.
+        """
+        now = time.monotonic()
+        if self.budget_deadline is not None and now >= self.budget_deadline:
+            return list(pending)
+
+        if self.timeout is None:
+            return []
+
+        timed_out = []
+        for future in pending:
+            start_time = self.start_times.get(future)
+            if start_time is None and future.running():
+                start_time = self.start_times[future] = now
+
+            if start_time is not None and now >= start_time + self.timeout:
+                timed_out.append(future)
+
+        return timed_out
+
+
+def iter_async_rule_results(rules, page_copies, executor_type, timeout, budget=None):
+    """
+    Like iter_rule_results, but awaits the rules concurrently in a new event loop.
+    """
+    loop = asyncio.new_event_loop()
+    pending = set()
+    try:
+        pool = get_pool(get_parallel_executor_type(executor_type), get_setting('MAX_WORKERS'))
+        queue_timeout = get_queue_budget(timeout, None, len(rules))
+        tasks = {
+            loop.create_task(check_rule_async(rule, page_copies, pool, timeout, queue_timeout)): index
+            for index, rule in enumerate(rules)
+        }
+        pending = set(tasks)
+        budget_deadline = None if budget is None else time.monotonic() + budget
+        while pending:
+            wait_timeout = None if budget_deadline is None else max(budget_deadline - time.monotonic(), 0)
+            done, pending = loop.run_until_complete(
+                asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+            )
+            for task in sorted(done, key=tasks.get):
+                yield tasks[task], task.result()
+
+            if budget_deadline is not None and time.monotonic() >= budget_deadline:
+                for task in sorted(pending, key=tasks.get):
+                    rule = rules[tasks[task]]
+                    logger.warning('Timed out after %ss while checking rule %s - %s', budget, rule.name, rule.message)
+                    yield tasks[task], rule.timeout_result()
+
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            loop.run_until_complete(asyncio.wait(pending))
+
+        loop.close()
+
+
+async def gather_rules(rules, page_copies):
+    """
+    Checks each rule against a copy of the page from `page_copies`, concurrently.
+    Async rules are awaited in the running event loop, and sync rules are run on a pool.
+    Returns a list of RuleResults, in the same order as `rules`.
+    """
+    pool = get_async_pool()
+    timeout = get_setting('RULE_TIMEOUT')
+    queue_timeout = get_queue_budget(timeout, None, len(rules))
+    checks = [check_rule_async(rule, page_copies, pool, timeout, queue_timeout) for rule in rules]
+    return list(await asyncio.gather(*checks))
+
+
+def get_async_pool():
+    """
+    Returns the pool which runs sync rules alongside async rules.
+    """
+    return get_pool(get_parallel_executor_type(get_setting('EXECUTOR')), get_setting('MAX_WORKERS'))
+
+
+def get_parallel_executor_type(executor_type):
+    """
+    Returns `executor_type`, or a thread pool in place of the serial executor.
+    """
+    if executor_type == EXECUTOR_SERIAL:
+        return EXECUTOR_THREAD
+
+    return executor_type
+
+
+async def check_rule_async(rule, page_copies, pool, timeout, queue_timeout=None):
+    """
+    Returns a RuleResult for `rule`, awaiting it if it is async or running it on `pool` if not.
+    A sync rule's `timeout` starts when a worker starts it, see iter_rule_results.
+    It is timed out without running if no worker has started it after `queue_timeout` seconds.
+    """
+    page_instance, page_parent, analysis = page_copies.get(rule)
+    try:
+        if rule.is_async:
+            return await asyncio.wait_for(rule.check_async(page_instance, page_parent, analysis), timeout)
+
+        future = pool.submit(rule.check, page_instance, page_parent, analysis)
+        if timeout is not None:
+            await asyncio.wait_for(wait_for_start(future), queue_timeout)
+
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        logger.warning('Timed out after %ss while checking rule %s - %s', timeout, rule.name, rule.message)
+        return rule.timeout_result()
+    except Exception:
+        # See iter_rule_results
+        logger.exception('Failed to run rule %s - %s', rule.name, rule.message)
+        return rule.error_result()
+
+
+def is_event_loop_running():
+    """
+    Returns True if this thread is running an event loop.
+    """
+    # asyncio.get_running_loop, which raises if there is no loop, needs Python 3.7.
+    return asyncio._get_running_loop() is not None
+
+
+async def wait_for_start(future):
+    """
+    Waits until a pool future has been started by a worker, or has finished.
+    """
+    try:
+        while not future.running() and not future.done():
+            await asyncio.sleep(START_POLL_INTERVAL)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+
+def run_coroutine(coroutine):
+    """
+    Runs a coroutine to completion in a new event loop, from sync code.
+    If this thread is already running an event loop, such as an async view calling Rule.check,
+    a second loop can't be run here, so the coroutine is run in a new thread instead.
+    """
+    if is_event_loop_running():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(run_coroutine, coroutine).result()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
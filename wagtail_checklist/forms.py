@@ -0,0 +1,44 @@
+"""
+Caches the Wagtail edit handler and form class for each Page class.
+
+Building a form class is expensive for pages with many panels or StreamField blocks,
+and the result only changes when the code changes. The cache is cleared whenever Django
+settings change (eg. in tests), or by calling clear_form_class_cache.
+"""
+from django.core.signals import setting_changed
+
+# Cached (edit handler, form class) tuples, keyed by Page class.
+form_class_cache = {
+    # SomePageModel: (<TabbedInterface>, <class 'SomePageModelForm'>),
+}
+
+
+def get_form_class(page_class):
+    """
+    Returns a tuple of the edit handler and form class for `page_class`.
+    """
+    try:
+        return form_class_cache[page_class]
+    except KeyError:
+        pass
+
+    edit_handler = page_class.get_edit_handler()
+    form_class = edit_handler.get_form_class()
+    form_class_cache[page_class] = (edit_handler, form_class)
+    return edit_handler, form_class
+
+
+def clear_form_class_cache(**kwargs):
+    """
+    Throw away all cached edit handlers and form classes.
+    """
+    for page_class in list(form_class_cache.keys()):
+        # Wagtail caches the edit handler on the Page class as well.
+        cache_clear = getattr(page_class.get_edit_handler, 'cache_clear', None)
+        if cache_clear:
+            cache_clear()
+
+    form_class_cache.clear()
+
+
+setting_changed.connect(clear_form_class_cache)
@@ -0,0 +1,90 @@
+"""
+Guards, which decide whether a rule applies to a page at all.
+
+A rule registered with `when` is only checked if its guard passes. Otherwise it is skipped, and left
+out of the checklist as not applicable. `when` can be a dict of field values, which the page must
+have all of, or a function which takes the page and its parent:
+
+    @register_warning_rule(NewsPage, 'menu title', 'Menu title should be short', when={'show_in_menus': True})
+    def validate_menu_title_length(page, parent):
+        ...
+
+    def is_news(page, parent):
+        return parent.slug == 'news'
+
+    @register_warning_rule(Page, 'body', 'News should have a source', when=is_news)
+    def validate_news_source(page, parent):
+        ...
+
+Guards are checked against the page before any rules are, without copying it, so they must not modify
+the page. Each guard is checked once per page, however many rules share it.
+"""
+
+
+class FieldGuard:
+    """
+    Passes if each of the page's fields is equal to the given value.
+    """
+    def __init__(self, conditions):
+        if not conditions:
+            raise ValueError('FieldGuard needs at least one condition')
+
+        self.conditions = dict(conditions)
+        self.fields = frozenset(self.conditions)
+
+    def check(self, page_instance, page_parent):
+        return all(getattr(page_instance, field) == value for field, value in self.conditions.items())
+
+    def get_key(self):
+        """
+        Returns a key which is the same for guards which always give the same result, so they are only checked once.
+        """
+        try:
+            return (FieldGuard, frozenset(self.conditions.items()))
+        except TypeError:
+            # Unhashable values
+            return self
+
+    def get_identity(self):
+        return repr(sorted(self.conditions.items(), key=lambda item: item[0]))
+
+    def __repr__(self):
+        return '<FieldGuard: {}>'.format(self.get_identity())
+
+
+class PredicateGuard:
+    """
+    Passes if `func(page, parent)` returns True. If `fields` lists the fields which `func` reads, rules
+    using this guard can still be skipped when other fields change (see Rule.depends_on).
+    """
+    def __init__(self, func, fields=None):
+        if not callable(func):
+            raise ValueError('PredicateGuard needs a function, not {}'.format(type(func).__name__))
+
+        self.func = func
+        self.fields = None if fields is None else frozenset(fields)
+
+    def check(self, page_instance, page_parent):
+        return bool(self.func(page_instance, page_parent))
+
+    def get_key(self):
+        return (PredicateGuard, self.func)
+
+    def get_identity(self):
+        return repr((getattr(self.func, '__module__', None), getattr(self.func, '__qualname__', None)))
+
+    def __repr__(self):
+        return '<PredicateGuard: {}>'.format(getattr(self.func, '__qualname__', self.func))
+
+
+def get_guard(when):
+    """
+    Returns a guard for the `when` argument of a rule's registration, or None if it has no guard.
+    """
+    if when is None or isinstance(when, (FieldGuard, PredicateGuard)):
+        return when
+
+    if isinstance(when, dict):
+        return FieldGuard(when)
+
+    return PredicateGuard(when)
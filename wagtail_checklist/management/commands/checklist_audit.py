@@ -0,0 +1,182 @@
+import csv
+import json
+import multiprocessing
+from functools import partial
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from wagtail.core.models import Page
+
+from wagtail_checklist.pages import (get_latest_revision_ids, get_latest_revision_pages, get_parent_page,
+                                     get_parent_pages)
+from wagtail_checklist.rules import check_pages_bulk, get_rule_plan
+from wagtail_checklist.serializers import serialize_checklist
+from wagtail_checklist.status import get_status_store
+
+CSV_FIELDS = ['id', 'title', 'content_type', 'live', 'num_errors', 'num_warnings', 'num_rule_exceptions', 'failed']
+
+
+class Command(BaseCommand):
+    help = 'Checks saved pages against the registered checklist rules, and writes the results as JSON lines or CSV.'
+
+    def add_arguments(self, parser):
+        add_page_arguments(parser)
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+        parser.add_argument('--output', help='File to write results to. Defaults to stdout.')
+        parser.add_argument('--processes', type=int, default=1, help='Number of processes to check pages with.')
+        parser.add_argument(
+            '--save-status', action='store_true',
+            help='Also save each result as the page\'s stored checklist status.'
+        )
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset(options)
+        page_ids = queryset.order_by('path').values_list('pk', flat=True).iterator(chunk_size=options['chunk_size'])
+        chunks = iter_chunks(page_ids, options['chunk_size'])
+
+        output = open(options['output'], 'w', newline='') if options['output'] else self.stdout
+        try:
+            write_row = get_row_writer(output, options['format'])
+            audit = partial(audit_pages, save_status=options['save_status'])
+            for rows in self.iter_audited_chunks(audit, chunks, options['processes']):
+                for row in rows:
+                    write_row(row)
+        finally:
+            if options['output']:
+                output.close()
+
+    def get_queryset(self, options):
+        """
+        Returns a queryset of pages to check. The root page is never checked, since it has no parent.
+        """
+        queryset = Page.objects.filter(depth__gt=1)
+        if options['content_types']:
+            content_type_ids = [get_content_type(name).pk for name in options['content_types']]
+            queryset = queryset.filter(content_type_id__in=content_type_ids)
+
+        if options['root']:
+            try:
+                root = Page.objects.get(pk=options['root'])
+            except Page.DoesNotExist:
+                raise CommandError('Page {} does not exist'.format(options['root']))
+
+            queryset = queryset.filter(path__startswith=root.path)
+
+        if options['status'] == 'live':
+            queryset = queryset.filter(live=True)
+        elif options['status'] == 'draft':
+            queryset = queryset.filter(live=False)
+
+        return queryset
+
+    def iter_audited_chunks(self, audit, chunks, processes):
+        """
+        Yields lists of audit rows for each chunk of page ids, in order.
+        """
+        if processes <= 1:
+            for chunk in chunks:
+                yield audit(chunk)
+
+            return
+
+        # Fetch all page ids up front, then close the database connection before forking,
+        # so that each process opens its own connection.
+        chunks = list(chunks)
+        connections.close_all()
+        with multiprocessing.Pool(processes) as pool:
+            for rows in pool.imap(audit, chunks):
+                yield rows
+
+
+def add_page_arguments(parser):
+    """
+    Adds the arguments which pick the pages to check, shared with the checklist_timings command.
+    """
+    parser.add_argument(
+        '--content-type', action='append', dest='content_types', default=[], metavar='APP_LABEL.MODEL',
+        help='Only check pages of this type. Can be used more than once.'
+    )
+    parser.add_argument('--root', type=int, help='Only check this page and its descendants.')
+    parser.add_argument(
+        '--status', choices=['all', 'live', 'draft'], default='all',
+        help='Check all pages, only live pages, or only pages which are not live.'
+    )
+    parser.add_argument('--chunk-size', type=int, default=500, help='Number of pages to fetch at once.')
+
+
+def get_content_type(name):
+    try:
+        app_label, model = name.lower().split('.')
+        return ContentType.objects.get_by_natural_key(app_label, model)
+    except (ValueError, ContentType.DoesNotExist):
+        raise CommandError('Unknown content type {}, use the format app_label.model'.format(name))
+
+
+def iter_chunks(iterable, chunk_size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def audit_pages(page_ids, save_status=False):
+    """
+    Returns a list of audit rows for the latest revision of each page.
+    Pages are fetched with one query per page type, plus one query each for revisions and parents,
+    and checked in bulk for each page type.
+    """
+    pages = get_latest_revision_pages(Page.objects.filter(pk__in=page_ids).order_by('path').specific())
+    parent_pages = get_parent_pages(pages)
+    if save_status:
+        store = get_status_store()
+        revision_ids = get_latest_revision_ids(page_ids)
+
+    rows = []
+    page_parents = [get_parent_page(page, parent_pages) for page in pages]
+    for page, (error_results, warning_results) in zip(pages, check_pages_bulk(pages, page_parents)):
+        rows.append(get_audit_row(page, error_results, warning_results))
+        if save_status:
+            plan_version = get_rule_plan(type(page)).version
+            store.save_status(page, revision_ids.get(page.pk), plan_version, error_results, warning_results)
+
+    return rows
+
+
+def get_audit_row(page, error_results, warning_results):
+    failed_results = [r for r in error_results + warning_results if not r.is_valid or r.has_error]
+    return {
+        'id': page.pk,
+        'title': page.title,
+        'content_type': page._meta.label_lower,
+        'live': page.live,
+        'num_errors': len([r for r in error_results if not r.is_valid]),
+        'num_warnings': len([r for r in warning_results if not r.is_valid]),
+        'num_rule_exceptions': len([r for r in error_results + warning_results if r.has_error]),
+        'failed': ['{}: {}'.format(r.name, r.message) for r in failed_results],
+        'checklist': serialize_checklist([], error_results, warning_results),
+    }
+
+
+def get_row_writer(output, output_format):
+    """
+    Returns a function which writes an audit row to `output`.
+    """
+    if output_format == 'jsonl':
+        def write_row(row):
+            output.write(json.dumps(row, default=str) + '\n')
+
+        return write_row
+
+    writer = csv.DictWriter(output, CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+
+    def write_row(row):
+        writer.writerow(dict(row, failed='; '.join(row['failed'])))
+
+    return write_row
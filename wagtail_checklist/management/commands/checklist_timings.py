@@ -0,0 +1,47 @@
+from django.core.management.base import CommandError
+
+from wagtail_checklist.timings import AggregatingTimingSink, get_timing_sinks, get_timing_stats, reset_timing_stats
+
+from .checklist_audit import Command as AuditCommand
+from .checklist_audit import add_page_arguments, audit_pages, iter_chunks
+
+STAT_COLUMNS = ['p50', 'p95', 'p99', 'max', 'mean']
+
+
+class Command(AuditCommand):
+    help = 'Checks saved pages against the registered checklist rules, and reports how long each rule takes.'
+
+    def add_arguments(self, parser):
+        add_page_arguments(parser)
+        parser.add_argument('--limit', type=int, help='Only check this many pages.')
+        parser.add_argument('--sort', choices=STAT_COLUMNS, default='p95', help='The column to sort rules by.')
+
+    def handle(self, *args, **options):
+        if not any(isinstance(sink, AggregatingTimingSink) for sink in get_timing_sinks()):
+            raise CommandError(
+                'Rule timings are only collected by wagtail_checklist.timings.AggregatingTimingSink, '
+                'add it to the WAGTAIL_CHECKLIST_TIMING_SINKS setting'
+            )
+
+        queryset = self.get_queryset(options).order_by('path')
+        if options['limit']:
+            queryset = queryset[:options['limit']]
+
+        page_ids = queryset.values_list('pk', flat=True).iterator(chunk_size=options['chunk_size'])
+        reset_timing_stats()
+        for chunk in iter_chunks(page_ids, options['chunk_size']):
+            audit_pages(chunk)
+
+        self.write_stats(get_timing_stats(), options['sort'])
+
+    def write_stats(self, timing_stats, sort):
+        """
+        Writes a table of rule timings in milliseconds, slowest first.
+        """
+        rows = sorted(timing_stats.items(), key=lambda item: item[1][sort], reverse=True)
+        header = ['rule', 'calls'] + STAT_COLUMNS
+        self.stdout.write('\t'.join(header))
+        for (name, message), stats in rows:
+            columns = ['{} - {}'.format(name, message), str(stats['count'])]
+            columns += ['{:.2f}'.format(stats[column] * 1000) for column in STAT_COLUMNS]
+            self.stdout.write('\t'.join(columns))
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-16 18:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('wagtailcore', '0040_page_draft_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChecklistStatus',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='checklist_status', serialize=False, to='wagtailcore.Page')),
+                ('plan_version', models.CharField(max_length=40)),
+                ('num_errors', models.PositiveIntegerField(db_index=True)),
+                ('num_warnings', models.PositiveIntegerField(db_index=True)),
+                ('num_rule_exceptions', models.PositiveIntegerField(default=0)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+                ('revision', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.PageRevision')),
+            ],
+            options={
+                'verbose_name_plural': 'checklist statuses',
+            },
+        ),
+        migrations.CreateModel(
+            name='FailedChecklistRule',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('ERROR', 'Error'), ('WARNING', 'Warning')], max_length=16)),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('message', models.TextField()),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failed_rules', to='wagtail_checklist.ChecklistStatus')),
+            ],
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import models
+from wagtail.core.models import Page, PageRevision
+
+
+class ChecklistStatusQuerySet(models.QuerySet):
+    def with_errors(self):
+        return self.filter(num_errors__gt=0)
+
+    def with_warnings(self):
+        return self.filter(num_warnings__gt=0)
+
+    def failing_rule(self, rule_name):
+        return self.filter(failed_rules__name=rule_name).distinct()
+
+
+class ChecklistStatus(models.Model):
+    """
+    The latest checklist result for a page, so that pages can be listed and filtered by checklist status
+    without checking any rules. Refreshed when a page is saved or published (see status.py).
+    """
+    page = models.OneToOneField(Page, on_delete=models.CASCADE, primary_key=True, related_name='checklist_status')
+    revision = models.ForeignKey(PageRevision, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    plan_version = models.CharField(max_length=40)
+    num_errors = models.PositiveIntegerField(db_index=True)
+    num_warnings = models.PositiveIntegerField(db_index=True)
+    num_rule_exceptions = models.PositiveIntegerField(default=0)
+    checked_at = models.DateTimeField(auto_now=True)
+
+    objects = ChecklistStatusQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = 'checklist statuses'
+
+    def __str__(self):
+        return 'Checklist status for page {}: {} errors, {} warnings'.format(
+            self.page_id, self.num_errors, self.num_warnings
+        )
+
+
+class FailedChecklistRule(models.Model):
+    """
+    A rule which failed the last time a page was checked.
+    """
+    ERROR = 'ERROR'
+    WARNING = 'WARNING'
+
+    status = models.ForeignKey(ChecklistStatus, on_delete=models.CASCADE, related_name='failed_rules')
+    type = models.CharField(max_length=16, choices=[(ERROR, 'Error'), (WARNING, 'Warning')])
+    name = models.CharField(max_length=255, db_index=True)
+    message = models.TextField()
+
+    def __str__(self):
+        return '{} {}: {}'.format(self.type, self.name, self.message)
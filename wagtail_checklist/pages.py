@@ -0,0 +1,85 @@
+"""
+Helpers for fetching many pages at once, used to check pages outside of the Wagtail editor.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Max
+from wagtail.core.models import Page, PageRevision
+
+# The content type id of pages fetched by get_specific_page, keyed by page id. A page's type never
+# changes, so later lookups can query its specific model straight away.
+page_content_types = {
+    # 3: 42,
+}
+# The number of pages remembered in page_content_types before it is emptied.
+MAX_PAGE_CONTENT_TYPES = 10000
+
+
+def get_parent_page(page, parent_pages):
+    """
+    Returns the parent of `page` from a dict of pages keyed by path, or None.
+    """
+    return parent_pages.get(page.path[:-page.steplen])
+
+
+def get_parent_pages(pages):
+    """
+    Returns a dict of the parents of `pages`, keyed by path, using a single query.
+    """
+    parent_paths = {page.path[:-page.steplen] for page in pages}
+    return {parent.path: parent for parent in Page.objects.filter(path__in=parent_paths)}
+
+
+def get_specific_page(page_id):
+    """
+    Returns the specific instance of the page with id `page_id`, or raises Page.DoesNotExist.
+    This takes one query for a page which this process has fetched before, and otherwise
+    two queries for a page which is a Page subclass, as per Page.specific.
+    """
+    content_type_id = page_content_types.get(page_id)
+    if content_type_id is not None:
+        page_class = ContentType.objects.get_for_id(content_type_id).model_class()
+        page = page_class.objects.filter(pk=page_id).first() if page_class else None
+        # The page may have been deleted, and its id reused by a page of another type.
+        if page is not None and page.content_type_id == content_type_id:
+            return page
+
+    page = Page.objects.get(pk=page_id).specific
+    if len(page_content_types) >= MAX_PAGE_CONTENT_TYPES:
+        page_content_types.clear()
+
+    page_content_types[page_id] = page.content_type_id
+    return page
+
+
+def get_latest_revision_ids(page_ids):
+    """
+    Returns a dict of the latest revision id of each page, keyed by page id, using a single query.
+    """
+    return dict(
+        PageRevision.objects
+        .filter(page_id__in=page_ids)
+        .values('page_id')
+        .annotate(latest_id=Max('id'))
+        .values_list('page_id', 'latest_id')
+    )
+
+
+def get_latest_revision_pages(pages):
+    """
+    Returns a list of `pages` with their latest draft content, as per Page.get_latest_revision_as_page,
+    using a single query to fetch the latest revisions of all pages with unpublished changes.
+    Pages must be specific instances.
+    """
+    draft_page_ids = [page.pk for page in pages if page.has_unpublished_changes]
+    if not draft_page_ids:
+        return list(pages)
+
+    latest_revision_ids = get_latest_revision_ids(draft_page_ids).values()
+    revisions = PageRevision.objects.filter(id__in=list(latest_revision_ids)).only('page_id', 'content_json')
+    content_by_page_id = {revision.page_id: revision.content_json for revision in revisions}
+    latest_pages = []
+    for page in pages:
+        content_json = content_by_page_id.get(page.pk)
+        latest_pages.append(page.with_content_json(content_json) if content_json else page)
+
+    return latest_pages
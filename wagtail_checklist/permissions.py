@@ -0,0 +1,95 @@
+"""
+A cached check of whether a user can access the Wagtail admin.
+
+Every open editor calls the checklist API every few seconds. Checking the admin permission
+loads all of a user's permissions, through their groups, with several queries. So the answer is
+cached for PERMISSION_CACHE_TIMEOUT seconds.
+
+Cached answers are keyed by a version number, which is bumped whenever a user's groups, a group's
+permissions, or a user's own permissions change. Bumping the version throws away every cached
+answer at once, in every process sharing the cache.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .conf import get_setting
+
+ADMIN_PERMISSION = 'wagtailadmin.access_admin'
+
+CACHE_KEY_PREFIX = 'wagtail_checklist:admin_access:'
+VERSION_CACHE_KEY = CACHE_KEY_PREFIX + 'version'
+
+
+def get_user_cache_key(user):
+    return '{}user:{}'.format(CACHE_KEY_PREFIX, user.pk)
+
+
+def can_access_admin(user):
+    """
+    Returns True if `user` has permission to log into the Wagtail admin.
+    """
+    if not user or not user.is_authenticated or not user.is_active:
+        return False
+
+    # Active superusers have every permission, and don't need a query to find out.
+    if user.is_superuser:
+        return True
+
+    timeout = get_setting('PERMISSION_CACHE_TIMEOUT')
+    if not timeout:
+        return user.has_perm(ADMIN_PERMISSION)
+
+    cache = caches[get_setting('CACHE')]
+    user_key = get_user_cache_key(user)
+    cached = cache.get_many([VERSION_CACHE_KEY, user_key])
+    version = cached.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = 0
+        cache.add(VERSION_CACHE_KEY, version, None)
+
+    cached_version, has_access = cached.get(user_key, (None, None))
+    if cached_version == version:
+        return has_access
+
+    has_access = user.has_perm(ADMIN_PERMISSION)
+    cache.set(user_key, (version, has_access), timeout)
+    return has_access
+
+
+def clear_admin_access_cache(**kwargs):
+    """
+    Throw away every cached answer, so that permissions are checked again.
+    """
+    cache = caches[get_setting('CACHE')]
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # The version has been evicted, so any cached answers are for a version which will never come back.
+        cache.add(VERSION_CACHE_KEY, 1, None)
+
+
+def handle_user_saved(sender, instance, created, **kwargs):
+    # A user who is deactivated or loses superuser status is checked from scratch,
+    # but a new user has nothing cached.
+    if not created:
+        cache = caches[get_setting('CACHE')]
+        cache.delete(get_user_cache_key(instance))
+
+
+def connect_signals():
+    user_model = get_user_model()
+    for through in (user_model.groups.through, user_model.user_permissions.through, Group.permissions.through):
+        m2m_changed.connect(
+            clear_admin_access_cache, sender=through,
+            dispatch_uid='wagtail_checklist_admin_access_{}'.format(through._meta.label_lower)
+        )
+
+    for model in (Group, Permission):
+        post_delete.connect(
+            clear_admin_access_cache, sender=model,
+            dispatch_uid='wagtail_checklist_admin_access_{}_deleted'.format(model._meta.label_lower)
+        )
+
+    post_save.connect(handle_user_saved, sender=user_model, dispatch_uid='wagtail_checklist_admin_access_user')
@@ -0,0 +1,129 @@
+"""
+Profiles the phases of a checklist API request, so slow phases can be spotted from the browser.
+
+When enabled by the PROFILING setting, the API response includes a 'profile' with the time taken
+and database queries made by each phase, and the time each rule added to the request. The
+phases are also sent in a Server-Timing header, which browsers show in their developer tools.
+"""
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+from .conf import get_setting
+
+PROFILE_HEADER = 'HTTP_X_CHECKLIST_PROFILE'
+
+# Values of the PROFILING setting
+#   - PROFILE_HEADER_ONLY: profile requests which send an X-Checklist-Profile header
+#   - PROFILE_ALWAYS: profile every request
+PROFILE_HEADER_ONLY = 'header'
+PROFILE_ALWAYS = 'always'
+
+
+def get_request_profile(request):
+    """
+    Returns a started RequestProfile if `request` should be profiled, or a NullProfile if not.
+    """
+    profiling = get_setting('PROFILING')
+    if profiling == PROFILE_ALWAYS or (profiling == PROFILE_HEADER_ONLY and request.META.get(PROFILE_HEADER)):
+        profile = RequestProfile()
+        profile.start()
+        return profile
+
+    return NullProfile()
+
+
+class RequestProfile:
+    """
+    The time taken and database queries made by each phase of a request.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.start_time = None
+        self.end_time = None
+        self.num_queries = 0
+        self.phases = []
+        self.rules = []
+        self.last_rule_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        connection.execute_wrappers.append(self.count_query)
+
+    def stop(self):
+        """
+        Stops counting queries. Must be called once the request is finished, even if it fails.
+        """
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+            connection.execute_wrappers.remove(self.count_query)
+
+    def count_query(self, execute, sql, params, many, context):
+        self.num_queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def phase(self, name):
+        start_time = time.perf_counter()
+        start_queries = self.num_queries
+        self.last_rule_time = start_time
+        try:
+            yield
+        finally:
+            end_time = time.perf_counter()
+            self.phases.append({
+                'name': name,
+                'ms': (end_time - start_time) * 1000,
+                'queries': self.num_queries - start_queries,
+            })
+
+    def record_rule(self, result):
+        """
+        Records the time `result` added to the request: the time since the previous rule result, or since
+        the start of the current phase. With the serial executor this is the rule's run time, and with a pool it is
+        the time spent waiting for the rule after the rules before it had finished.
+        """
+        rule_time = time.perf_counter()
+        self.rules.append({
+            'name': result.name,
+            'message': result.message,
+            'ms': (rule_time - self.last_rule_time) * 1000,
+        })
+        self.last_rule_time = rule_time
+
+    def as_dict(self):
+        end_time = self.end_time or time.perf_counter()
+        return {
+            'totalMs': (end_time - self.start_time) * 1000,
+            'queries': self.num_queries,
+            'phases': self.phases,
+            'rules': self.rules,
+        }
+
+    def get_server_timing(self):
+        """
+        Returns the phases as a Server-Timing header value.
+        """
+        return ', '.join('{};dur={:.2f}'.format(phase['name'], phase['ms']) for phase in self.phases)
+
+
+class NullProfile:
+    """
+    Stands in for a RequestProfile when a request is not being profiled.
+    """
+    enabled = False
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def record_rule(self, result):
+        pass
@@ -0,0 +1,113 @@
+"""
+Server-side enforcement of the checklist when a page is published from the Wagtail editor.
+
+The editor's publish button is locked while the checklist has failed error rules, but that lock
+only exists in the browser. When PUBLISH_ENFORCEMENT is on, the before_edit_page and
+before_create_page hooks check publish requests again on the server, and save the page as a draft
+instead of publishing it if an error rule fails.
+
+This runs on the publish request, so it is kept within the PUBLISH_TIME_BUDGET setting:
+  - if the editor's checklist API has already checked the same page data, its cached result is used
+  - otherwise only the error rules are checked, in parallel, and rules still running when the
+    budget runs out are not waited for. They fail, so that a slow rule can't let a failing page through.
+"""
+import logging
+import time
+
+from django.contrib import messages
+
+from .conf import get_setting
+from .forms import get_form_class
+from .result_cache import get_cached_checklist
+from .rules import RuleResult, check_blocking_rules, copy_page, get_rule_plan
+from .snapshots import get_fingerprint
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_ACTION = 'action-publish'
+
+
+def should_enforce_checklist(request):
+    """
+    Returns True if the checklist should be enforced for a request to the Wagtail edit / create view.
+    """
+    return get_setting('PUBLISH_ENFORCEMENT') and request.method == 'POST' and bool(request.POST.get(PUBLISH_ACTION))
+
+
+def get_page_data(post_data):
+    """
+    Returns the page data sent to the checklist API by the editor, for the same form as `post_data`.
+    The editor sends the last value of each form field, and never includes the submit buttons.
+    """
+    return {key: post_data.get(key) for key in post_data if not key.startswith('action-')}
+
+
+def get_checklist_failure(checklist):
+    """
+    Returns a RuleResult for the first failed error in a serialized checklist, or None.
+    """
+    for name, validations in checklist.items():
+        for validation in validations:
+            if validation['type'] == 'ERROR' and not validation['isValid']:
+                return RuleResult(name, validation['message'], False, validation['hasError'])
+
+    return None
+
+
+def check_publish(request, page_class, page, parent_page, action):
+    """
+    Checks the page data in a publish request.
+    Returns the first failed error RuleResult, or None if the page can be published.
+    """
+    start_time = time.perf_counter()
+    plan_version = get_rule_plan(page_class).version
+    fingerprint = get_fingerprint(request.build_absolute_uri(), action, get_page_data(request.POST))
+    checklist = get_cached_checklist(page_class, plan_version, fingerprint)
+    if checklist is not None:
+        failed_result = get_checklist_failure(checklist)
+        source = 'cached checklist'
+    else:
+        failed_result = check_page_data(request, page_class, page, parent_page)
+        source = 'error rules'
+
+    logger.info(
+        'Checked %s for publishing in %.1fms using %s - %s', page_class.__name__,
+        (time.perf_counter() - start_time) * 1000, source, 'failed' if failed_result else 'passed'
+    )
+    return failed_result
+
+
+def check_page_data(request, page_class, page, parent_page):
+    """
+    Checks the page data in a request against the error rules for `page_class`, within the time budget.
+    Pages which fail Wagtail's own form validation are left for Wagtail to reject.
+    """
+    _, form_class = get_form_class(page_class)
+    # The form writes its data to the page instance, which the Wagtail view goes on to use, so check a copy.
+    page = copy_page(page)
+    form = form_class(request.POST, request.FILES, instance=page, parent_page=parent_page)
+    if not form.is_valid():
+        return None
+
+    return check_blocking_rules(
+        page_class, page, parent_page, timeout=get_setting('PUBLISH_TIME_BUDGET'), timeout_fails=True
+    )
+
+
+def enforce_checklist(request, page_class, page, parent_page, action):
+    """
+    Turns a publish request into a save request if the page fails an error rule.
+    """
+    failed_result = check_publish(request, page_class, page, parent_page, action)
+    if not failed_result:
+        return
+
+    # Wagtail saves a draft when the publish button wasn't pressed, so the editor's changes aren't lost.
+    request.POST = request.POST.copy()
+    del request.POST[PUBLISH_ACTION]
+    if failed_result.has_error:
+        message = 'The page was not published, because the checklist could not be checked in time: {}'
+    else:
+        message = 'The page was not published, because it failed the checklist: {}'
+
+    messages.error(request, message.format(failed_result.message))
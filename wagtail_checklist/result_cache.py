@@ -0,0 +1,70 @@
+"""
+A cache of serialized checklists, so that repeated requests with identical page data are answered
+without building the page form or checking any rules.
+
+Checklists are keyed by page class, rule plan version and a fingerprint of the request data,
+which includes the page (or parent page) id from the URL. Nothing else a rule reads is part of the
+key, so the cache is disabled unless the RESULT_CACHE_TIMEOUT setting is set.
+"""
+import threading
+
+from django.core.cache import caches
+
+from .conf import get_setting
+
+CACHE_KEY_PREFIX = 'wagtail_checklist:checklist:'
+
+# Hit and miss counts for this process, see get_result_cache_stats.
+result_cache_stats = {
+    'hits': 0,
+    'misses': 0,
+}
+result_cache_stats_lock = threading.Lock()
+
+
+def is_result_cache_enabled():
+    return bool(get_setting('RESULT_CACHE_TIMEOUT'))
+
+
+def get_cache_key(page_class, plan_version, fingerprint):
+    return '{}{}:{}:{}'.format(CACHE_KEY_PREFIX, page_class._meta.label_lower, plan_version, fingerprint)
+
+
+def get_cached_checklist(page_class, plan_version, fingerprint):
+    """
+    Returns the cached checklist for the given page data, or None if it is not cached.
+    """
+    if not is_result_cache_enabled():
+        return None
+
+    key = get_cache_key(page_class, plan_version, fingerprint)
+    checklist = caches[get_setting('RESULT_CACHE')].get(key)
+    with result_cache_stats_lock:
+        if checklist is None:
+            result_cache_stats['misses'] += 1
+        else:
+            result_cache_stats['hits'] += 1
+
+    return checklist
+
+
+def cache_checklist(page_class, plan_version, fingerprint, checklist):
+    if not is_result_cache_enabled():
+        return
+
+    key = get_cache_key(page_class, plan_version, fingerprint)
+    caches[get_setting('RESULT_CACHE')].set(key, checklist, get_setting('RESULT_CACHE_TIMEOUT'))
+
+
+def get_result_cache_stats():
+    """
+    Returns a dict of result cache hit and miss counts for this process.
+    """
+    with result_cache_stats_lock:
+        return dict(result_cache_stats)
+
+
+def reset_result_cache_stats():
+    with result_cache_stats_lock:
+        result_cache_stats['hits'] = 0
+        result_cache_stats['misses'] = 0
@@ -0,0 +1,7 @@
+from django.conf.urls import url
+
+from .consumers import ChecklistConsumer
+
+websocket_urlpatterns = [
+    url(r'^admin/checklist/ws/$', ChecklistConsumer),
+]
@@ -10,12 +10,29 @@ It also provides means to validate a Page model against the registered rules:
   - check_rules
   - check_form_rules
 
+check_rules can also answer "can this page be published?" on its own, with mode=MODE_BLOCKING_ONLY.
+
+The rules which apply to each Page class are compiled once into a RulePlan (see get_rule_plan),
+which is thrown away whenever the registries change.
+
 """
+import asyncio
+import hashlib
 import logging
+import time
+from collections import namedtuple
 from copy import deepcopy
 
+from django.db.models import Model
 from wagtail.core.models import Page
 
+from .analysis import PageAnalysis
+from .conf import get_setting
+from .declarative import FieldRule
+from .executors import gather_rules, get_parallel_executor_type, iter_rule_results, run_coroutine
+from .guards import get_guard
+from .timings import record_rule_timing
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,27 +57,164 @@ ignored_rules_registry = {
     # SomeOtherPageModel: {'tags', 'slug'},
 }
 
+# Compiled RulePlans, keyed by Page class. This is cleared whenever a rule is registered or ignored.
+rule_plan_cache = {
+    # SomePageModel: <RulePlan: 3 error rules, 0 warning rules, 2 ignored rules>,
+}
+
+# A moving average of the seconds taken to check each Rule, used to check cheap rules first.
+# Rules checked by a process pool record their cost in the worker process, not here.
+rule_costs = {
+    # <Rule for name: 'Name must be 12 characters or less'>: 0.0001,
+}
+# The weight of the latest timing in each moving average.
+RULE_COST_WEIGHT = 0.2
+
+# Check modes for check_rules
+#   - MODE_ALL: check every rule
+#   - MODE_BLOCKING_ONLY: check error rules only, cheapest first, and stop at the first failure
+MODE_ALL = 'all'
+MODE_BLOCKING_ONLY = 'blocking-only'
+
 
 class Rule:
     """
     A validation rule which is run on a Page instance.
+    Rules are shared between requests, so checking a rule must not modify it.
     """
-    def __init__(self, func, name, message):
+    def __init__(self, func, name, message, mutates_page=False, fields=None, uses_analysis=False, guard=None):
         self.func = func
         self.name = name
         self.message = message
-        self.has_error = False
-        self.is_valid = False
-
-    def check(self, page_instance, page_parent):
+        self.mutates_page = mutates_page
+        # Whether the function takes the shared PageAnalysis as a third argument.
+        self.uses_analysis = uses_analysis
+        # Declarative rules only read their field, so they don't need a copy of the page, see check_field_rules.
+        self.field_rule = func if isinstance(func, FieldRule) else None
+        if fields is None and self.field_rule:
+            fields = [self.field_rule.field]
+
+        # Decides whether the rule applies to a page at all, see guards.py.
+        self.guard = guard
+        if guard is not None and fields is not None:
+            # A change to a field the guard reads may change whether the rule applies.
+            fields = None if guard.fields is None else guard.fields.union(fields)
+
+        # The names of the form fields this rule reads, or None if it may read any field.
+        self.fields = None if fields is None else frozenset(fields)
+        # Async rules are awaited concurrently with each other, see executors.gather_rules.
+        self.is_async = asyncio.iscoroutinefunction(func)
+
+    def depends_on(self, changed_fields):
+        """
+        Returns True if this rule may have a different result when `changed_fields` have changed.
+        """
+        return self.fields is None or not self.fields.isdisjoint(changed_fields)
+
+    def check(self, page_instance, page_parent, analysis=None):
+        """
+        Returns a RuleResult for this rule, checked against the given page and parent.
+        """
+        if self.is_async:
+            return run_coroutine(self.check_async(page_instance, page_parent, analysis))
+
+        start_time = time.perf_counter()
         try:
-            self.is_valid = self.func(page_instance, page_parent)
+            is_valid = self.func(*self.get_args(page_instance, page_parent, analysis))
         except Exception:
             # We catch all exceptions here because we are executing user defined code.
             # We log the exception for visibility and flag it to the user in the client side UI.
             logger.exception('Exception while checking rule %s - %s', self.name, self.message)
-            self.is_valid = True
-            self.has_error = True
+            return self.error_result()
+        finally:
+            self.record_timing(time.perf_counter() - start_time)
+
+        return RuleResult(self.name, self.message, is_valid, False)
+
+    async def check_async(self, page_instance, page_parent, analysis=None):
+        """
+        Returns a RuleResult for this async rule, checked against the given page and parent.
+        """
+        start_time = time.perf_counter()
+        try:
+            is_valid = await self.func(*self.get_args(page_instance, page_parent, analysis))
+        except Exception:
+            # See Rule.check
+            logger.exception('Exception while checking rule %s - %s', self.name, self.message)
+            return self.error_result()
+        finally:
+            self.record_timing(time.perf_counter() - start_time)
+
+        return RuleResult(self.name, self.message, is_valid, False)
+
+    def get_args(self, page_instance, page_parent, analysis):
+        """
+        Returns the arguments for this rule's function.
+        """
+        if not self.uses_analysis:
+            return page_instance, page_parent
+
+        # Rules checked on their own, outside of check_rules, analyse the page themselves.
+        return page_instance, page_parent, analysis or PageAnalysis(page_instance)
+
+    def check_field_values(self, values):
+        """
+        Returns a list of RuleResults for this declarative rule, for a column of its field's values.
+        The column is timed as one call, taking the time per value, since timing each value would cost
+        more than checking it.
+        """
+        start_time = time.perf_counter()
+        try:
+            column = self.field_rule.check_values(values)
+        except Exception:
+            # A value the rule couldn't handle, so find which one by checking them one at a time.
+            return [self.check_field_value(value) for value in values]
+
+        if values:
+            self.record_timing((time.perf_counter() - start_time) / len(values))
+
+        results = {
+            True: RuleResult(self.name, self.message, True, False),
+            False: RuleResult(self.name, self.message, False, False),
+        }
+        return [results[bool(is_valid)] for is_valid in column]
+
+    def check_field_value(self, value):
+        """
+        Returns a RuleResult for this declarative rule, for one value of its field.
+        """
+        start_time = time.perf_counter()
+        try:
+            is_valid = self.field_rule.check_value(value)
+        except Exception:
+            # See Rule.check
+            logger.exception('Exception while checking rule %s - %s', self.name, self.message)
+            return self.error_result()
+        finally:
+            self.record_timing(time.perf_counter() - start_time)
+
+        return RuleResult(self.name, self.message, is_valid, False)
+
+    def record_timing(self, seconds):
+        """
+        Records the time taken to check this rule, for cost ordering and instrumentation.
+        """
+        record_rule_cost(self, seconds)
+        record_rule_timing(self, seconds)
+
+    def error_result(self):
+        """
+        Returns a RuleResult for when this rule could not be checked.
+        Such rules pass, but are flagged as errors in the client side UI.
+        """
+        return RuleResult(self.name, self.message, True, True)
+
+    def timeout_result(self):
+        """
+        Returns a RuleResult for when this rule was not checked in time.
+        Like error_result it passes, except where timeouts must fail, see check_blocking_rules.
+        """
+        return TimedOutResult(self.name, self.message, True, True)
 
     def __str__(self):
         return '<Rule for {}: \'{}\'>'.format(self.name, self.message)
@@ -69,21 +223,116 @@ class Rule:
         return self.__str__()
 
 
-def register_error_rule(page_class, rule_name, rule_message):
+class RuleResult(namedtuple('RuleResult', ['name', 'message', 'is_valid', 'has_error'])):
+    """
+    The outcome of checking a single rule during a single request.
+    """
+    __slots__ = ()
+
+
+class TimedOutResult(RuleResult):
+    """
+    The outcome of a rule which was still running when its results were no longer waited for.
+    """
+    __slots__ = ()
+
+
+class RulePlan:
+    """
+    The rules which apply to a single Page class, with ignored rules already removed.
+    """
+    __slots__ = ('error_rules', 'warning_rules', 'ignored_rules', 'field_rule_groups', 'guard_groups', 'version')
+
+    def __init__(self, error_rules, warning_rules, ignored_rules):
+        self.error_rules = tuple(error_rules)
+        self.warning_rules = tuple(warning_rules)
+        self.ignored_rules = frozenset(ignored_rules)
+        self.field_rule_groups = self.get_field_rule_groups()
+        self.guard_groups = self.get_guard_groups()
+        self.version = self.get_version()
+
+    def get_field_rule_groups(self):
+        """
+        Returns the declarative rules grouped by field, as a tuple of (field, ((index, Rule), ...)) tuples.
+        Indexes count error rules first, then warning rules.
+        """
+        groups = {}
+        for index, rule in enumerate(self.error_rules + self.warning_rules):
+            if rule.field_rule:
+                groups.setdefault(rule.field_rule.field, []).append((index, rule))
+
+        return tuple((field, tuple(group)) for field, group in groups.items())
+
+    def get_guard_groups(self):
+        """
+        Returns the indexes of the guarded rules grouped by guard, as a tuple of (guard, frozenset of indexes) tuples,
+        so that a guard shared by many rules is only checked once. Indexes count error rules first, then warning rules.
+        """
+        guards = {}
+        groups = {}
+        for index, rule in enumerate(self.error_rules + self.warning_rules):
+            if rule.guard is not None:
+                key = rule.guard.get_key()
+                guards.setdefault(key, rule.guard)
+                groups.setdefault(key, []).append(index)
+
+        return tuple((guards[key], frozenset(group)) for key, group in groups.items())
+
+    def get_version(self):
+        """
+        Returns a hash which identifies the rules in this plan, so that results saved by
+        one process can be safely reused by another process with the same rules.
+        """
+        hasher = hashlib.sha1()
+        for rule in self.error_rules + self.warning_rules:
+            identity = (
+                rule.name,
+                rule.message,
+                getattr(rule.func, '__module__', None),
+                getattr(rule.func, '__qualname__', None),
+                sorted(rule.fields) if rule.fields is not None else None,
+                # Declarative rules are instances, which are told apart by their parameters.
+                repr(rule.field_rule) if rule.field_rule else None,
+                rule.guard.get_identity() if rule.guard else None,
+            )
+            hasher.update(repr(identity).encode())
+
+        hasher.update(repr(sorted(self.ignored_rules)).encode())
+        return hasher.hexdigest()
+
+    def __str__(self):
+        return '<RulePlan: {} error rules, {} warning rules, {} ignored rules>'.format(
+            len(self.error_rules), len(self.warning_rules), len(self.ignored_rules)
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def register_error_rule(page_class, rule_name, rule_message, mutates_page=False, fields=None, uses_analysis=False,
+                        when=None):
     """
     A decorator which adds the wrapped function to the list of error rules
     """
-    return register_rule(error_rules_registry, page_class, rule_name, rule_message)
+    return register_rule(
+        error_rules_registry, page_class, rule_name, rule_message, mutates_page=mutates_page, fields=fields,
+        uses_analysis=uses_analysis, when=when,
+    )
 
 
-def register_warning_rule(page_class, rule_name, rule_message):
+def register_warning_rule(page_class, rule_name, rule_message, mutates_page=False, fields=None, uses_analysis=False,
+                          when=None):
     """
     A decorator which adds the wrapped function to the list of warning rules
     """
-    return register_rule(warning_rules_registry, page_class, rule_name, rule_message)
+    return register_rule(
+        warning_rules_registry, page_class, rule_name, rule_message, mutates_page=mutates_page, fields=fields,
+        uses_analysis=uses_analysis, when=when,
+    )
 
 
-def register_rule(registry, page_class, rule_name, rule_message):
+def register_rule(registry, page_class, rule_name, rule_message, mutates_page=False, fields=None, uses_analysis=False,
+                  when=None):
     """
     Adds the wrapped function to the supplied registry.
 
@@ -92,6 +341,22 @@ def register_rule(registry, page_class, rule_name, rule_message):
             - page instance <page_class>
             - page parent <Page>
         returns: is_valid <bool>
+
+    The wrapped function may be a coroutine function (`async def`), in which case it is awaited
+    concurrently with the other async rules for the page.
+
+    Rules share a single copy of the page and parent, so a wrapped function which modifies
+    either of them must be registered with `mutates_page=True` to be given its own copy.
+
+    If `fields` lists the form fields which the wrapped function reads, then the rule is only
+    re-checked when one of those fields changes (see check_rules).
+
+    If `uses_analysis` is True, the wrapped function is also passed a PageAnalysis, which parses
+    the page's fields once and shares the results between rules (see analysis.py).
+
+    If `when` is given, the rule is only checked for pages it applies to, and is left out of the
+    checklist for other pages. It is either a dict of field values which the page must have, or a
+    function which takes the page and its parent and returns True if the rule applies (see guards.py).
     """
     if not rule_name:
         raise RuleRegistrationError('Failed to register rule - a name is required')
@@ -103,18 +368,37 @@ def register_rule(registry, page_class, rule_name, rule_message):
         msg = 'Failure to register rule {} - "{}", since {} is not a subclass of Page'
         raise RuleRegistrationError(msg.format(rule_name, rule_message, page_class))
 
+    try:
+        guard = get_guard(when)
+    except ValueError as e:
+        raise RuleRegistrationError('Failed to register rule {} - {}'.format(rule_name, e))
+
+    guard_fields = guard.fields if guard is not None and guard.fields is not None else ()
+    for field in sorted(guard_fields):
+        if not hasattr(page_class, field):
+            msg = 'Failed to register rule {} - {} has no field {} to guard on'
+            raise RuleRegistrationError(msg.format(rule_name, page_class.__name__, field))
+
     def wrapper(func):
-        type_name = type(func).__name__
-        if type_name != 'function':
-            msg = 'Wrapped validation function must be of type "function", not {}.'.format(type_name)
+        if not callable(func):
+            msg = 'Wrapped validation function must be callable, not {}.'.format(type(func).__name__)
             raise RuleRegistrationError(msg)
 
-        registered_rule = Rule(func, rule_name, rule_message)
+        if isinstance(func, FieldRule) and not hasattr(page_class, func.field):
+            msg = 'Failed to register rule {} - {} has no field {}'
+            raise RuleRegistrationError(msg.format(rule_name, page_class.__name__, func.field))
+
+        registered_rule = Rule(
+            func, rule_name, rule_message, mutates_page=mutates_page, fields=fields, uses_analysis=uses_analysis,
+            guard=guard,
+        )
         try:
             registry[page_class].append(registered_rule)
         except (KeyError, AttributeError):
             registry[page_class] = [registered_rule]
 
+        clear_rule_plans()
+
     return wrapper
 
 
@@ -134,6 +418,8 @@ def dont_check_rule(page_class, rule_name):
     except (KeyError, AttributeError):
         ignored_rules_registry[page_class] = {rule_name}
 
+    clear_rule_plans()
+
 
 def get_ignored_rules(page_class):
     """
@@ -168,40 +454,385 @@ def get_rules(page_class, registry):
     return rules
 
 
+def get_rule_plan(page_class):
+    """
+    Returns the RulePlan for `page_class`, compiling it from the registries on first use.
+    """
+    try:
+        return rule_plan_cache[page_class]
+    except KeyError:
+        pass
+
+    ignored_rules = get_ignored_rules(page_class)
+    plan = RulePlan(
+        error_rules=get_rules(page_class, error_rules_registry),
+        warning_rules=get_rules(page_class, warning_rules_registry),
+        ignored_rules=ignored_rules,
+    )
+    rule_plan_cache[page_class] = plan
+    return plan
+
+
+def clear_rule_plans():
+    """
+    Throw away all compiled RulePlans, so that they are rebuilt from the registries.
+    """
+    rule_plan_cache.clear()
+
+
 def check_form_rules(page_class, form):
     """
-    Returns a list of all failed Rules from a Wagtail `Page` form.
+    Returns a list of RuleResults for all failed fields in a Wagtail `Page` form.
     """
     form.is_valid()
-    ignored_rules = get_ignored_rules(page_class)
-    rules = []
+    ignored_rules = get_rule_plan(page_class).ignored_rules
+    results = []
     for field_name, messages in form.errors.items():
         if field_name in ignored_rules:
             continue
 
         for message in messages:
-            rule = Rule(None, field_name, message)
-            rule.is_valid = False
-            rules.append(rule)
+            results.append(RuleResult(field_name, message, False, False))
 
-    return rules
+    return results
 
 
-def check_rules(page_class, page_instance, page_parent):
+def check_rules(page_class, page_instance, page_parent, changed_fields=None, previous_results=None, mode=MODE_ALL):
     """
     Checks the Page instance `page_instance` against all registered rules for `page_class`.
-    Returns a tuple of checked error and warning Rules.
+    Returns a tuple of error and warning RuleResult lists.
+
+    If `previous_results` is given (error and warning results from an earlier check against the
+    same RulePlan) then only the rules which depend on `changed_fields` are checked again.
+
+    With mode=MODE_BLOCKING_ONLY, only the error rules are checked, and the error list contains just
+    the first failing result, or nothing if the page can be published. See check_blocking_rules.
+
+    Rules which don't apply to the page (see guards.py) are not checked, and have no result in either list.
+    So if the plan has guarded rules, `previous_results` must instead be aligned with the rules in the plan,
+    with None for rules which didn't apply, as the checklist API saves them (see iter_check_rules).
+    """
+    if mode == MODE_BLOCKING_ONLY:
+        failed_result = check_blocking_rules(page_class, page_instance, page_parent)
+        return [failed_result] if failed_result else [], []
+
+    if mode != MODE_ALL:
+        raise ValueError('Unknown checklist mode {}'.format(mode))
+
+    plan = get_rule_plan(page_class)
+    results = [None] * (len(plan.error_rules) + len(plan.warning_rules))
+    for _, index, result in iter_check_rules(page_class, page_instance, page_parent, changed_fields, previous_results):
+        results[index] = result
+
+    return split_results(plan, results)
+
+
+def split_results(plan, results):
+    """
+    Splits a list of results for all of the rules in `plan` into error and warning lists,
+    leaving out the rules which didn't apply.
+    """
+    num_error_rules = len(plan.error_rules)
+    return (
+        [result for result in results[:num_error_rules] if result is not None],
+        [result for result in results[num_error_rules:] if result is not None],
+    )
+
+
+def iter_check_rules(page_class, page_instance, page_parent, changed_fields=None, previous_results=None):
     """
-    error_rules = get_rules(page_class, error_rules_registry)
-    warning_rules = get_rules(page_class, warning_rules_registry)
+    Like check_rules, but yields a (rule type, index, RuleResult) tuple as soon as each rule has been checked.
+    The rule type is 'ERROR' or 'WARNING', and the index counts error rules first, then warning rules.
+    Nothing is yielded for rules which don't apply to the page, and `previous_results` may have None for them.
+    """
+    plan = get_rule_plan(page_class)
+    page_copies = PageCopies(page_instance, page_parent, get_setting('ISOLATION'))
+    rules = plan.error_rules + plan.warning_rules
+    num_error_rules = len(plan.error_rules)
+
+    def get_rule_type(index):
+        return 'ERROR' if index < num_error_rules else 'WARNING'
+
+    stale_indices = list(range(len(rules)))
+    if previous_results is not None and changed_fields is not None:
+        previous_error_results, previous_warning_results = previous_results
+        stale_indices = [i for i, rule in enumerate(rules) if rule.depends_on(changed_fields)]
+        stale_index_set = set(stale_indices)
+        for index, result in enumerate(list(previous_error_results) + list(previous_warning_results)):
+            if index not in stale_index_set and result is not None:
+                yield get_rule_type(index), index, result
+
+    if plan.guard_groups:
+        skipped_indices = get_skipped_indices(plan, page_instance, page_parent, stale_indices)
+        stale_indices = [i for i in stale_indices if i not in skipped_indices]
+
+    if plan.field_rule_groups:
+        for index, result in check_field_rules(plan, page_instance, set(stale_indices)):
+            yield get_rule_type(index), index, result
 
-    for rule in error_rules:
-        rule.check(deepcopy(page_instance), deepcopy(page_parent))
+        stale_indices = [i for i in stale_indices if not rules[i].field_rule]
 
-    for rule in warning_rules:
-        rule.check(deepcopy(page_instance), deepcopy(page_parent))
+    for stale_index, result in iter_rule_results([rules[i] for i in stale_indices], page_copies):
+        index = stale_indices[stale_index]
+        yield get_rule_type(index), index, result
 
-    return error_rules, warning_rules
+
+def check_blocking_rules(page_class, page_instance, page_parent, timeout=None, timeout_fails=False):
+    """
+    Checks the Page instance `page_instance` against the error rules for `page_class`, one at a time
+    and cheapest first, until one fails. Returns the failed RuleResult, or None if every rule passed.
+
+    If `timeout` is given, the rules are instead checked in parallel, and any rules which are
+    still running after `timeout` seconds are not waited for. Rules which time out (including after
+    RULE_TIMEOUT) pass, unless `timeout_fails` is set, when the first one is returned as a failure.
+
+    Rules which could not be checked pass, as they do in the full checklist, and rules which don't apply are skipped.
+    """
+    plan = get_rule_plan(page_class)
+    indices = range(len(plan.error_rules))
+    if plan.guard_groups:
+        skipped_indices = get_skipped_indices(plan, page_instance, page_parent, indices)
+        indices = [i for i in indices if i not in skipped_indices]
+
+    # Declarative rules are the cheapest of all, so they are checked first.
+    for index, result in check_field_rules(plan, page_instance, indices):
+        if not result.is_valid:
+            return result
+
+    page_copies = PageCopies(page_instance, page_parent, get_setting('ISOLATION'))
+    rules = sort_rules_by_cost([plan.error_rules[i] for i in indices if not plan.error_rules[i].field_rule])
+    if timeout is None:
+        results = (rule.check(*page_copies.get(rule)) for rule in rules)
+    else:
+        executor_type = get_parallel_executor_type(get_setting('EXECUTOR'))
+        results = (result for _, result in iter_rule_results(rules, page_copies, executor_type, budget=timeout))
+
+    for result in results:
+        if timeout_fails and isinstance(result, TimedOutResult):
+            return RuleResult(result.name, result.message, False, True)
+
+        if not result.is_valid:
+            return result
+
+    return None
+
+
+def get_skipped_indices(plan, page_instance, page_parent, indices=None):
+    """
+    Checks the guards in `plan` for the rules whose indexes are in `indices` (or all rules), checking each guard once.
+    Returns the set of indexes of the rules which don't apply to the page.
+
+    A guard which raises an exception is logged, and its rules are checked as if it had passed.
+    """
+    skipped_indices = set()
+    for guard, group in plan.guard_groups:
+        if indices is not None and group.isdisjoint(indices):
+            continue
+
+        try:
+            applies = guard.check(page_instance, page_parent)
+        except Exception:
+            # See Rule.check
+            logger.exception('Exception while checking guard %r', guard)
+            continue
+
+        if not applies:
+            skipped_indices |= group
+
+    return skipped_indices
+
+
+def check_field_rules(plan, page_instance, indices):
+    """
+    Checks the declarative rules in `plan` whose indexes are in `indices`, reading each field of the page once.
+    Yields (index, RuleResult) tuples.
+    """
+    for field, group in plan.field_rule_groups:
+        group = [(index, rule) for index, rule in group if index in indices]
+        if not group:
+            continue
+
+        try:
+            value = getattr(page_instance, field)
+        except Exception:
+            logger.exception('Exception while reading field %s for declarative rules', field)
+            for index, rule in group:
+                yield index, rule.error_result()
+
+            continue
+
+        for index, rule in group:
+            yield index, rule.check_field_value(value)
+
+
+def check_rules_bulk(page_class, page_instances, page_parents):
+    """
+    Checks many pages of the same class against all registered rules for `page_class`.
+    Returns a list with a tuple of error and warning RuleResult lists for each page.
+
+    Declarative rules are checked for all of the pages at once: each field is read into a column,
+    and each rule checks the whole column. The other rules are checked page by page, as in check_rules.
+    """
+    plan = get_rule_plan(page_class)
+    rules = plan.error_rules + plan.warning_rules
+    results = [[None] * len(rules) for _ in page_instances]
+    for field, group in plan.field_rule_groups:
+        positions = []
+        values = []
+        for position, page_instance in enumerate(page_instances):
+            try:
+                values.append(getattr(page_instance, field))
+            except Exception:
+                # See check_field_rules
+                logger.exception('Exception while reading field %s for declarative rules', field)
+                for index, rule in group:
+                    results[position][index] = rule.error_result()
+
+                continue
+
+            positions.append(position)
+
+        for index, rule in group:
+            for position, result in zip(positions, rule.check_field_values(values)):
+                results[position][index] = result
+
+    other_indices = [i for i, rule in enumerate(rules) if not rule.field_rule]
+    isolation = get_setting('ISOLATION')
+    for page_instance, page_parent, page_results in zip(page_instances, page_parents, results):
+        page_indices = other_indices
+        if plan.guard_groups:
+            # Checking a column is cheaper than picking out the pages a declarative rule applies to,
+            # so their results are only thrown away here.
+            skipped_indices = get_skipped_indices(plan, page_instance, page_parent)
+            for index in skipped_indices:
+                page_results[index] = None
+
+            page_indices = [i for i in other_indices if i not in skipped_indices]
+
+        if page_indices:
+            page_copies = PageCopies(page_instance, page_parent, isolation)
+            for page_index, result in iter_rule_results([rules[i] for i in page_indices], page_copies):
+                page_results[page_indices[page_index]] = result
+
+    return [split_results(plan, page_results) for page_results in results]
+
+
+def check_pages_bulk(page_instances, page_parents):
+    """
+    Like check_rules_bulk, for pages of any class. Returns results in the same order as `page_instances`.
+    """
+    pages_by_class = {}
+    for position, page_instance in enumerate(page_instances):
+        pages_by_class.setdefault(type(page_instance), []).append(position)
+
+    results = [None] * len(page_instances)
+    for page_class, positions in pages_by_class.items():
+        class_results = check_rules_bulk(
+            page_class, [page_instances[i] for i in positions], [page_parents[i] for i in positions]
+        )
+        for position, page_results in zip(positions, class_results):
+            results[position] = page_results
+
+    return results
+
+
+def record_rule_cost(rule, seconds):
+    """
+    Adds a timing for `rule` to its moving average cost.
+    """
+    cost = rule_costs.get(rule)
+    if cost is None:
+        rule_costs[rule] = seconds
+    else:
+        rule_costs[rule] = cost + RULE_COST_WEIGHT * (seconds - cost)
+
+
+def sort_rules_by_cost(rules):
+    """
+    Returns `rules` sorted by their moving average cost. Rules which have not been timed yet come first,
+    so that they are timed, and rules with the same cost keep their registration order.
+    """
+    return sorted(rules, key=lambda rule: rule_costs.get(rule, 0))
+
+
+async def check_rules_async(page_class, page_instance, page_parent):
+    """
+    Checks the Page instance `page_instance` against all registered rules for `page_class`,
+    for callers which are already running in an event loop.
+    Returns a tuple of error and warning RuleResult lists.
+    """
+    plan = get_rule_plan(page_class)
+    rules = plan.error_rules + plan.warning_rules
+    skipped_indices = get_skipped_indices(plan, page_instance, page_parent)
+    indices = [i for i in range(len(rules)) if i not in skipped_indices]
+    page_copies = PageCopies(page_instance, page_parent, get_setting('ISOLATION'))
+    results = [None] * len(rules)
+    for index, result in zip(indices, await gather_rules([rules[i] for i in indices], page_copies)):
+        results[index] = result
+
+    return split_results(plan, results)
+
+
+def add_block_definitions(block, memo):
+    """
+    Add `block` and its child blocks to a deepcopy memo, so that copies share them.
+    """
+    memo[id(block)] = block
+    for child_block in getattr(block, 'child_blocks', {}).values():
+        add_block_definitions(child_block, memo)
+
+    child_block = getattr(block, 'child_block', None)
+    if child_block is not None:
+        add_block_definitions(child_block, memo)
+
+
+def copy_page(page):
+    """
+    Returns a deep copy of `page`.
+    StreamField values refer to their field's block definitions, which cannot be deep copied,
+    so the copy shares the block definitions with the original.
+    """
+    memo = {}
+    for field in page._meta.concrete_fields if isinstance(page, Model) else []:
+        stream_block = getattr(field, 'stream_block', None)
+        if stream_block is not None:
+            add_block_definitions(stream_block, memo)
+
+    return deepcopy(page, memo)
+
+
+class PageCopies:
+    """
+    Hands out copies of a page and its parent to rules, so that rules cannot modify
+    the originals or interfere with each other, along with an analysis of the page which they all share.
+    """
+    ISOLATE_REQUEST = 'request'
+    ISOLATE_RULE = 'rule'
+
+    def __init__(self, page_instance, page_parent, isolation):
+        if isolation not in (self.ISOLATE_REQUEST, self.ISOLATE_RULE):
+            raise ValueError('Unknown checklist isolation mode {}'.format(isolation))
+
+        self.page_instance = page_instance
+        self.page_parent = page_parent
+        self.isolation = isolation
+        self.shared_copy = None
+        # The analysis is of the original page, so it isn't affected by rules which modify their copy.
+        self.analysis = PageAnalysis(page_instance)
+
+    def get(self, rule):
+        """
+        Returns a (page, parent, analysis) tuple for `rule` to check.
+        """
+        if self.isolation == self.ISOLATE_RULE or rule.mutates_page:
+            return copy_page(self.page_instance), copy_page(self.page_parent), self.analysis
+
+        # The shared copy is only made once it is needed, so that a request with no rules,
+        # or only mutating rules, does not pay for it.
+        if not self.shared_copy:
+            self.shared_copy = (copy_page(self.page_instance), copy_page(self.page_parent), self.analysis)
+
+        return self.shared_copy
 
 
 class RuleRegistrationError(Exception):
@@ -1,10 +1,18 @@
 import re
 
 from django.contrib.contenttypes.models import ContentType
-from rest_framework import serializers
+from django.db.models import CharField, Q, Subquery
+from django.db.models.functions import Length, Substr
+from rest_framework import exceptions, serializers
 from wagtail.core.models import Page
 
-from .rules import check_form_rules, check_rules
+from .conf import get_setting
+from .forms import get_form_class
+from .pages import get_parent_page, get_parent_pages, get_specific_page
+from .profiling import NullProfile
+from .result_cache import cache_checklist, get_cached_checklist
+from .rules import check_form_rules, check_pages_bulk, get_rule_plan, iter_check_rules
+from .snapshots import Snapshot, apply_page_changes, get_fingerprint, load_snapshot, save_snapshot
 
 
 class PageActions:
@@ -12,13 +20,98 @@ class PageActions:
     CREATE = 'CREATE'
 
 
+def serialize_result(result, error_type):
+    """
+    Build the data sent to the client for one RuleResult.
+    """
+    return {
+        'isValid': result.is_valid,
+        'hasError': result.has_error,
+        'type': error_type,
+        'message': result.message,
+    }
+
+
+def get_display_name(result):
+    """
+    Returns the checklist entry name for a RuleResult.
+    """
+    return result.name.lower().replace('_', ' ')
+
+
+def serialize_checklist(form_results, error_results, warning_results):
+    """
+    Build the checklist sent to the client from lists of RuleResults.
+    Results may be None for rules which didn't apply to the page, which are left out.
+    """
+    result_lists = [
+        ('ERROR', form_results),
+        ('ERROR', error_results),
+        ('WARNING', warning_results)
+    ]
+
+    checklist = {}
+    for error_type, result_list in result_lists:
+        for result in result_list:
+            if result is None:
+                continue
+
+            serialized_rule = serialize_result(result, error_type)
+            name = get_display_name(result)
+            try:
+                checklist[name].append(serialized_rule)
+            except (KeyError, AttributeError):
+                checklist[name] = [serialized_rule]
+
+    return checklist
+
+
+def serialize_result_event(key, result, error_type):
+    """
+    Build the data for a streamed 'result' event. `key` identifies the rule within its checklist.
+    """
+    data = serialize_result(result, error_type)
+    data['key'] = key
+    data['name'] = get_display_name(result)
+    return data
+
+
+class ChecklistEvents:
+    # A single rule or form field has been checked.
+    RESULT = 'result'
+    # The whole checklist has been checked, sent last.
+    DONE = 'done'
+    # The page could not be checked, sent instead of any other event.
+    ERROR = 'error'
+
+
+class SnapshotExpired(exceptions.APIException):
+    """
+    Raised when a request only contains changed fields, but the page data they were
+    changed from has expired. The client should send the full page data instead.
+    """
+    status_code = 409
+    default_detail = 'The base snapshot has expired, send the full page data.'
+    default_code = 'snapshot_expired'
+
+
 class ChecklistSerializer(serializers.Serializer):
     EDIT_REGEX = r'/pages/(?P<page_id>\d+)/edit/$'
     CREATE_REGEX = r'/pages/add/(?P<app_name>\w+)/(?P<model_name>\w+)/(?P<parent_id>\d+)/$'
 
     url = serializers.URLField()
     action = serializers.ChoiceField([PageActions.EDIT, PageActions.CREATE])
-    page = serializers.JSONField()
+    page = serializers.JSONField(required=False)
+    # Clients which send a fingerprint (null for their first request) receive a fingerprint
+    # in each response. Sending it back allows unchanged rules to be skipped.
+    fingerprint = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    # Instead of the full page, clients can send the fields which have changed or been removed
+    # since the request with `fingerprint`.
+    changed = serializers.DictField(required=False)
+    removed = serializers.ListField(child=serializers.CharField(), required=False)
+
+    # The snapshot which the changed fields were applied to, so it is only loaded once per request.
+    base_snapshot = None
 
     def validate(self, data):
         """
@@ -33,67 +126,174 @@ class ChecklistSerializer(serializers.Serializer):
         )
         if not is_valid_url:
             raise serializers.ValidationError('Invalid URL for action {}'.format(action))
+
+        if 'page' not in validated:
+            validated['page'] = self.get_changed_page_data(validated)
+
         return validated
 
+    def get_changed_page_data(self, validated):
+        """
+        Rebuild the full page data by applying the changed fields to the page data of the
+        snapshot with the request's fingerprint.
+        """
+        if 'changed' not in validated and 'removed' not in validated:
+            raise serializers.ValidationError({'page': ['This field is required.']})
+
+        snapshot = load_snapshot(validated.get('fingerprint'))
+        if not snapshot or snapshot.url != validated['url']:
+            raise SnapshotExpired()
+
+        self.base_snapshot = snapshot
+        return apply_page_changes(snapshot.page_data, validated.get('changed', {}), validated.get('removed', []))
+
+    @property
+    def profile(self):
+        """
+        The RequestProfile passed in the serializer context, or a NullProfile.
+        """
+        return self.context.get('profile') or NullProfile()
+
     def create(self, validated_data):
         """
         Construct a Page instance and validate the instance against the built-in Wagtail
         form, as well as any rules that are registered.
         """
-        # Use information encoded in the URL to build a page instance.
+        page_class, page, parent_page = self.get_page(validated_data)
+        for event, data in self.iter_events(validated_data, page_class, page, parent_page):
+            if event == ChecklistEvents.DONE:
+                return data
+
+    def get_page(self, validated_data):
+        """
+        Use information encoded in the URL to build a page instance.
+        Returns a tuple of the page class, the page instance and its parent page.
+        """
         if validated_data['action'] == PageActions.EDIT:
-            page_class, page, parent_page = self.get_edit_page(validated_data)
-        else:
-            page_class, page, parent_page = self.get_create_page(validated_data)
+            return self.get_edit_page(validated_data)
+
+        return self.get_create_page(validated_data)
+
+    def iter_events(self, validated_data, page_class, page, parent_page):
+        """
+        Yields (event, data) tuples: a ChecklistEvents.RESULT event as soon as each form field or
+        rule has been checked, and then a ChecklistEvents.DONE event with the full checklist.
+        """
+        # Identical requests are answered from the result cache, without validating the page.
+        profile = self.profile
+        with profile.phase('cache'):
+            plan_version = get_rule_plan(page_class).version
+            fingerprint = get_fingerprint(validated_data['url'], validated_data['action'], validated_data['page'])
+            checklist = get_cached_checklist(page_class, plan_version, fingerprint)
+
+        if checklist is None:
+            checklist = yield from self.iter_build_events(
+                validated_data, page_class, page, parent_page, plan_version, fingerprint
+            )
+            cache_checklist(page_class, plan_version, fingerprint, checklist)
+
+        data = {'checklist': checklist}
+        if 'fingerprint' in validated_data:
+            data['fingerprint'] = fingerprint
+
+        if profile.enabled:
+            profile.stop()
+            data['profile'] = profile.as_dict()
+
+        yield ChecklistEvents.DONE, data
+
+    def iter_build_events(self, validated_data, page_class, page, parent_page, plan_version, fingerprint):
+        """
+        Yields a ChecklistEvents.RESULT event for each form error and rule result for the page data.
+        Returns the finished checklist.
+        """
+        profile = self.profile
 
         # Construct and validate a model-specific form so that we can add Wagtail's built-in
         # validation to our response.
-        edit_handler = page_class.get_edit_handler()
-        form_class = edit_handler.get_form_class()
-        form = form_class(validated_data['page'], instance=page, parent_page=parent_page)
+        with profile.phase('form_class'):
+            _, form_class = get_form_class(page_class)
 
         # Build a list of Wagtail built-in form errors
-        form_rules = check_form_rules(page_class, form)
-
-        # Build a list of custom rules
-        error_rules, warning_rules = check_rules(page_class, page, parent_page)
-
-        rule_lists = [
-            ('ERROR', form_rules),
-            ('ERROR', error_rules),
-            ('WARNING', warning_rules)
-        ]
-
-        # Build the checklist from the rule lists
-        checklist = {}
-        for error_type, rule_list in rule_lists:
-            for rule in rule_list:
-                serialized_rule = {
-                    'isValid': rule.is_valid,
-                    'hasError': rule.has_error,
-                    'type': error_type,
-                    'message': rule.message,
-                }
-                name = rule.name.lower().replace('_', ' ')
-                try:
-                    checklist[name].append(serialized_rule)
-                except (KeyError, AttributeError):
-                    checklist[name] = [serialized_rule]
-
-        return {'checklist': checklist}
+        with profile.phase('form'):
+            form = form_class(validated_data['page'], instance=page, parent_page=parent_page)
+            form_results = check_form_rules(page_class, form)
+
+        for index, result in enumerate(form_results):
+            yield ChecklistEvents.RESULT, serialize_result_event('form:{}'.format(index), result, 'ERROR')
+
+        # Build a list of custom rule results, re-using results from the client's previous
+        # request for any rules which don't depend on the fields that have changed since.
+        is_incremental = 'fingerprint' in validated_data
+        changed_fields = None
+        previous_results = None
+        if is_incremental:
+            snapshot = self.base_snapshot or load_snapshot(validated_data['fingerprint'])
+            if snapshot and snapshot.url == validated_data['url'] and snapshot.plan_version == plan_version:
+                changed_fields = snapshot.get_changed_fields(validated_data['page'])
+                previous_results = (snapshot.error_results, snapshot.warning_results)
+
+        plan = get_rule_plan(page_class)
+        num_error_rules = len(plan.error_rules)
+        rule_results = [None] * (num_error_rules + len(plan.warning_rules))
+        rule_events = iter_check_rules(
+            page_class, page, parent_page, changed_fields=changed_fields, previous_results=previous_results
+        )
+        with profile.phase('rules'):
+            for rule_type, index, result in rule_events:
+                profile.record_rule(result)
+                rule_results[index] = result
+                key = 'rule:{}'.format(index)
+                yield ChecklistEvents.RESULT, serialize_result_event(key, result, rule_type)
+
+        error_results = rule_results[:num_error_rules]
+        warning_results = rule_results[num_error_rules:]
+        if is_incremental:
+            with profile.phase('snapshot'):
+                snapshot = Snapshot(
+                    validated_data['url'], validated_data['page'], plan_version, error_results, warning_results
+                )
+                save_snapshot(fingerprint, snapshot)
+
+        with profile.phase('serialize'):
+            return serialize_checklist(form_results, error_results, warning_results)
 
     def get_edit_page(self, validated_data):
         """
         Construct a Page instance using data the Wagtail editor's 'edit' page.
         Use the Page pk to fetch the instance from the database.
+
+        The page and its parent are fetched in a single query, and the specific page instance
+        in a second query only if the page is a Page subclass. Content types are cached by Django.
         """
-        url_data = re.search(self.EDIT_REGEX, validated_data['url']).groupdict()
-        page = Page.objects.get(pk=url_data['page_id']).specific
-        content_type = ContentType.objects.get_for_model(page)
-        page_class = content_type.model_class()
-        parent_page = page.get_parent()
-        if not parent_page:
-            raise serializers.ValidationError('Page must have a parent')
+        with self.profile.phase('url'):
+            url_data = re.search(self.EDIT_REGEX, validated_data['url']).groupdict()
+            page_id = int(url_data['page_id'])
+
+        with self.profile.phase('page'):
+            parent_path = (
+                Page.objects
+                .filter(pk=page_id)
+                .annotate(parent_path=Substr(
+                    'path', 1, Length('path') - Page.steplen, output_field=CharField()
+                ))
+                .values('parent_path')
+            )
+            page = parent_page = None
+            for base_page in Page.objects.filter(Q(pk=page_id) | Q(path=Subquery(parent_path))):
+                if base_page.pk == page_id:
+                    page = base_page
+                else:
+                    parent_page = base_page
+
+            if not page:
+                raise Page.DoesNotExist('Page matching query does not exist.')
+
+            if not parent_page:
+                raise serializers.ValidationError('Page must have a parent')
+
+            page_class = ContentType.objects.get_for_id(page.content_type_id).model_class()
+            page = page.specific
 
         return page_class, page, parent_page
 
@@ -101,10 +301,100 @@ class ChecklistSerializer(serializers.Serializer):
         """
         Construct a Page instance using data the Wagtail editor's 'add' page.
         Use the app name and model name to construct a new Page model.
+        Raises ContentType.DoesNotExist if there is no such model.
+
+        The specific parent is fetched in a single query once its type is known, see get_specific_page.
+        Content types are cached by Django.
         """
-        url_data = re.search(self.CREATE_REGEX, validated_data['url']).groupdict()
-        content_type = ContentType.objects.get_by_natural_key(url_data['app_name'], url_data['model_name'])
-        page_class = content_type.model_class()
-        parent_page = Page.objects.get(pk=url_data['parent_id']).specific
-        page = page_class()
+        with self.profile.phase('url'):
+            url_data = re.search(self.CREATE_REGEX, validated_data['url']).groupdict()
+
+        with self.profile.phase('page'):
+            content_type = ContentType.objects.get_by_natural_key(url_data['app_name'], url_data['model_name'])
+            page_class = content_type.model_class()
+            if page_class is None:
+                # A stale content type, whose model has been removed
+                raise ContentType.DoesNotExist('No model for content type {}'.format(content_type))
+
+            parent_page = get_specific_page(int(url_data['parent_id']))
+            page = page_class()
+
         return page_class, page, parent_page
+
+
+class BatchChecklistSerializer(serializers.Serializer):
+    """
+    Validates many pages in one request, either as they are saved in the database (`pages`, a list
+    of page ids) or using page data from the Wagtail editor (`payloads`, a list of ChecklistSerializer data).
+    """
+    pages = serializers.ListField(child=serializers.IntegerField(), required=False)
+    payloads = ChecklistSerializer(many=True, required=False)
+
+    # The number of saved pages checked in bulk before their checklists are sent.
+    chunk_size = 50
+
+    def validate(self, data):
+        validated = super().validate(data)
+        num_pages = len(validated.get('pages', [])) + len(validated.get('payloads', []))
+        if not num_pages:
+            raise serializers.ValidationError('At least one page or payload is required')
+
+        max_pages = get_setting('BATCH_MAX_PAGES')
+        if num_pages > max_pages:
+            raise serializers.ValidationError('No more than {} pages can be checked at once'.format(max_pages))
+
+        return validated
+
+    def iter_checklists(self, validated_data):
+        """
+        Yields a dict with a checklist for each page, as soon as it has been checked.
+        """
+        for result in self.iter_saved_page_checklists(validated_data.get('pages', [])):
+            yield result
+
+        for payload in validated_data.get('payloads', []):
+            try:
+                result = ChecklistSerializer().create(payload)
+            except (Page.DoesNotExist, ContentType.DoesNotExist, serializers.ValidationError):
+                yield {'url': payload['url'], 'error': 'Page could not be checked'}
+                continue
+
+            result['url'] = payload['url']
+            yield result
+
+    def iter_saved_page_checklists(self, page_ids):
+        """
+        Yields a checklist of rule results for each saved page.
+        Pages are fetched in bulk: one query for the base pages and parents, and then one query per page class.
+        Wagtail's built-in form validation is not run, since saved pages have already passed it.
+        The pages are checked in bulk, `chunk_size` pages at a time, so declarative rules are checked for many
+        pages at once while the first checklists are still sent without waiting for the whole batch.
+        """
+        pages = {page.pk: page for page in Page.objects.filter(pk__in=page_ids).specific()}
+        parent_pages = get_parent_pages(pages.values())
+        for start in range(0, len(page_ids), self.chunk_size):
+            chunk_ids = page_ids[start:start + self.chunk_size]
+            checked_pages = []
+            checked_parents = []
+            errors = {}
+            for page_id in chunk_ids:
+                page = pages.get(page_id)
+                parent_page = get_parent_page(page, parent_pages) if page else None
+                if not page:
+                    errors[page_id] = 'Page not found'
+                elif not parent_page:
+                    errors[page_id] = 'Page must have a parent'
+                else:
+                    checked_pages.append(page)
+                    checked_parents.append(parent_page)
+
+            checked_results = check_pages_bulk(checked_pages, checked_parents)
+            results = {page.pk: result for page, result in zip(checked_pages, checked_results)}
+            for page_id in chunk_ids:
+                if page_id in errors:
+                    yield {'id': page_id, 'error': errors[page_id]}
+                    continue
+
+                error_results, warning_results = results[page_id]
+                checklist = serialize_checklist([], error_results, warning_results)
+                yield {'id': page_id, 'checklist': checklist}
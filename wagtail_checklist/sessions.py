@@ -0,0 +1,71 @@
+"""
+Checklist sessions hold an editor's page data between messages on a persistent connection,
+so that each message only needs to contain the form fields which have changed.
+"""
+from rest_framework import serializers
+
+from .serializers import ChecklistSerializer
+from .snapshots import apply_page_changes
+
+
+class ChecklistMessageSerializer(serializers.Serializer):
+    """
+    A message from the editor: either the full page data, as sent to the checklist API,
+    or the fields which have `changed` and been `removed` since the last message.
+    """
+    url = serializers.URLField(required=False)
+    action = serializers.CharField(required=False)
+    page = serializers.JSONField(required=False)
+    changed = serializers.DictField(required=False)
+    removed = serializers.ListField(child=serializers.CharField(), required=False)
+
+
+class ChecklistSession:
+    """
+    The state of one editor's checklist connection.
+    """
+    def __init__(self):
+        self.url = None
+        self.action = None
+        self.page_data = None
+        # Sent with every check, so that only the rules which depend on changed fields are re-checked.
+        self.fingerprint = None
+
+    def get_checklist_data(self, message):
+        """
+        Returns the data for a ChecklistSerializer, by applying a message to the session's page data.
+        """
+        message_serializer = ChecklistMessageSerializer(data=message)
+        message_serializer.is_valid(raise_exception=True)
+        message = message_serializer.validated_data
+        if 'page' in message:
+            page_data = message['page']
+        elif self.page_data is None:
+            raise serializers.ValidationError('The full page must be sent before any changes')
+        else:
+            page_data = apply_page_changes(self.page_data, message.get('changed', {}), message.get('removed', []))
+
+        return {
+            'url': message.get('url', self.url),
+            'action': message.get('action', self.action),
+            'page': page_data,
+            'fingerprint': self.fingerprint,
+        }
+
+    def iter_events(self, message):
+        """
+        Applies a message to the session's page data, then checks the page.
+        Yields (event, data) tuples, in the same way as ChecklistSerializer.iter_events.
+        """
+        serializer = ChecklistSerializer(data=self.get_checklist_data(message))
+        serializer.is_valid(raise_exception=True)
+        validated_data = serializer.validated_data
+        page_class, page, parent_page = serializer.get_page(validated_data)
+        self.url = validated_data['url']
+        self.action = validated_data['action']
+        self.page_data = validated_data['page']
+        for event, data in serializer.iter_events(validated_data, page_class, page, parent_page):
+            if 'fingerprint' in data:
+                self.fingerprint = data['fingerprint']
+
+            yield event, data
@@ -0,0 +1,82 @@
+"""
+Short-lived snapshots of checked page data, which allow the checklist API to only re-check
+rules whose fields have changed since the client's previous request.
+
+Each response includes a fingerprint of the checked data. The client sends this fingerprint
+back with its next request, and the matching snapshot is loaded from the Django cache.
+The client can also send only the fields which have changed since that request, and the full
+page data is rebuilt from the snapshot.
+"""
+import hashlib
+import json
+
+from django.core.cache import caches
+
+from .conf import get_setting
+
+CACHE_KEY_PREFIX = 'wagtail_checklist:snapshot:'
+
+
+class Snapshot:
+    """
+    The page data and rule results from a single checklist request.
+    The results are aligned with the rules in the RulePlan, with None for rules which didn't apply to the page.
+    """
+    def __init__(self, url, page_data, plan_version, error_results, warning_results):
+        self.url = url
+        self.page_data = page_data
+        self.plan_version = plan_version
+        self.error_results = error_results
+        self.warning_results = warning_results
+
+    def get_changed_fields(self, page_data):
+        """
+        Returns the set of form field names which differ between this snapshot and `page_data`.
+        """
+        changed_keys = {
+            key for key in set(self.page_data) | set(page_data)
+            if self.page_data.get(key) != page_data.get(key)
+        }
+        return {get_field_name(key) for key in changed_keys}
+
+
+def apply_page_changes(page_data, changed, removed):
+    """
+    Returns a copy of `page_data` with the `changed` keys updated and the `removed` keys deleted.
+    """
+    page_data = dict(page_data)
+    page_data.update(changed)
+    for key in removed:
+        page_data.pop(key, None)
+
+    return page_data
+
+
+def get_field_name(key):
+    """
+    Returns the form field name for a key in the page data.
+    Formsets and StreamFields post many keys for a single field, eg. 'body-0-value' for 'body'.
+    """
+    return key.split('-', 1)[0]
+
+
+def get_fingerprint(url, action, page_data):
+    """
+    Returns a hash of the data sent to the checklist API.
+    """
+    data = json.dumps([url, action, page_data], sort_keys=True)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def load_snapshot(fingerprint):
+    """
+    Returns the Snapshot saved with `fingerprint`, or None if it has expired.
+    """
+    if not fingerprint:
+        return None
+
+    return caches[get_setting('CACHE')].get(CACHE_KEY_PREFIX + fingerprint)
+
+
+def save_snapshot(fingerprint, snapshot):
+    caches[get_setting('CACHE')].set(CACHE_KEY_PREFIX + fingerprint, snapshot, get_setting('SNAPSHOT_TIMEOUT'))
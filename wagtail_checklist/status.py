@@ -0,0 +1,129 @@
+"""
+Keeps the stored checklist status of each page up to date.
+
+When a page revision is saved or a page is published, the page's latest revision is checked
+against the registered rules and the result is saved by the status store, if the STATUS_REFRESH
+setting is set. With 'async', this happens in a background thread once the transaction commits.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.utils.module_loading import import_string
+from wagtail.core.models import Page, PageRevision
+from wagtail.core.signals import page_published
+
+from .conf import get_setting
+from .pages import get_latest_revision_ids
+from .rules import check_rules, get_rule_plan
+
+logger = logging.getLogger(__name__)
+
+STATUS_REFRESH_ASYNC = 'async'
+STATUS_REFRESH_SYNC = 'sync'
+
+# Refreshes are run one at a time, in the background, so they never slow down saving a page.
+status_refresh_pool = ThreadPoolExecutor(max_workers=1)
+
+
+class DatabaseStatusStore:
+    """
+    Saves checklist statuses to the ChecklistStatus model.
+    """
+    def is_current(self, page_id, revision_id, plan_version):
+        """
+        Returns True if the stored status was checked with the same revision and rules.
+        """
+        from .models import ChecklistStatus
+        return ChecklistStatus.objects.filter(
+            page_id=page_id, revision_id=revision_id, plan_version=plan_version
+        ).exists()
+
+    def save_status(self, page, revision_id, plan_version, error_results, warning_results):
+        from .models import ChecklistStatus, FailedChecklistRule
+        with transaction.atomic():
+            status, _ = ChecklistStatus.objects.update_or_create(page_id=page.pk, defaults={
+                'revision_id': revision_id,
+                'plan_version': plan_version,
+                'num_errors': len([r for r in error_results if not r.is_valid]),
+                'num_warnings': len([r for r in warning_results if not r.is_valid]),
+                'num_rule_exceptions': len([r for r in error_results + warning_results if r.has_error]),
+            })
+            status.failed_rules.all().delete()
+            FailedChecklistRule.objects.bulk_create(
+                [
+                    FailedChecklistRule(status=status, type=FailedChecklistRule.ERROR, name=r.name, message=r.message)
+                    for r in error_results if not r.is_valid
+                ] + [
+                    FailedChecklistRule(status=status, type=FailedChecklistRule.WARNING, name=r.name, message=r.message)
+                    for r in warning_results if not r.is_valid
+                ]
+            )
+
+
+def get_status_store():
+    return import_string(get_setting('STATUS_STORE'))()
+
+
+def refresh_checklist_status(page_id):
+    """
+    Check the latest revision of a page and save its checklist status, unless it is already current.
+    """
+    store = get_status_store()
+    page = Page.objects.get(pk=page_id).specific
+    page_class = type(page)
+    revision_id = get_latest_revision_ids([page_id]).get(page_id)
+    plan_version = get_rule_plan(page_class).version
+    if store.is_current(page_id, revision_id, plan_version):
+        return
+
+    # This may run while a revision is being saved, before the page is marked as having
+    # unpublished changes, so always use the latest revision's content.
+    if revision_id:
+        content_json = PageRevision.objects.values_list('content_json', flat=True).get(pk=revision_id)
+        page = page.with_content_json(content_json)
+
+    error_results, warning_results = check_rules(page_class, page, page.get_parent())
+    store.save_status(page, revision_id, plan_version, error_results, warning_results)
+
+
+def refresh_checklist_status_in_background(page_id):
+    try:
+        refresh_checklist_status(page_id)
+    except Exception:
+        logger.exception('Failed to refresh checklist status for page %s', page_id)
+    finally:
+        # This thread's database connection is not managed by a request, so close it here.
+        connection.close()
+
+
+def schedule_status_refresh(page_id):
+    """
+    Refresh the checklist status of a page, as per the STATUS_REFRESH setting.
+    """
+    mode = get_setting('STATUS_REFRESH')
+    if mode == STATUS_REFRESH_SYNC:
+        try:
+            # A savepoint, so that a failed refresh doesn't break the transaction which is saving the page.
+            with transaction.atomic():
+                refresh_checklist_status(page_id)
+        except Exception:
+            # The page must still be saved, so the status is left out of date instead.
+            logger.exception('Failed to refresh checklist status for page %s', page_id)
+    elif mode == STATUS_REFRESH_ASYNC:
+        transaction.on_commit(lambda: status_refresh_pool.submit(refresh_checklist_status_in_background, page_id))
+
+
+def handle_revision_saved(sender, instance, created, **kwargs):
+    if created:
+        schedule_status_refresh(instance.page_id)
+
+
+def handle_page_published(sender, instance, **kwargs):
+    schedule_status_refresh(instance.pk)
+
+
+def connect_signals():
+    post_save.connect(handle_revision_saved, sender=PageRevision, dispatch_uid='wagtail_checklist_revision_saved')
+    page_published.connect(handle_page_published, dispatch_uid='wagtail_checklist_page_published')
@@ -0,0 +1,236 @@
+"""
+Fast matching of long term lists, for banned word and keyword rules.
+
+A TermMatcher compiles its terms once, and then finds all of them in a text in a single pass,
+however many terms there are:
+  - by default terms match whole words, using a trie of each term's words. Terms must be made of words
+    separated by whitespace, so "e-mail" or "C++" are rejected, rather than matching "e mail" or "C"
+  - with whole_words=False terms match anywhere, using an Aho-Corasick automaton
+
+forbid_terms and require_terms build rule functions from a term list, which search the text of a field:
+
+    register_error_rule(Article, 'body', 'Body must not contain banned words', fields=['body'], uses_analysis=True)(
+        forbid_terms('body', BANNED_WORDS)
+    )
+
+The rule functions have a find_terms(page, analysis=None) method, which returns every term found in the field,
+for reporting which terms matched.
+"""
+from collections import deque
+
+from .analysis import WORD_RE, PageAnalysis
+
+# Marks the end of a term in a word trie. Words are never empty, so this can't clash with one.
+TERM_END = ''
+
+
+class TermMatcher:
+    """
+    Finds which of a list of terms appear in a text.
+    Matching ignores case unless `ignore_case` is False. Terms which are the same once case is ignored
+    are reported using their first spelling in `terms`.
+    """
+    def __init__(self, terms, ignore_case=True, whole_words=True):
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        if whole_words:
+            self.trie = build_word_trie(terms, ignore_case)
+        else:
+            self.automaton = Automaton(terms, ignore_case)
+
+    def normalise(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def find(self, text, first_only=False):
+        """
+        Returns a list of the terms which appear in `text`, in the order they first appear.
+        With `first_only`, stops at the first match, for rules which only need to know if there is one.
+        """
+        if self.whole_words:
+            return self.find_words(WORD_RE.findall(self.normalise(text)), first_only)
+
+        return self.automaton.find(self.normalise(text), first_only)
+
+    def find_words(self, words, first_only=False):
+        """
+        Like find, but for a text which has already been split into words, such as the words of a PageAnalysis.
+        When ignoring case, the words must already be lowercase.
+        """
+        if not self.whole_words:
+            raise ValueError('Only whole word matchers can find terms in words')
+
+        matches = {}
+        trie = self.trie
+        for start in range(len(words)):
+            node = trie.get(words[start])
+            index = start
+            while node is not None:
+                term = node.get(TERM_END)
+                if term is not None and term not in matches:
+                    matches[term] = True
+                    if first_only:
+                        return [term]
+
+                index += 1
+                if index == len(words):
+                    break
+
+                node = node.get(words[index])
+
+        return list(matches)
+
+    def contains(self, text):
+        """
+        Returns True if any of the terms appear in `text`.
+        """
+        return bool(self.find(text, first_only=True))
+
+
+def build_word_trie(terms, ignore_case):
+    """
+    Returns a trie of the words in each term, as nested dicts keyed by word.
+    The node for the last word of a term has the term under TERM_END.
+    Raises ValueError for terms which aren't just words separated by whitespace, since they can't match as written.
+    """
+    trie = {}
+    for term in terms:
+        key = term.lower() if ignore_case else term
+        words = WORD_RE.findall(key)
+        if not words or words != key.split():
+            raise ValueError(
+                'The term {!r} can only match whole words made of letters, digits and underscores. '
+                'Use whole_words=False to match it anywhere in the text.'.format(term)
+            )
+
+        node = trie
+        for word in words:
+            node = node.setdefault(word, {})
+
+        node.setdefault(TERM_END, term)
+
+    return trie
+
+
+class Automaton:
+    """
+    An Aho-Corasick automaton, which finds every occurrence of a set of terms in one pass over a text.
+    States are numbered, with a dict of transitions, a failure link and the terms ending at each state.
+    """
+    def __init__(self, terms, ignore_case):
+        self.transitions = [{}]
+        self.failures = [0]
+        self.outputs = [()]
+        seen = set()
+        for term in terms:
+            key = term.lower() if ignore_case else term
+            if key and key not in seen:
+                seen.add(key)
+                self.add_term(key, term)
+
+        self.link_failures()
+
+    def add_term(self, key, term):
+        state = 0
+        for char in key:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.failures.append(0)
+                self.outputs.append(())
+                self.transitions[state][char] = next_state
+
+            state = next_state
+
+        self.outputs[state] += (term,)
+
+    def link_failures(self):
+        """
+        Points each state at the state for its longest proper suffix which is also a prefix of a term,
+        breadth first, so that shorter prefixes are always linked first.
+        """
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+
+                self.failures[next_state] = self.transitions[failure].get(char, 0)
+                self.outputs[next_state] += self.outputs[self.failures[next_state]]
+
+    def find(self, text, first_only=False):
+        transitions = self.transitions
+        failures = self.failures
+        outputs = self.outputs
+        matches = {}
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = failures[state]
+
+            state = transitions[state].get(char, 0)
+            for term in outputs[state]:
+                if term not in matches:
+                    matches[term] = True
+                    if first_only:
+                        return [term]
+
+        return list(matches)
+
+
+def find_field_terms(matcher, page, field_name, analysis, first_only):
+    """
+    Finds the terms in the text of a page field, reusing the field's words from `analysis` where possible.
+    """
+    field = (analysis or PageAnalysis(page)).field(field_name)
+    if matcher.whole_words and matcher.ignore_case:
+        return matcher.find_words(field.words, first_only)
+
+    return matcher.find(field.text, first_only)
+
+
+def make_find_terms(matcher, field_name):
+    """
+    Returns a function which finds all of the matcher's terms in the text of a page field.
+    """
+    def find_terms(page, analysis=None):
+        return find_field_terms(matcher, page, field_name, analysis, first_only=False)
+
+    return find_terms
+
+
+def forbid_terms(field_name, terms, ignore_case=True, whole_words=True):
+    """
+    Returns a rule function which passes if none of `terms` appear in the text of a page field.
+    Register it with uses_analysis=True to share the field's words with other rules.
+    Its find_terms(page, analysis=None) method returns the terms which were found.
+    """
+    matcher = TermMatcher(terms, ignore_case=ignore_case, whole_words=whole_words)
+    find_terms = make_find_terms(matcher, field_name)
+
+    def validate_no_terms(page, parent, analysis=None):
+        return not find_field_terms(matcher, page, field_name, analysis, first_only=True)
+
+    validate_no_terms.matcher = matcher
+    validate_no_terms.find_terms = find_terms
+    return validate_no_terms
+
+
+def require_terms(field_name, terms, ignore_case=True, whole_words=True):
+    """
+    Returns a rule function which passes if at least one of `terms` appears in the text of a page field.
+    Register it with uses_analysis=True to share the field's words with other rules.
+    Its find_terms(page, analysis=None) method returns the terms which were found.
+    """
+    matcher = TermMatcher(terms, ignore_case=ignore_case, whole_words=whole_words)
+    find_terms = make_find_terms(matcher, field_name)
+
+    def validate_has_term(page, parent, analysis=None):
+        return bool(find_field_terms(matcher, page, field_name, analysis, first_only=True))
+
+    validate_has_term.matcher = matcher
+    validate_has_term.find_terms = find_terms
+    return validate_has_term
@@ -0,0 +1,135 @@
+import pickle
+from unittest import mock
+
+from wagtail.core import blocks
+from wagtail.core.models import Page
+from wagtail.core.rich_text import RichText
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.analysis import PageAnalysis
+from wagtail_checklist.rules import check_rules, register_error_rule, register_warning_rule
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def test_field_analysis_html():
+    page = mock.Mock()
+    page.body = '<p>The <b>Quick</b> brown   fox.</p><p>Jumps!</p>'
+    analysis = PageAnalysis(page).field('body')
+
+    assert analysis.html == page.body
+    assert analysis.text == 'The Quick brown fox. Jumps!'
+    assert analysis.lower_text == 'the quick brown fox. jumps!'
+    assert analysis.words == ('the', 'quick', 'brown', 'fox', 'jumps')
+    assert analysis.blocks == {}
+
+
+def test_field_analysis_text_leaves_out_scripts():
+    page = mock.Mock()
+    page.body = '<p>Fish &amp; chips</p><script>var x = "<p>";</script><style>p {}</style><p>Peas</p>'
+    assert PageAnalysis(page).field('body').text == 'Fish & chips Peas'
+
+
+def test_field_analysis_rich_text():
+    page = mock.Mock()
+    page.body = RichText('<p>Some news</p>')
+    assert PageAnalysis(page).field('body').words == ('some', 'news')
+
+
+def test_field_analysis_stream_field():
+    stream_block = blocks.StreamBlock([
+        ('heading', blocks.CharBlock()),
+        ('section', blocks.StructBlock([
+            ('text', blocks.RichTextBlock()),
+            ('items', blocks.ListBlock(blocks.CharBlock())),
+        ])),
+    ])
+    page = mock.Mock()
+    page.body = stream_block.to_python([
+        {'type': 'heading', 'value': 'Fish & chips'},
+        {'type': 'section', 'value': {'text': '<p>Some <i>news</i></p>', 'items': ['one', 'two']}},
+        {'type': 'heading', 'value': 'The end'},
+    ])
+    analysis = PageAnalysis(page).field('body')
+
+    assert analysis.text == 'Fish & chips Some news one two The end'
+    assert analysis.words == ('fish', 'chips', 'some', 'news', 'one', 'two', 'the', 'end')
+    assert analysis.blocks['heading'] == ['Fish & chips', 'The end']
+    assert analysis.blocks['section'][0]['items'] == ['one', 'two']
+
+
+def test_field_analysis_is_computed_once():
+    page = mock.Mock()
+    page.body = '<p>Hello</p>'
+    analysis = PageAnalysis(page)
+    with mock.patch('wagtail_checklist.analysis.BeautifulSoup') as mock_soup:
+        assert analysis.field('body').dom is mock_soup.return_value
+        assert analysis.field('body').dom is mock_soup.return_value
+
+    mock_soup.assert_called_once_with('<p>Hello</p>', 'html.parser')
+    with mock.patch('wagtail_checklist.analysis.TextParser') as mock_parser:
+        mock_parser.return_value.parts = ['Hello']
+        assert analysis.field('body').words == ('hello',)
+        assert analysis.field('body').text == 'Hello'
+
+    assert mock_parser.call_count == 1
+
+
+def test_page_analysis_pickle():
+    page = DummyPage(title='My cool blog')
+    analysis = PageAnalysis(page)
+    assert analysis.field('title').words == ('my', 'cool', 'blog')
+
+    copied_analysis = pickle.loads(pickle.dumps(analysis))
+    assert copied_analysis.page.title == 'My cool blog'
+    assert copied_analysis.field('title').words == ('my', 'cool', 'blog')
+
+
+def test_check_rules_shares_analysis():
+    """
+    Ensure that all rules in a check are given the same analysis, of the page being checked.
+    """
+    analyses = []
+
+    @register_error_rule(Page, 'body', 'Body cannot contain "mongoose"', uses_analysis=True)
+    def validate_body_banned_words(page, parent, analysis):
+        analyses.append(analysis)
+        return 'mongoose' not in analysis.field('body').words
+
+    @register_warning_rule(Page, 'body', 'Body should contain "news"', uses_analysis=True)
+    def validate_body_news(page, parent, analysis):
+        analyses.append(analysis)
+        return 'news' in analysis.field('body').words
+
+    @register_warning_rule(Page, 'body', 'Body should not be empty')
+    def validate_body_not_empty(page, parent):
+        return bool(page.body)
+
+    page = mock.Mock()
+    page.body = '<p>A mongoose in the news</p>'
+    error_results, warning_results = check_rules(Page, page, mock.Mock())
+
+    assert analyses[0] is analyses[1]
+    assert analyses[0].page is page
+    assert not error_results[0].is_valid
+    assert warning_results[0].is_valid
+    assert warning_results[1].is_valid
+
+
+class DummyPage:
+    def __init__(self, title):
+        self.title = title
@@ -0,0 +1,104 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.rules import register_error_rule, register_warning_rule
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+@pytest.fixture
+def pages():
+    root_page = Page(title='Root')
+    Page.add_root(instance=root_page)
+    index_page = Page(title='Blog index')
+    root_page.add_child(instance=index_page)
+    short_page = Page(title='Short')
+    index_page.add_child(instance=short_page)
+    long_page = Page(title='A very long title indeed', live=False)
+    index_page.add_child(instance=long_page)
+    return index_page, short_page, long_page
+
+
+@pytest.fixture
+def rules():
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 20
+
+    @register_warning_rule(Page, 'title', 'Title should not be Short')
+    def validate_title_not_short(page, parent):
+        return page.title != 'Short'
+
+
+def audit(*args):
+    stdout = StringIO()
+    call_command('checklist_audit', *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_audit_jsonl(pages, rules):
+    index_page, short_page, long_page = pages
+    output = audit('--chunk-size', '2', '--root', str(index_page.pk))
+    rows = [json.loads(line) for line in output.splitlines()]
+    assert [row['id'] for row in rows] == [index_page.pk, short_page.pk, long_page.pk]
+    assert [(row['num_errors'], row['num_warnings']) for row in rows] == [(0, 0), (0, 1), (1, 0)]
+    assert rows[2]['failed'] == ['title: Title should be short']
+    assert rows[2]['checklist'] == {
+        'title': [
+            {'isValid': False, 'hasError': False, 'message': 'Title should be short', 'type': 'ERROR'},
+            {'isValid': True, 'hasError': False, 'message': 'Title should not be Short', 'type': 'WARNING'},
+        ],
+    }
+
+
+@pytest.mark.django_db
+def test_audit_csv_filters(pages, rules):
+    index_page, short_page, long_page = pages
+    output = audit('--format', 'csv', '--root', str(index_page.pk), '--status', 'draft')
+    rows = list(csv.DictReader(StringIO(output)))
+    assert len(rows) == 1
+    assert rows[0]['id'] == str(long_page.pk)
+    assert rows[0]['num_errors'] == '1'
+    assert rows[0]['failed'] == 'title: Title should be short'
+
+
+@pytest.mark.django_db
+def test_audit_latest_revision(pages, rules):
+    """
+    Ensure that pages with unpublished changes are checked using their latest revision.
+    """
+    _, short_page, _ = pages
+    short_page.title = 'A much longer draft title'
+    short_page.save_revision()
+    output = audit('--content-type', 'wagtailcore.page', '--status', 'live')
+    rows = {row['id']: row for row in map(json.loads, output.splitlines())}
+    assert rows[short_page.pk]['title'] == 'A much longer draft title'
+    assert rows[short_page.pk]['num_errors'] == 1
+
+
+@pytest.mark.django_db
+def test_audit_unknown_content_type():
+    with pytest.raises(CommandError):
+        audit('--content-type', 'nope')
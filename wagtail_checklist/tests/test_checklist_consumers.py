@@ -0,0 +1,121 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.rules import register_error_rule
+
+pytest.importorskip('channels')
+
+from wagtail_checklist.consumers import ChecklistConsumer  # noqa: E402 isort:skip
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    cache.clear()
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+@pytest.fixture
+def page():
+    parent_page = Page(title='My cool blog index')
+    Page.add_root(instance=parent_page)
+    page = Page(title='My cool blog')
+    parent_page.add_child(instance=page)
+    return page
+
+
+def get_consumer(user):
+    """
+    Returns a consumer for a connection from `user`, without sending anything over a WebSocket.
+    """
+    # Consumers take their scope in __init__ in Channels 2 and in __call__ later on, so skip both.
+    consumer = ChecklistConsumer.__new__(ChecklistConsumer)
+    consumer.scope = {'type': 'websocket', 'user': user}
+    consumer.accept = mock.Mock()
+    consumer.close = mock.Mock()
+    consumer.send_json = mock.Mock()
+    return consumer
+
+
+def get_sent_events(consumer):
+    return [call[0][0] for call in consumer.send_json.call_args_list]
+
+
+@pytest.mark.django_db
+def test_connect():
+    consumer = get_consumer(User.objects.create(username='testy', is_superuser=True))
+    consumer.connect()
+    assert consumer.accept.call_count == 1
+    assert consumer.close.call_count == 0
+
+
+def test_connect_anonymous():
+    consumer = get_consumer(AnonymousUser())
+    consumer.connect()
+    assert consumer.accept.call_count == 0
+    assert consumer.close.call_count == 1
+
+
+@pytest.mark.django_db
+def test_receive_json(page):
+    """
+    Ensure that each rule result is sent as its own event, followed by the full checklist,
+    and that later messages only need to contain the fields which have changed.
+    """
+    @register_error_rule(Page, 'title', 'Title should be short', fields=['title'])
+    def validate_title_length(page, parent):
+        return len(page.title) < 20
+
+    consumer = get_consumer(User.objects.create(username='testy', is_superuser=True))
+    consumer.connect()
+    consumer.receive_json({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': page.title, 'slug': page.slug},
+    })
+    events = get_sent_events(consumer)
+    assert [event['event'] for event in events] == ['result', 'done']
+    assert events[-1]['data']['checklist']['title'][0]['isValid'] is True
+
+    consumer.send_json.reset_mock()
+    consumer.receive_json({'changed': {'title': 'A much, much longer title'}})
+    events = get_sent_events(consumer)
+    assert events[-1]['event'] == 'done'
+    assert events[-1]['data']['checklist']['title'][0]['isValid'] is False
+
+
+@pytest.mark.django_db
+def test_receive_json_invalid_data():
+    consumer = get_consumer(User.objects.create(username='testy', is_superuser=True))
+    consumer.connect()
+    consumer.receive_json({'changed': {'title': 'My cool blog'}})
+    events = get_sent_events(consumer)
+    assert len(events) == 1
+    assert events[0]['event'] == 'error'
+
+
+@pytest.mark.django_db
+def test_receive_json_missing_page():
+    consumer = get_consumer(User.objects.create(username='testy', is_superuser=True))
+    consumer.connect()
+    consumer.receive_json({
+        'url': 'http://example.com/admin/pages/1234/edit/',
+        'action': 'EDIT',
+        'page': {'title': 'My cool blog', 'slug': 'my-cool-blog'},
+    })
+    assert get_sent_events(consumer) == [{'event': 'error', 'data': {'error': 'Page not found'}}]
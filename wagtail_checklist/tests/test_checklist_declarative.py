@@ -0,0 +1,188 @@
+import re
+from unittest import mock
+
+import pytest
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.declarative import FieldRule, LengthRule, RangeRule, RegexRule, RequiredRule
+from wagtail_checklist.rules import (MODE_BLOCKING_ONLY, RuleRegistrationError, check_pages_bulk, check_rules,
+                                     check_rules_bulk, get_rule_plan, register_error_rule, register_warning_rule)
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
+
+
+def test_field_rule_needs_check_value():
+    class EvenRule(FieldRule):
+        def check_value(self, value):
+            return value % 2 == 0
+
+    with pytest.raises(TypeError):
+        FieldRule('depth')
+
+    assert EvenRule('depth').check_values([1, 2]) == [False, True]
+
+
+def test_required_rule():
+    rule = RequiredRule('title')
+    assert rule.check_values(['Hello', '', '   ', None, [], [1], 0]) == [True, False, False, False, False, True, True]
+
+
+def test_length_rule():
+    assert LengthRule('title', max=5).check_values(['', 'Hello', 'Hello!', None]) == [True, True, False, True]
+    assert LengthRule('title', min=1, max=5).check_values(['', 'Hello', None]) == [False, True, False]
+    assert LengthRule('title', min=2).check_value('Hi')
+    with pytest.raises(ValueError):
+        LengthRule('title')
+
+
+def test_regex_rule():
+    rule = RegexRule('slug', r'^[a-z-]+$')
+    assert rule.check_values(['my-blog', 'My blog', None]) == [True, False, False]
+
+    rule = RegexRule('title', r'mongoose', flags=re.IGNORECASE, must_match=False)
+    assert rule.check_values(['A Mongoose', 'A cat', None]) == [False, True, True]
+
+
+def test_range_rule():
+    assert RangeRule('depth', min=2, max=4).check_values([1, 2, 4, 5, None]) == [False, True, True, False, True]
+    assert RangeRule('depth', max=4).check_values([1, 5]) == [True, False]
+    assert RangeRule('depth', min=2).check_values([1, 5]) == [False, True]
+    with pytest.raises(ValueError):
+        RangeRule('depth')
+
+
+def test_register_declarative_rule():
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=20))
+    rule = get_rule_plan(Page).error_rules[0]
+    assert rule.fields == {'title'}
+    assert repr(rule.func) == "LengthRule('title', max=20, min=None)"
+
+    with pytest.raises(RuleRegistrationError):
+        register_error_rule(Page, 'subtitle', 'Subtitle is required')(RequiredRule('subtitle'))
+
+
+def test_declarative_rule_params_change_plan_version():
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=20))
+    version = get_rule_plan(Page).version
+
+    rule_module.error_rules_registry = {}
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=30))
+    assert get_rule_plan(Page).version != version
+
+
+def test_check_rules_reads_each_field_once():
+    """
+    Ensure that declarative rules are checked without copying the page, reading each field once.
+    """
+    register_error_rule(Page, 'title', 'Title is required')(RequiredRule('title'))
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=5))
+    register_warning_rule(Page, 'title', 'Title should not shout')(RegexRule('title', r'!', must_match=False))
+
+    @register_warning_rule(Page, 'slug', 'Slug should be short')
+    def validate_slug_length(page, parent):
+        return len(page.slug) < 10
+
+    page = mock.Mock(slug='a-very-long-slug')
+    title = mock.PropertyMock(return_value='Hello!')
+    type(page).title = title
+    with mock.patch('wagtail_checklist.rules.copy_page', side_effect=lambda page: page) as mock_copy_page:
+        error_results, warning_results = check_rules(Page, page, mock.Mock())
+
+    assert title.call_count == 1
+    # The page and parent are copied once for the function rule.
+    assert mock_copy_page.call_count == 2
+    assert [result.is_valid for result in error_results] == [True, False]
+    assert [result.is_valid for result in warning_results] == [False, False]
+
+
+def test_check_rules_declarative_exception():
+    register_error_rule(Page, 'depth', 'Depth is too large')(RangeRule('depth', max=4))
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=5))
+
+    error_results, _ = check_rules(Page, mock.Mock(depth='deep', title='Hello'), mock.Mock())
+    assert error_results[0].has_error
+    assert error_results[1].is_valid
+
+
+def test_check_rules_blocking_only_checks_declarative_rules_first():
+    checked = []
+
+    @register_error_rule(Page, 'slug', 'Slug should be short')
+    def validate_slug_length(page, parent):
+        checked.append(page)
+        return len(page.slug) < 10
+
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=5))
+
+    error_results, _ = check_rules(Page, mock.Mock(title='Hello!', slug='a-slug'), mock.Mock(), mode=MODE_BLOCKING_ONLY)
+    assert [result.message for result in error_results] == ['Title is too long']
+    assert not checked
+
+
+def test_check_rules_bulk():
+    register_error_rule(Page, 'title', 'Title is required')(RequiredRule('title'))
+    register_error_rule(Page, 'depth', 'Depth is too large')(RangeRule('depth', max=4))
+    register_warning_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=5))
+
+    @register_warning_rule(Page, 'slug', 'Slug should be short')
+    def validate_slug_length(page, parent):
+        return len(page.slug) < 10
+
+    pages = [
+        mock.Mock(title='Hello', depth=2, slug='hello'),
+        mock.Mock(title='', depth=5, slug='a-very-long-slug'),
+        mock.Mock(title='Hello', depth='deep', slug='hello'),
+    ]
+    parents = [mock.Mock() for _ in pages]
+
+    results = check_rules_bulk(Page, pages, parents)
+    assert results == [check_rules(Page, page, parent) for page, parent in zip(pages, parents)]
+    assert [result.is_valid for result in results[1][0] + results[1][1]] == [False, False, True, False]
+    assert results[2][0][1].has_error
+
+
+@pytest.mark.django_db
+def test_check_pages_bulk():
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=5))
+
+    # Pages are checked against the rules for their own class, which for a Mock is none at all.
+    pages = [Page(title='Hello!'), mock.Mock(title='Hello!'), Page(title='Hello')]
+    results = check_pages_bulk(pages, [None, None, None])
+    assert [[result.is_valid for result in error_results] for error_results, _ in results] == [[False], [], [True]]
+
+
+@mock.patch('wagtail_checklist.rules.logger')
+def test_check_rules_bulk_field_exception(mock_logger):
+    """
+    Ensure that a field which can't be read for one page only flags that page's declarative rules.
+    """
+    register_error_rule(Page, 'title', 'Title is too long')(LengthRule('title', max=5))
+
+    class BrokenPage:
+        @property
+        def title(self):
+            raise ValueError('No title')
+
+    pages = [mock.Mock(title='Hello!'), BrokenPage(), mock.Mock(title='Hello')]
+    results = check_rules_bulk(Page, pages, [mock.Mock() for _ in pages])
+    assert [(result.is_valid, result.has_error) for error_results, _ in results for result in error_results] == [
+        (False, False), (True, True), (True, False),
+    ]
+    assert mock_logger.exception.call_count == 1
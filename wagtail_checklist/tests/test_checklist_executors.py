@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from wagtail.core.models import Page
+
+from wagtail_checklist import executors as executor_module
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.executors import get_pool, iter_rule_results, run_coroutine
+from wagtail_checklist.rules import (PageCopies, Rule, RuleResult, check_rules, check_rules_async, register_error_rule,
+                                     register_warning_rule)
+
+# Set to let rules which wait for it finish, so they don't keep a shared pool's worker busy after their test.
+release_rules = threading.Event()
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    release_rules.clear()
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    release_rules.set()
+
+
+def test_get_pool_is_shared():
+    """Ensure that a pool is only started once per executor type and worker count"""
+    pool = get_pool('thread', 2)
+    assert get_pool('thread', 2) is pool
+    assert get_pool('thread', 3) is not pool
+
+
+def test_get_pool_unknown_executor():
+    with pytest.raises(ValueError):
+        get_pool('carrier pigeon', 2)
+
+
+@pytest.mark.parametrize('executor', ['serial', 'thread', 'process'])
+def test_check_rules_executors(executor):
+    """
+    Ensure that each executor returns results in registration order.
+    """
+    register_error_rule(Page, 'foo', 'Foo should be positive')(validate_foo_positive)
+    register_error_rule(Page, 'foo', 'Foo should be slowly positive')(validate_foo_slowly_positive)
+    register_warning_rule(Page, 'foo', 'Foo should be large')(validate_foo_large)
+
+    with override_settings(WAGTAIL_CHECKLIST_EXECUTOR=executor, WAGTAIL_CHECKLIST_MAX_WORKERS=2):
+        error_results, warning_results = check_rules(Page, DummyPage(foo=1), DummyPage(foo=0))
+
+    assert error_results == [
+        RuleResult('foo', 'Foo should be positive', True, False),
+        RuleResult('foo', 'Foo should be slowly positive', True, False),
+    ]
+    assert warning_results == [
+        RuleResult('foo', 'Foo should be large', False, False),
+    ]
+
+
+@mock.patch('wagtail_checklist.executors.logger')
+def test_check_rules_timeout(mock_logger):
+    """
+    Ensure that a rule which takes too long is reported as an error, without waiting for it.
+    """
+    register_error_rule(Page, 'foo', 'Foo should be positive')(validate_foo_positive)
+    register_error_rule(Page, 'foo', 'Foo should be released and positive')(validate_foo_released_positive)
+
+    settings = {
+        'WAGTAIL_CHECKLIST_EXECUTOR': 'thread',
+        'WAGTAIL_CHECKLIST_RULE_TIMEOUT': 0.1,
+    }
+    with override_settings(**settings):
+        start = time.monotonic()
+        error_results, _ = check_rules(Page, DummyPage(foo=1), DummyPage(foo=0))
+        assert time.monotonic() - start < 1
+
+    assert error_results == [
+        RuleResult('foo', 'Foo should be positive', True, False),
+        RuleResult('foo', 'Foo should be released and positive', True, True),
+    ]
+    assert mock_logger.warning.call_count == 1
+
+
+@pytest.mark.parametrize('check', ['sync', 'async'])
+def test_check_rules_timeout_starts_with_rule(check):
+    """
+    Ensure that rules waiting for a free worker are not timed out, only rules which run for too long.
+    """
+    for i in range(6):
+        register_error_rule(Page, 'foo', 'Foo should be slowly positive {}'.format(i))(validate_foo_slowly_positive)
+
+    settings = {
+        'WAGTAIL_CHECKLIST_EXECUTOR': 'thread',
+        'WAGTAIL_CHECKLIST_MAX_WORKERS': 2,
+        'WAGTAIL_CHECKLIST_RULE_TIMEOUT': 0.1,
+    }
+    with override_settings(**settings):
+        # Three rounds of two rules take 0.15 seconds, longer than any one rule's timeout.
+        if check == 'sync':
+            error_results, _ = check_rules(Page, DummyPage(foo=1), DummyPage(foo=0))
+        else:
+            error_results, _ = run_coroutine(check_rules_async(Page, DummyPage(foo=1), DummyPage(foo=0)))
+
+    assert [result.has_error for result in error_results] == [False] * 6
+
+
+@mock.patch('wagtail_checklist.executors.logger')
+def test_iter_rule_results_zero_timeout(mock_logger):
+    """
+    Ensure that an explicit timeout of 0 isn't replaced by the RULE_TIMEOUT setting, which waits forever.
+    """
+    rule = Rule(validate_foo_released_positive, 'foo', 'Foo should be released and positive')
+    page_copies = PageCopies(DummyPage(foo=1), DummyPage(foo=0), 'request')
+    results = list(iter_rule_results([rule], page_copies, 'thread', timeout=0))
+    assert results == [(0, RuleResult('foo', 'Foo should be released and positive', True, True))]
+
+
+@mock.patch('wagtail_checklist.executors.logger')
+def test_iter_rule_results_budget(mock_logger):
+    """
+    Ensure that rules which are still running at the end of the budget are not waited for.
+    """
+    rules = [
+        Rule(validate_foo_positive, 'foo', 'Foo should be positive'),
+        Rule(validate_foo_released_positive, 'foo', 'Foo should be released and positive'),
+    ]
+    page_copies = PageCopies(DummyPage(foo=1), DummyPage(foo=0), 'request')
+    start = time.monotonic()
+    results = dict(iter_rule_results(rules, page_copies, 'thread', budget=0.05))
+    assert time.monotonic() - start < 1
+    assert results == {
+        0: RuleResult('foo', 'Foo should be positive', True, False),
+        1: RuleResult('foo', 'Foo should be released and positive', True, True),
+    }
+
+
+@mock.patch('wagtail_checklist.executors.logger')
+def test_check_rules_process_unpicklable_rule(mock_logger):
+    """
+    Ensure that a rule which cannot be sent to a process pool is reported as an error.
+    """
+    @register_error_rule(Page, 'foo', 'Foo should be positive')
+    def validate_local_foo_positive(page, parent):
+        return page.foo > 0
+
+    with override_settings(WAGTAIL_CHECKLIST_EXECUTOR='process'):
+        error_results, _ = check_rules(Page, DummyPage(foo=1), DummyPage(foo=0))
+
+    assert error_results == [RuleResult('foo', 'Foo should be positive', True, True)]
+    assert mock_logger.exception.call_count == 1
+
+
+@mock.patch('wagtail_checklist.rules.logger')
+def test_check_rules_async(mock_logger):
+    """
+    Ensure that async rules are awaited concurrently, alongside sync rules, in registration order.
+    """
+    register_error_rule(Page, 'foo', 'Foo should be positive')(validate_foo_positive)
+    register_error_rule(Page, 'foo', 'Foo should be asynchronously positive')(validate_foo_async_positive)
+    register_warning_rule(Page, 'foo', 'Foo should be asynchronously large')(validate_foo_async_large)
+    register_warning_rule(Page, 'foo', 'Foo should be asynchronously valid')(validate_foo_async_error)
+
+    start = time.monotonic()
+    error_results, warning_results = check_rules(Page, DummyPage(foo=1), DummyPage(foo=0))
+    # Both async rules sleep for 0.2 seconds, so this would take 0.4 seconds if they ran one at a time.
+    assert time.monotonic() - start < 0.35
+
+    assert error_results == [
+        RuleResult('foo', 'Foo should be positive', True, False),
+        RuleResult('foo', 'Foo should be asynchronously positive', True, False),
+    ]
+    assert warning_results == [
+        RuleResult('foo', 'Foo should be asynchronously large', False, False),
+        RuleResult('foo', 'Foo should be asynchronously valid', True, True),
+    ]
+    assert mock_logger.exception.call_count == 1
+
+
+@mock.patch('wagtail_checklist.executors.logger')
+def test_check_rules_async_timeout(mock_logger):
+    register_error_rule(Page, 'foo', 'Foo should be asynchronously positive')(validate_foo_async_positive)
+
+    with override_settings(WAGTAIL_CHECKLIST_RULE_TIMEOUT=0.05):
+        error_results, _ = check_rules(Page, DummyPage(foo=1), DummyPage(foo=0))
+
+    assert error_results == [RuleResult('foo', 'Foo should be asynchronously positive', True, True)]
+    assert mock_logger.warning.call_count == 1
+
+
+def test_check_rules_async_in_event_loop():
+    """
+    Ensure that rules can be checked from code which is already running in an event loop.
+    """
+    register_error_rule(Page, 'foo', 'Foo should be positive')(validate_foo_positive)
+    register_warning_rule(Page, 'foo', 'Foo should be asynchronously large')(validate_foo_async_large)
+
+    error_results, warning_results = run_coroutine(check_rules_async(Page, DummyPage(foo=3), DummyPage(foo=0)))
+    assert error_results == [RuleResult('foo', 'Foo should be positive', True, False)]
+    assert warning_results == [RuleResult('foo', 'Foo should be asynchronously large', True, False)]
+
+
+def test_rule_check_async_in_event_loop():
+    """
+    Ensure that an async rule can be checked from sync code which is called from a running event loop.
+    """
+    rule = Rule(validate_foo_async_large, 'foo', 'Foo should be asynchronously large')
+
+    async def check_in_loop():
+        return rule.check(DummyPage(foo=3), DummyPage(foo=0))
+
+    assert run_coroutine(check_in_loop()) == RuleResult('foo', 'Foo should be asynchronously large', True, False)
+
+
+def test_iter_async_rule_results_pool_error():
+    """
+    Ensure that an error starting the rules is raised as it is, rather than hidden by the cleanup.
+    """
+    rules = [Rule(validate_foo_async_large, 'foo', 'Foo should be asynchronously large')]
+    page_copies = PageCopies(DummyPage(foo=3), DummyPage(foo=0), 'request')
+    with mock.patch('wagtail_checklist.executors.get_pool', side_effect=ValueError('Unknown checklist executor')):
+        with pytest.raises(ValueError):
+            list(iter_rule_results(rules, page_copies, 'thread'))
+
+
+def teardown_module(module):
+    for pool in executor_module.executor_pools.values():
+        pool.shutdown(wait=False)
+
+    executor_module.executor_pools = {}
+
+
+class DummyPage:
+    """A picklable stand-in for a Page"""
+    def __init__(self, foo):
+        self.foo = foo
+
+
+def validate_foo_positive(page, parent):
+    return page.foo > 0
+
+
+def validate_foo_slowly_positive(page, parent):
+    time.sleep(0.05)
+    return page.foo > 0
+
+
+def validate_foo_released_positive(page, parent):
+    release_rules.wait(2)
+    return page.foo > 0
+
+
+def validate_foo_large(page, parent):
+    return page.foo > 2
+
+
+async def validate_foo_async_positive(page, parent):
+    await asyncio.sleep(0.2)
+    return page.foo > 0
+
+
+async def validate_foo_async_large(page, parent):
+    await asyncio.sleep(0.2)
+    return page.foo > 2
+
+
+async def validate_foo_async_error(page, parent):
+    raise ValueError('Uh oh')
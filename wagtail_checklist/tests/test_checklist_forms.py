@@ -0,0 +1,32 @@
+from unittest import mock
+
+from django.test import override_settings
+from wagtail.core.models import Page
+
+from wagtail_checklist import forms as form_module
+from wagtail_checklist.forms import clear_form_class_cache, get_form_class
+
+
+def setup_function(function):
+    clear_form_class_cache()
+
+
+def teardown_function(function):
+    clear_form_class_cache()
+
+
+def test_get_form_class_is_cached():
+    """Ensure that the form class is only built once per page class"""
+    edit_handler, form_class = get_form_class(Page)
+    assert form_class._meta.model is Page
+    with mock.patch.object(Page, 'get_edit_handler') as mock_get_edit_handler:
+        assert get_form_class(Page) == (edit_handler, form_class)
+        assert mock_get_edit_handler.call_count == 0
+
+
+def test_get_form_class_cleared_on_setting_changed():
+    """Ensure that changing settings throws away the cached form classes"""
+    get_form_class(Page)
+    assert Page in form_module.form_class_cache
+    with override_settings(WAGTAIL_CHECKLIST_ISOLATION='rule'):
+        assert Page not in form_module.form_class_cache
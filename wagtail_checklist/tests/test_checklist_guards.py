@@ -0,0 +1,224 @@
+from unittest import mock
+
+import pytest
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.declarative import LengthRule
+from wagtail_checklist.executors import run_coroutine
+from wagtail_checklist.guards import FieldGuard, PredicateGuard, get_guard
+from wagtail_checklist.rules import (RuleRegistrationError, RuleResult, check_blocking_rules, check_rules,
+                                     check_rules_async, check_rules_bulk, get_rule_plan, iter_check_rules,
+                                     register_error_rule, register_warning_rule)
+from wagtail_checklist.serializers import serialize_checklist
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
+
+
+def is_news(page, parent):
+    return parent.slug == 'news'
+
+
+def validate_slug_length(page, parent):
+    return len(page.slug) < 10
+
+
+def test_field_guard():
+    guard = FieldGuard({'show_in_menus': True, 'slug': 'home'})
+    assert guard.fields == {'show_in_menus', 'slug'}
+    assert guard.check(mock.Mock(show_in_menus=True, slug='home'), None)
+    assert not guard.check(mock.Mock(show_in_menus=False, slug='home'), None)
+    assert guard.get_key() == FieldGuard({'slug': 'home', 'show_in_menus': True}).get_key()
+    with pytest.raises(ValueError):
+        FieldGuard({})
+
+
+def test_predicate_guard():
+    guard = PredicateGuard(is_news, fields=['slug'])
+    assert guard.fields == {'slug'}
+    assert guard.check(None, mock.Mock(slug='news'))
+    assert not guard.check(None, mock.Mock(slug='blog'))
+    assert PredicateGuard(is_news).fields is None
+    with pytest.raises(ValueError):
+        PredicateGuard('news')
+
+
+def test_get_guard():
+    assert get_guard(None) is None
+    assert isinstance(get_guard({'slug': 'home'}), FieldGuard)
+    assert isinstance(get_guard(is_news), PredicateGuard)
+    guard = FieldGuard({'slug': 'home'})
+    assert get_guard(guard) is guard
+
+
+def test_register_guarded_rule():
+    register_error_rule(Page, 'slug', 'Slug is too long', fields=['slug'], when={'show_in_menus': True})(
+        validate_slug_length
+    )
+    register_error_rule(Page, 'slug', 'Slug is too long', fields=['slug'], when=is_news)(validate_slug_length)
+
+    menu_rule, news_rule = get_rule_plan(Page).error_rules
+    # The rule depends on the fields its guard reads as well as its own.
+    assert menu_rule.fields == {'slug', 'show_in_menus'}
+    assert news_rule.fields is None
+
+    with pytest.raises(RuleRegistrationError):
+        register_error_rule(Page, 'slug', 'Slug is too long', when={'subtitle': ''})
+
+    with pytest.raises(RuleRegistrationError):
+        register_error_rule(Page, 'slug', 'Slug is too long', when='news')
+
+
+def test_guard_changes_plan_version():
+    register_error_rule(Page, 'slug', 'Slug is too long')(validate_slug_length)
+    version = get_rule_plan(Page).version
+
+    rule_module.error_rules_registry = {}
+    register_error_rule(Page, 'slug', 'Slug is too long', when={'show_in_menus': True})(validate_slug_length)
+    assert get_rule_plan(Page).version != version
+
+
+def test_check_rules_skips_rules_which_dont_apply():
+    register_error_rule(Page, 'slug', 'Slug is too long', when={'show_in_menus': True})(validate_slug_length)
+    register_error_rule(Page, 'title', 'Title is too long', when={'show_in_menus': True})(LengthRule('title', max=5))
+    register_warning_rule(Page, 'title', 'Title should be short')(LengthRule('title', max=5))
+
+    page = mock.Mock(show_in_menus=False, slug='a-very-long-slug', title='Hello!')
+    error_results, warning_results = check_rules(Page, page, mock.Mock())
+    assert error_results == []
+    assert warning_results == [RuleResult('title', 'Title should be short', False, False)]
+
+    page.show_in_menus = True
+    error_results, _ = check_rules(Page, page, mock.Mock())
+    assert [result.is_valid for result in error_results] == [False, False]
+
+
+def test_shared_guard_checked_once():
+    guard = mock.Mock(side_effect=is_news)
+    for message in ['Slug is too long', 'Slug is much too long']:
+        register_error_rule(Page, 'slug', message, when=guard)(validate_slug_length)
+
+    register_warning_rule(Page, 'slug', 'Slug should be short', when={'show_in_menus': True})(validate_slug_length)
+    register_warning_rule(Page, 'slug', 'Slug should be very short', when={'show_in_menus': True})(
+        validate_slug_length
+    )
+
+    assert len(get_rule_plan(Page).guard_groups) == 2
+    error_results, warning_results = check_rules(Page, mock.Mock(slug='hello', show_in_menus=False), mock.Mock())
+    assert guard.call_count == 1
+    assert len(error_results) == 0
+    assert len(warning_results) == 0
+
+
+@mock.patch('wagtail_checklist.rules.logger')
+def test_guard_exception(mock_logger):
+    def broken_guard(page, parent):
+        raise Exception('Oh no')
+
+    register_error_rule(Page, 'slug', 'Slug is too long', when=broken_guard)(validate_slug_length)
+
+    error_results, _ = check_rules(Page, mock.Mock(slug='hello'), mock.Mock())
+    assert error_results == [RuleResult('slug', 'Slug is too long', True, False)]
+    assert mock_logger.exception.call_count == 1
+
+
+def test_iter_check_rules_rechecks_guard_fields():
+    checked_rules = []
+
+    @register_error_rule(Page, 'slug', 'Slug is too long', fields=['slug'], when={'show_in_menus': True})
+    def validate_menu_slug_length(page, parent):
+        checked_rules.append('slug')
+        return len(page.slug) < 10
+
+    @register_warning_rule(Page, 'title', 'Title should be short', fields=['title'])
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 10
+
+    def get_aligned_results(**kwargs):
+        results = [None, None]
+        for _, index, result in iter_check_rules(Page, page, mock.Mock(), **kwargs):
+            results[index] = result
+
+        return results[:1], results[1:]
+
+    page = mock.Mock(show_in_menus=False, slug='a-very-long-slug', title='Hello')
+    previous_results = get_aligned_results()
+    assert previous_results == ([None], [RuleResult('title', 'Title should be short', True, False)])
+    assert checked_rules == ['title']
+
+    # A rule which didn't apply still doesn't, and has no result to re-use.
+    checked_rules.clear()
+    page.title = 'Hello there, world'
+    results = get_aligned_results(changed_fields={'title'}, previous_results=previous_results)
+    assert results == ([None], [RuleResult('title', 'Title should be short', False, False)])
+    assert checked_rules == ['title']
+
+    # A change to the guard's field checks the rule again.
+    checked_rules.clear()
+    page.show_in_menus = True
+    results = get_aligned_results(changed_fields={'show_in_menus'}, previous_results=results)
+    assert results[0] == [RuleResult('slug', 'Slug is too long', False, False)]
+    assert checked_rules == ['slug']
+
+
+def test_check_blocking_rules_skips_rules_which_dont_apply():
+    register_error_rule(Page, 'slug', 'Slug is too long', when={'show_in_menus': True})(validate_slug_length)
+    register_error_rule(Page, 'title', 'Title is too long', when={'show_in_menus': True})(LengthRule('title', max=5))
+
+    page = mock.Mock(show_in_menus=False, slug='a-very-long-slug', title='Hello!')
+    assert check_blocking_rules(Page, page, mock.Mock()) is None
+
+    page.show_in_menus = True
+    assert check_blocking_rules(Page, page, mock.Mock()).message == 'Title is too long'
+
+
+def test_check_rules_bulk_skips_rules_which_dont_apply():
+    register_error_rule(Page, 'title', 'Title is too long', when={'show_in_menus': True})(LengthRule('title', max=5))
+    register_warning_rule(Page, 'slug', 'Slug should be short', when=is_news)(validate_slug_length)
+
+    pages = [
+        mock.Mock(show_in_menus=True, title='Hello!', slug='a-very-long-slug'),
+        mock.Mock(show_in_menus=False, title='Hello!', slug='a-very-long-slug'),
+    ]
+    parents = [mock.Mock(slug='blog'), mock.Mock(slug='news')]
+
+    results = check_rules_bulk(Page, pages, parents)
+    assert results == [check_rules(Page, page, parent) for page, parent in zip(pages, parents)]
+    assert results == [
+        ([RuleResult('title', 'Title is too long', False, False)], []),
+        ([], [RuleResult('slug', 'Slug should be short', False, False)]),
+    ]
+
+
+def test_check_rules_async_skips_rules_which_dont_apply():
+    register_error_rule(Page, 'slug', 'Slug is too long', when=is_news)(validate_slug_length)
+    register_warning_rule(Page, 'slug', 'Slug should be short')(validate_slug_length)
+
+    page = mock.Mock(slug='hello')
+    error_results, warning_results = run_coroutine(check_rules_async(Page, page, mock.Mock(slug='blog')))
+    assert error_results == []
+    assert warning_results == [RuleResult('slug', 'Slug should be short', True, False)]
+
+
+def test_serialize_checklist_leaves_out_rules_which_dont_apply():
+    checklist = serialize_checklist([], [None, RuleResult('slug', 'Slug is too long', False, False)], [None])
+    assert checklist == {
+        'slug': [{'isValid': False, 'hasError': False, 'type': 'ERROR', 'message': 'Slug is too long'}],
+    }
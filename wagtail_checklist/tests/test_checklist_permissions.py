@@ -0,0 +1,114 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group, Permission, User
+from django.core.cache import cache
+from django.test import override_settings
+
+from wagtail_checklist.permissions import can_access_admin
+
+
+def setup_function(function):
+    cache.clear()
+
+
+def teardown_function(function):
+    cache.clear()
+
+
+@pytest.fixture
+def editors():
+    group = Group.objects.create(name='Checklist editors')
+    group.permissions.add(Permission.objects.get(content_type__app_label='wagtailadmin', codename='access_admin'))
+    return group
+
+
+@pytest.fixture
+def editor(editors):
+    user = User.objects.create(username='editor')
+    user.groups.add(editors)
+    return User.objects.get(pk=user.pk)
+
+
+def test_can_access_admin_anonymous():
+    assert not can_access_admin(None)
+    assert not can_access_admin(AnonymousUser())
+
+
+@pytest.mark.django_db
+def test_can_access_admin_superuser(django_assert_num_queries):
+    user = User.objects.create(username='admin', is_superuser=True)
+    with django_assert_num_queries(0):
+        assert can_access_admin(user)
+
+
+@pytest.mark.django_db
+def test_can_access_admin_inactive(editor):
+    editor.is_active = False
+    assert not can_access_admin(editor)
+
+
+@pytest.mark.django_db
+def test_can_access_admin_through_group(editor):
+    assert can_access_admin(editor)
+    assert not can_access_admin(User.objects.create(username='reader'))
+
+
+@pytest.mark.django_db
+def test_can_access_admin_is_cached(editor, django_assert_num_queries):
+    assert can_access_admin(editor)
+
+    # A new request has a new user instance, without Django's own permission cache.
+    editor = User.objects.get(pk=editor.pk)
+    with django_assert_num_queries(0):
+        assert can_access_admin(editor)
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_PERMISSION_CACHE_TIMEOUT=0)
+def test_can_access_admin_without_cache(editor, django_assert_num_queries):
+    assert can_access_admin(editor)
+
+    editor = User.objects.get(pk=editor.pk)
+    with django_assert_num_queries(2):
+        assert can_access_admin(editor)
+
+
+@pytest.mark.django_db
+def test_can_access_admin_group_removed(editor, editors):
+    assert can_access_admin(editor)
+
+    editor.groups.remove(editors)
+    assert not can_access_admin(User.objects.get(pk=editor.pk))
+
+
+@pytest.mark.django_db
+def test_can_access_admin_group_permission_removed(editor, editors):
+    assert can_access_admin(editor)
+
+    editors.permissions.clear()
+    assert not can_access_admin(User.objects.get(pk=editor.pk))
+
+
+@pytest.mark.django_db
+def test_can_access_admin_group_deleted(editor, editors):
+    assert can_access_admin(editor)
+
+    editors.delete()
+    assert not can_access_admin(User.objects.get(pk=editor.pk))
+
+
+@pytest.mark.django_db
+def test_can_access_admin_group_added(editors):
+    user = User.objects.create(username='reader')
+    assert not can_access_admin(user)
+
+    user.groups.add(editors)
+    assert can_access_admin(User.objects.get(pk=user.pk))
+
+
+@pytest.mark.django_db
+def test_can_access_admin_version_evicted(editor, editors):
+    assert can_access_admin(editor)
+
+    cache.delete('wagtail_checklist:admin_access:version')
+    editors.permissions.clear()
+    assert not can_access_admin(User.objects.get(pk=editor.pk))
@@ -0,0 +1,148 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.publishing import enforce_checklist, get_page_data, should_enforce_checklist
+from wagtail_checklist.result_cache import cache_checklist
+from wagtail_checklist.rules import get_rule_plan, register_error_rule, register_warning_rule
+from wagtail_checklist.snapshots import get_fingerprint
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    cache.clear()
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+@pytest.fixture
+def page():
+    parent_page = Page(title='My cool blog index')
+    Page.add_root(instance=parent_page)
+    page = Page(title='My cool blog')
+    parent_page.add_child(instance=page)
+    return page
+
+
+def get_publish_request(page, title):
+    url = '/admin/pages/{}/edit/'.format(page.pk)
+    request = RequestFactory().post(url, {'title': title, 'slug': page.slug, 'action-publish': 'action-publish'})
+    request.user = AnonymousUser()
+    return request
+
+
+@override_settings(WAGTAIL_CHECKLIST_PUBLISH_ENFORCEMENT=True)
+def test_should_enforce_checklist():
+    factory = RequestFactory()
+    assert should_enforce_checklist(factory.post('/', {'action-publish': 'action-publish'}))
+    assert not should_enforce_checklist(factory.post('/', {'title': 'Saved, not published'}))
+    assert not should_enforce_checklist(factory.get('/', {'action-publish': 'action-publish'}))
+    with override_settings(WAGTAIL_CHECKLIST_PUBLISH_ENFORCEMENT=False):
+        assert not should_enforce_checklist(factory.post('/', {'action-publish': 'action-publish'}))
+
+
+def test_get_page_data():
+    request = RequestFactory().post('/', {'title': ['First', 'Last'], 'action-publish': 'action-publish'})
+    assert get_page_data(request.POST) == {'title': 'Last'}
+
+
+@pytest.mark.django_db
+@mock.patch('wagtail_checklist.publishing.messages')
+def test_enforce_checklist_failed(mock_messages, page):
+    """
+    Ensure that a page which fails an error rule is saved as a draft instead of being published.
+    """
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 20
+
+    @register_warning_rule(Page, 'slug', 'Warning rules should not be checked')
+    def validate_slug(page, parent):
+        raise AssertionError()
+
+    request = get_publish_request(page, 'A much, much longer title')
+    enforce_checklist(request, Page, page, page.get_parent(), 'EDIT')
+    assert 'action-publish' not in request.POST
+    assert request.POST['title'] == 'A much, much longer title'
+    mock_messages.error.assert_called_once()
+    # The page itself is left for the Wagtail view to update
+    assert page.title == 'My cool blog'
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_PUBLISH_TIME_BUDGET=0.1)
+@mock.patch('wagtail_checklist.publishing.messages')
+def test_enforce_checklist_slow_rule(mock_messages, page):
+    """
+    Ensure that a rule which is still running when the time budget runs out stops the page from being published.
+    """
+    release_rule = threading.Event()
+
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        release_rule.wait(2)
+        return len(page.title) < 20
+
+    request = get_publish_request(page, 'A much, much longer title')
+    try:
+        enforce_checklist(request, Page, page, page.get_parent(), 'EDIT')
+    finally:
+        release_rule.set()
+
+    assert 'action-publish' not in request.POST
+    mock_messages.error.assert_called_once_with(
+        request, 'The page was not published, because the checklist could not be checked in time: Title should be short'
+    )
+
+
+@pytest.mark.django_db
+@mock.patch('wagtail_checklist.publishing.messages')
+def test_enforce_checklist_passed(mock_messages, page):
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 20
+
+    request = get_publish_request(page, 'Short title')
+    enforce_checklist(request, Page, page, page.get_parent(), 'EDIT')
+    assert 'action-publish' in request.POST
+    mock_messages.error.assert_not_called()
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=60)
+@mock.patch('wagtail_checklist.publishing.messages')
+def test_enforce_checklist_uses_cached_checklist(mock_messages, page):
+    """
+    Ensure that the editor's last checklist is used if it checked the same page data.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 20
+
+    request = get_publish_request(page, 'Short title')
+    fingerprint = get_fingerprint(request.build_absolute_uri(), 'EDIT', get_page_data(request.POST))
+    checklist = {'title': [{'isValid': False, 'hasError': False, 'message': 'Title should be short', 'type': 'ERROR'}]}
+    cache_checklist(Page, get_rule_plan(Page).version, fingerprint, checklist)
+
+    enforce_checklist(request, Page, page, page.get_parent(), 'EDIT')
+    assert checked_rules == []
+    assert 'action-publish' not in request.POST
@@ -1,11 +1,17 @@
+import time
+from copy import deepcopy
 from unittest import mock
 
 import pytest
+from django.test import override_settings
+from wagtail.core import blocks
 from wagtail.core.models import Page
 
+from testapp.models import ArticlePage
 from wagtail_checklist import rules as rule_module
-from wagtail_checklist.rules import (Rule, RuleRegistrationError, check_form_rules, check_rules, dont_check_rule,
-                                     get_ignored_rules, get_rules, register_error_rule, register_rule,
+from wagtail_checklist.rules import (MODE_BLOCKING_ONLY, Rule, RuleRegistrationError, RuleResult, add_block_definitions,
+                                     check_blocking_rules, check_form_rules, check_rules, dont_check_rule,
+                                     get_ignored_rules, get_rule_plan, get_rules, register_error_rule, register_rule,
                                      register_warning_rule)
 
 
@@ -14,6 +20,8 @@ def setup_function(function):
     rule_module.error_rules_registry = {}
     rule_module.warning_rules_registry = {}
     rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
 
 
 def teardown_function(function):
@@ -21,6 +29,8 @@ def teardown_function(function):
     rule_module.error_rules_registry = {}
     rule_module.warning_rules_registry = {}
     rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
 
 
 def test_registry_validation():
@@ -45,6 +55,10 @@ def test_registry_validation():
     # This should work
     register_rule(registry, Page, 'work', 'This should work')(dummy_func)
 
+    # Any callable should work, including coroutine functions
+    register_rule(registry, Page, 'work', 'This should work')(DummyRule())
+    register_rule(registry, Page, 'work', 'This should work')(async_dummy_func)
+
 
 def test_ignore_rule_validation():
     """Ensure the ignore rule functions validates input arguments"""
@@ -121,6 +135,8 @@ def test_get_ignored_rules_checks_super_class():
         pass
 
     rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
     rule_module.ignored_rules_registry[Mammal] = set(['blood'])
     rule_module.ignored_rules_registry[Dog] = set(['snout', 'tail'])
     rule_module.ignored_rules_registry[Cat] = set(['hair', 'claws'])
@@ -178,6 +194,50 @@ def test_get_rules_checks_super_class():
     assert cat_rule not in dog_rules
 
 
+def test_get_rule_plan():
+    """
+    Ensure that the rule plan contains the rules for a page class, minus ignored rules.
+    """
+    dont_check_rule(Page, 'play')
+    register_error_rule(Page, 'work', 'This should work')(dummy_func)
+    register_error_rule(Page, 'play', 'This should be ignored')(dummy_func)
+    register_warning_rule(Page, 'work', 'This should warn')(other_dummy_func)
+
+    plan = get_rule_plan(Page)
+    assert len(plan.error_rules) == 1
+    assert_rule_equal(plan.error_rules[0], Rule(dummy_func, 'work', 'This should work'))
+    assert len(plan.warning_rules) == 1
+    assert_rule_equal(plan.warning_rules[0], Rule(other_dummy_func, 'work', 'This should warn'))
+    assert plan.ignored_rules == {'play'}
+
+
+def test_get_rule_plan_is_cached():
+    """
+    Ensure that the rule plan is only compiled once per page class.
+    """
+    register_error_rule(Page, 'work', 'This should work')(dummy_func)
+    plan = get_rule_plan(Page)
+    with mock.patch('wagtail_checklist.rules.get_rules') as mock_get_rules:
+        assert get_rule_plan(Page) is plan
+        assert mock_get_rules.call_count == 0
+
+
+def test_get_rule_plan_invalidated_on_registration():
+    """
+    Ensure that registering or ignoring a rule rebuilds the rule plan.
+    """
+    register_error_rule(Page, 'work', 'This should work')(dummy_func)
+    assert len(get_rule_plan(Page).error_rules) == 1
+
+    register_warning_rule(Page, 'play', 'This should play')(dummy_func)
+    assert len(get_rule_plan(Page).warning_rules) == 1
+
+    dont_check_rule(Page, 'work')
+    plan = get_rule_plan(Page)
+    assert len(plan.error_rules) == 0
+    assert len(plan.warning_rules) == 1
+
+
 @mock.patch('wagtail_checklist.rules.logger')
 def test_check_rules(mock_logger):
     """
@@ -230,6 +290,255 @@ def test_check_rules(mock_logger):
     assert not warning_results[0].has_error
 
 
+def test_check_rules_does_not_modify_rules():
+    """
+    Ensure that checking rules returns fresh results, rather than storing them on the shared Rule.
+    """
+    @register_error_rule(Page, 'foo', 'Foo should be positive')
+    def validate_foo_positive(page, parent):
+        return page.foo > 0
+
+    page = mock.Mock()
+    parent = mock.Mock()
+    page.foo = 1
+    first_results, _ = check_rules(Page, page, parent)
+    page.foo = 0
+    second_results, _ = check_rules(Page, page, parent)
+
+    assert first_results[0] == RuleResult('foo', 'Foo should be positive', True, False)
+    assert second_results[0] == RuleResult('foo', 'Foo should be positive', False, False)
+    rule = rule_module.error_rules_registry[Page][0]
+    assert not hasattr(rule, 'is_valid')
+    assert not hasattr(rule, 'has_error')
+
+
+def test_check_rules_copies_page_once_per_request():
+    """
+    Ensure that rules share one copy of the page, except rules which mutate the page.
+    """
+    seen_pages = []
+
+    @register_error_rule(Page, 'foo', 'Foo should be positive')
+    def validate_foo_positive(page, parent):
+        seen_pages.append(page)
+        return page.foo > 0
+
+    @register_warning_rule(Page, 'foo', 'Foo should be large')
+    def validate_foo_large(page, parent):
+        seen_pages.append(page)
+        return page.foo > 2
+
+    @register_warning_rule(Page, 'foo', 'Foo should be large once incremented', mutates_page=True)
+    def validate_foo_incremented(page, parent):
+        seen_pages.append(page)
+        page.foo += 1
+        return page.foo > 2
+
+    page = mock.Mock()
+    page.foo = 2
+    parent = mock.Mock()
+    error_results, warning_results = check_rules(Page, page, parent)
+
+    assert [r.is_valid for r in error_results + warning_results] == [True, False, True]
+    assert page.foo == 2
+    assert seen_pages[0] is seen_pages[1]
+    assert seen_pages[0] is not page
+    assert seen_pages[2] is not seen_pages[0]
+    assert seen_pages[2] is not page
+
+
+@override_settings(WAGTAIL_CHECKLIST_ISOLATION='rule')
+def test_check_rules_copies_page_once_per_rule():
+    """
+    Ensure that the 'rule' isolation mode gives every rule its own copy of the page.
+    """
+    seen_pages = []
+
+    @register_error_rule(Page, 'foo', 'Foo should be positive')
+    def validate_foo_positive(page, parent):
+        seen_pages.append(page)
+        return page.foo > 0
+
+    @register_warning_rule(Page, 'foo', 'Foo should be large')
+    def validate_foo_large(page, parent):
+        seen_pages.append(page)
+        return page.foo > 2
+
+    page = mock.Mock()
+    page.foo = 1
+    check_rules(Page, page, mock.Mock())
+    assert seen_pages[0] is not seen_pages[1]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('isolation', ['request', 'rule'])
+def test_check_rules_stream_field_page(isolation):
+    """
+    Ensure that pages with a StreamField can be copied for rules in each isolation mode,
+    and that rules which modify the copy leave the original page alone.
+    """
+    @register_error_rule(ArticlePage, 'body', 'Body should have a heading')
+    def validate_body_heading(page, parent):
+        has_heading = page.body[0].block_type == 'heading'
+        page.body.stream_data.clear()
+        return has_heading
+
+    page = ArticlePage(title='My cool article', slug='my-cool-article')
+    page.body = ArticlePage._meta.get_field('body').stream_block.to_python([
+        {'type': 'heading', 'value': 'Hello'},
+        {'type': 'paragraph', 'value': 'Some words about mongooses'},
+    ])
+    with override_settings(WAGTAIL_CHECKLIST_ISOLATION=isolation):
+        error_results, _ = check_rules(ArticlePage, page, Page(title='Articles', slug='articles'))
+
+    assert error_results == [RuleResult('body', 'Body should have a heading', True, False)]
+    assert len(page.body) == 2
+
+
+def test_add_block_definitions():
+    """
+    Ensure that StreamField values can be deep copied once their block definitions are shared.
+    """
+    stream_block = blocks.StreamBlock([
+        ('heading', blocks.CharBlock()),
+        ('items', blocks.ListBlock(blocks.StructBlock([('text', blocks.CharBlock())]))),
+    ])
+    value = stream_block.to_python([
+        {'type': 'heading', 'value': 'Hello'},
+        {'type': 'items', 'value': [{'text': 'one'}, {'text': 'two'}]},
+    ])
+    memo = {}
+    add_block_definitions(stream_block, memo)
+    copied_value = deepcopy(value, memo)
+
+    assert copied_value is not value
+    assert copied_value.stream_block is stream_block
+    assert copied_value[0].value == 'Hello'
+    assert copied_value[1].value[1]['text'] == 'two'
+
+
+def test_check_rules_only_rechecks_changed_fields():
+    """
+    Ensure that previous results are re-used for rules which don't depend on the changed fields.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'foo', 'Foo should be positive', fields=['foo'])
+    def validate_foo_positive(page, parent):
+        checked_rules.append('foo')
+        return page.foo > 0
+
+    @register_error_rule(Page, 'bar', 'Bar should be positive', fields=['bar'])
+    def validate_bar_positive(page, parent):
+        checked_rules.append('bar')
+        return page.bar > 0
+
+    @register_warning_rule(Page, 'foo', 'Foo should be larger than bar')
+    def validate_foo_larger(page, parent):
+        checked_rules.append('any')
+        return page.foo > page.bar
+
+    page = mock.Mock()
+    page.foo = 1
+    page.bar = 0
+    previous_results = check_rules(Page, page, mock.Mock())
+    assert checked_rules == ['foo', 'bar', 'any']
+
+    checked_rules.clear()
+    page.bar = 2
+    error_results, warning_results = check_rules(
+        Page, page, mock.Mock(), changed_fields={'bar'}, previous_results=previous_results
+    )
+    assert checked_rules == ['bar', 'any']
+    assert error_results == [
+        RuleResult('foo', 'Foo should be positive', True, False),
+        RuleResult('bar', 'Bar should be positive', True, False),
+    ]
+    assert warning_results == [RuleResult('foo', 'Foo should be larger than bar', False, False)]
+
+
+def test_check_rules_blocking_only():
+    """
+    Ensure that blocking-only checks skip warning rules, check the cheapest error rules first,
+    and stop at the first failure.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'slow', 'Slow rule should pass')
+    def validate_slow(page, parent):
+        checked_rules.append('slow')
+        return page.slow_is_valid
+
+    @register_error_rule(Page, 'fast', 'Fast rule should pass')
+    def validate_fast(page, parent):
+        checked_rules.append('fast')
+        return page.fast_is_valid
+
+    @register_warning_rule(Page, 'warning', 'Warning rule should pass')
+    def validate_warning(page, parent):
+        checked_rules.append('warning')
+        return False
+
+    plan = get_rule_plan(Page)
+    rule_module.rule_costs = {plan.error_rules[0]: 1.0, plan.error_rules[1]: 0.001}
+    page = mock.Mock()
+    page.slow_is_valid = False
+    page.fast_is_valid = False
+    error_results, warning_results = check_rules(Page, page, mock.Mock(), mode=MODE_BLOCKING_ONLY)
+    assert error_results == [RuleResult('fast', 'Fast rule should pass', False, False)]
+    assert warning_results == []
+    assert checked_rules == ['fast']
+
+    checked_rules.clear()
+    page.fast_is_valid = True
+    page.slow_is_valid = True
+    assert check_rules(Page, page, mock.Mock(), mode=MODE_BLOCKING_ONLY) == ([], [])
+    assert checked_rules == ['fast', 'slow']
+
+
+def test_check_blocking_rules_timeout():
+    """
+    Ensure that rules which run past the timeout are not waited for.
+    """
+    @register_error_rule(Page, 'slow', 'Slow rule should pass')
+    def validate_slow(page, parent):
+        time.sleep(0.5)
+        return False
+
+    start_time = time.perf_counter()
+    assert check_blocking_rules(Page, mock.Mock(), mock.Mock(), timeout=0.05) is None
+    assert time.perf_counter() - start_time < 0.5
+
+
+def test_check_rules_records_rule_costs():
+    @register_error_rule(Page, 'work', 'This should work')
+    def validate_work(page, parent):
+        return True
+
+    check_rules(Page, mock.Mock(), mock.Mock())
+    rule = get_rule_plan(Page).error_rules[0]
+    assert rule_module.rule_costs[rule] >= 0
+
+
+def test_check_rules_unknown_mode():
+    with pytest.raises(ValueError):
+        check_rules(Page, mock.Mock(), mock.Mock(), mode='some')
+
+
+def test_rule_plan_version():
+    """
+    Ensure that the rule plan version changes when the rules change.
+    """
+    register_error_rule(Page, 'work', 'This should work')(dummy_func)
+    version = get_rule_plan(Page).version
+    rule_module.rule_plan_cache = {}
+    rule_module.rule_costs = {}
+    assert get_rule_plan(Page).version == version
+
+    register_error_rule(Page, 'play', 'This should play')(dummy_func)
+    assert get_rule_plan(Page).version != version
+
+
 def test_check_form_rules():
     dont_check_rule(Page, 'ignored')
     form = mock.Mock()
@@ -248,10 +557,10 @@ def test_check_form_rules():
 
     form_results = check_form_rules(Page, form)
     form.is_valid.call_count == 1
-    assert set([(r.func, r.name, r.message, r.is_valid, r.has_error) for r in form_results]) == set([
-        (None, 'title', 'This field is required.', False, False),
-        (None, 'title', 'This field is too long.', False, False),
-        (None, 'slug', 'This field is required.', False, False),
+    assert set(form_results) == set([
+        RuleResult('title', 'This field is required.', False, False),
+        RuleResult('title', 'This field is too long.', False, False),
+        RuleResult('slug', 'This field is required.', False, False),
     ])
 
 
@@ -270,6 +579,17 @@ def other_dummy_func(page, parent):
     return True
 
 
+async def async_dummy_func(page, parent):
+    """Dummy async rule function, used for testing"""
+    return True
+
+
+class DummyRule:
+    """Dummy callable rule, used for testing"""
+    def __call__(self, page, parent):
+        return True
+
+
 def assert_rule_equal(actual_rule, expected_rule):
     """
     Helper to compare two Rule objects
@@ -277,5 +597,3 @@ def assert_rule_equal(actual_rule, expected_rule):
     assert actual_rule.func == expected_rule.func
     assert actual_rule.name == expected_rule.name
     assert actual_rule.message == expected_rule.message
-    assert actual_rule.has_error == expected_rule.has_error
-    assert actual_rule.is_valid == expected_rule.is_valid
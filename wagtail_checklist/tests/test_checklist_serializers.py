@@ -0,0 +1,178 @@
+from unittest import mock
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+from wagtail.core.models import Page
+
+from testapp.models import ArticlePage
+from wagtail_checklist import pages as pages_module
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.rules import register_error_rule
+from wagtail_checklist.serializers import BatchChecklistSerializer, ChecklistSerializer
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    pages_module.page_content_types = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+@pytest.fixture
+def parent_page():
+    parent_page = Page(title='My cool photo index')
+    Page.add_root(instance=parent_page)
+    return parent_page
+
+
+@pytest.fixture
+def page():
+    parent_page = Page(title='My cool blog index')
+    Page.add_root(instance=parent_page)
+    page = Page(title='My cool blog')
+    parent_page.add_child(instance=page)
+    return page
+
+
+@pytest.fixture
+def article_page():
+    parent_page = ArticlePage(title='My cool article index')
+    Page.add_root(instance=parent_page)
+    page = ArticlePage(title='My cool article')
+    parent_page.add_child(instance=page)
+    return page
+
+
+@pytest.fixture
+def warm_content_types():
+    # Content types are cached by Django after their first lookup.
+    ContentType.objects.clear_cache()
+    ContentType.objects.get_for_model(Page)
+    ContentType.objects.get_for_model(ArticlePage)
+
+
+@pytest.mark.django_db
+def test_get_edit_page_num_queries(django_assert_num_queries, warm_content_types, page):
+    """
+    Ensure that the page and its parent are fetched in a single query.
+    """
+    serializer = ChecklistSerializer()
+    with django_assert_num_queries(1):
+        page_class, actual_page, actual_parent = serializer.get_edit_page({
+            'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        })
+
+    assert page_class is Page
+    assert actual_page == page
+    assert actual_parent == page.get_parent()
+
+
+@pytest.mark.django_db
+def test_get_edit_page_num_queries_specific(django_assert_num_queries, warm_content_types, article_page):
+    """
+    Ensure that the specific instance of a Page subclass is fetched in a second query.
+    """
+    serializer = ChecklistSerializer()
+    with django_assert_num_queries(2):
+        page_class, actual_page, actual_parent = serializer.get_edit_page({
+            'url': 'http://example.com/admin/pages/{}/edit/'.format(article_page.pk),
+        })
+
+    assert page_class is ArticlePage
+    assert isinstance(actual_page, ArticlePage)
+    assert actual_page == article_page
+    assert actual_parent.pk == article_page.get_parent().pk
+
+
+@pytest.mark.django_db
+def test_get_edit_page_without_parent(warm_content_types, parent_page):
+    serializer = ChecklistSerializer()
+    with pytest.raises(serializers.ValidationError):
+        serializer.get_edit_page({
+            'url': 'http://example.com/admin/pages/{}/edit/'.format(parent_page.pk),
+        })
+
+
+@pytest.mark.django_db
+def test_get_edit_page_missing(warm_content_types):
+    serializer = ChecklistSerializer()
+    with pytest.raises(Page.DoesNotExist):
+        serializer.get_edit_page({
+            'url': 'http://example.com/admin/pages/1234/edit/',
+        })
+
+
+@pytest.mark.django_db
+def test_get_create_page_num_queries(django_assert_num_queries, warm_content_types, parent_page):
+    """
+    Ensure that the parent is fetched in a single query.
+    """
+    serializer = ChecklistSerializer()
+    with django_assert_num_queries(1):
+        page_class, page, actual_parent = serializer.get_create_page({
+            'url': 'http://example.com/admin/pages/add/wagtailcore/page/{}/'.format(parent_page.pk),
+        })
+
+    assert page_class is Page
+    assert page.pk is None
+    assert actual_parent == parent_page
+
+
+@pytest.mark.django_db
+def test_iter_saved_page_checklists_in_chunks(page):
+    """
+    Ensure that saved pages are checked a chunk at a time, so the first checklists are sent
+    before the whole batch has been checked.
+    """
+    checked_titles = []
+
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        checked_titles.append(page.title)
+        return len(page.title) < 10
+
+    parent_page = page.get_parent()
+    pages = [page]
+    for title in ['Second', 'Third']:
+        pages.append(parent_page.add_child(instance=Page(title=title)))
+
+    serializer = BatchChecklistSerializer()
+    with mock.patch.object(BatchChecklistSerializer, 'chunk_size', 2):
+        checklists = serializer.iter_saved_page_checklists([p.pk for p in pages])
+        assert [next(checklists)['id'], next(checklists)['id']] == [pages[0].pk, pages[1].pk]
+        assert checked_titles == ['My cool blog', 'Second']
+        assert [checklist['id'] for checklist in checklists] == [pages[2].pk]
+
+    assert checked_titles == ['My cool blog', 'Second', 'Third']
+
+
+@pytest.mark.django_db
+def test_get_create_page_num_queries_specific_parent(django_assert_num_queries, warm_content_types, article_page):
+    """
+    Ensure that a parent which is a Page subclass is fetched in two queries, and then in one once its type is known.
+    """
+    serializer = ChecklistSerializer()
+    url = 'http://example.com/admin/pages/add/testapp/articlepage/{}/'.format(article_page.pk)
+    with django_assert_num_queries(2):
+        page_class, page, actual_parent = serializer.get_create_page({'url': url})
+
+    assert page_class is ArticlePage
+    assert isinstance(actual_parent, ArticlePage)
+    assert actual_parent == article_page
+
+    with django_assert_num_queries(1):
+        _, _, actual_parent = serializer.get_create_page({'url': url})
+
+    assert isinstance(actual_parent, ArticlePage)
+    assert actual_parent == article_page
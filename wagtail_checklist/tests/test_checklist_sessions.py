@@ -0,0 +1,86 @@
+import pytest
+from django.core.cache import cache
+from rest_framework import serializers
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.rules import register_error_rule
+from wagtail_checklist.sessions import ChecklistSession
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    cache.clear()
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+@pytest.fixture
+def page():
+    parent_page = Page(title='My cool blog index')
+    Page.add_root(instance=parent_page)
+    page = Page(title='My cool blog')
+    parent_page.add_child(instance=page)
+    return page
+
+
+def get_done_data(events):
+    events = list(events)
+    event, data = events[-1]
+    assert event == 'done'
+    return data
+
+
+@pytest.mark.django_db
+def test_session_applies_changes(page):
+    """
+    Ensure that messages after the first only need to contain the fields which have changed,
+    and that only the rules which depend on those fields are checked again.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'title', 'Title should be short', fields=['title'])
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 20
+
+    @register_error_rule(Page, 'seo_title', 'SEO title is required', fields=['seo_title'])
+    def validate_seo_title(page, parent):
+        checked_rules.append('seo_title')
+        return bool(page.seo_title)
+
+    session = ChecklistSession()
+    data = get_done_data(session.iter_events({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': page.title, 'slug': page.slug, 'seo_title': 'Cool'},
+    }))
+    assert data['checklist']['title'][0]['isValid'] is True
+    assert data['checklist']['seo title'][0]['isValid'] is True
+    assert checked_rules == ['title', 'seo_title']
+
+    data = get_done_data(session.iter_events({'changed': {'title': 'A much, much longer title'}}))
+    assert data['checklist']['title'][0]['isValid'] is False
+    assert data['checklist']['seo title'][0]['isValid'] is True
+    assert checked_rules == ['title', 'seo_title', 'title']
+
+    data = get_done_data(session.iter_events({'removed': ['seo_title']}))
+    assert data['checklist']['seo title'][0]['isValid'] is False
+    assert checked_rules == ['title', 'seo_title', 'title', 'seo_title']
+
+
+@pytest.mark.django_db
+def test_session_requires_page_first(page):
+    session = ChecklistSession()
+    with pytest.raises(serializers.ValidationError):
+        list(session.iter_events({'changed': {'title': 'My cool blog'}}))
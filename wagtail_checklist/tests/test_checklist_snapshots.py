@@ -0,0 +1,20 @@
+from wagtail_checklist.snapshots import Snapshot, get_field_name, get_fingerprint
+
+
+def test_get_field_name():
+    assert get_field_name('title') == 'title'
+    assert get_field_name('body-0-value') == 'body'
+    assert get_field_name('body-count') == 'body'
+
+
+def test_get_changed_fields():
+    snapshot = Snapshot('http://example.com/', {'title': 'a', 'slug': 'b', 'body-0-value': 'c'}, 'v1', [], [])
+    changed_fields = snapshot.get_changed_fields({'title': 'a', 'slug': 'x', 'body-0-value': 'c', 'body-1-value': 'd'})
+    assert changed_fields == {'slug', 'body'}
+
+
+def test_get_fingerprint():
+    fingerprint = get_fingerprint('http://example.com/', 'EDIT', {'title': 'a', 'slug': 'b'})
+    assert fingerprint == get_fingerprint('http://example.com/', 'EDIT', {'slug': 'b', 'title': 'a'})
+    assert fingerprint != get_fingerprint('http://example.com/', 'EDIT', {'slug': 'b', 'title': 'c'})
+    assert fingerprint != get_fingerprint('http://example.com/', 'CREATE', {'slug': 'b', 'title': 'a'})
@@ -0,0 +1,116 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.models import ChecklistStatus
+from wagtail_checklist.rules import register_error_rule, register_warning_rule
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+@pytest.fixture
+def page():
+    parent_page = Page(title='My cool blog index')
+    Page.add_root(instance=parent_page)
+    page = Page(title='My cool blog')
+    parent_page.add_child(instance=page)
+    return page
+
+
+@pytest.fixture
+def rules():
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 20
+
+    @register_warning_rule(Page, 'title', 'Title should mention blogs')
+    def validate_title_blog(page, parent):
+        return 'blog' in page.title
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_STATUS_REFRESH='sync')
+def test_status_refreshed_on_revision_save(page, rules):
+    page.title = 'A much, much longer title'
+    revision = page.save_revision()
+
+    status = ChecklistStatus.objects.get(page=page)
+    assert status.revision == revision
+    assert status.num_errors == 1
+    assert status.num_warnings == 1
+    assert sorted(status.failed_rules.values_list('type', 'name')) == [('ERROR', 'title'), ('WARNING', 'title')]
+    assert list(ChecklistStatus.objects.with_errors()) == [status]
+    assert list(ChecklistStatus.objects.failing_rule('title')) == [status]
+
+    # Fixing the page should clear the failures
+    page.title = 'My cool blog'
+    revision = page.save_revision()
+    revision.publish()
+    status = ChecklistStatus.objects.get(page=page)
+    assert status.revision == revision
+    assert status.num_errors == 0
+    assert status.num_warnings == 0
+    assert not status.failed_rules.exists()
+    assert not ChecklistStatus.objects.with_errors().exists()
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_STATUS_REFRESH='sync')
+def test_status_not_rechecked_when_current(page, rules):
+    """
+    Publishing a revision which has already been checked should not check it again.
+    """
+    revision = page.save_revision()
+    with mock.patch('wagtail_checklist.status.check_rules') as mock_check_rules:
+        revision.publish()
+        assert mock_check_rules.call_count == 0
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_STATUS_REFRESH='sync')
+@mock.patch('wagtail_checklist.status.logger')
+def test_status_refresh_failure_does_not_break_save(mock_logger, page, rules):
+    """
+    Ensure that a revision is still saved when its status can't be refreshed.
+    """
+    with mock.patch('wagtail_checklist.status.DatabaseStatusStore.save_status', side_effect=ValueError('Oh no')):
+        revision = page.save_revision()
+
+    assert revision.pk
+    assert not ChecklistStatus.objects.filter(page=page).exists()
+    assert mock_logger.exception.call_count == 1
+
+
+@pytest.mark.django_db
+def test_status_refresh_disabled_by_default(page, rules):
+    page.save_revision()
+    assert not ChecklistStatus.objects.exists()
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_STATUS_REFRESH=None)
+def test_audit_saves_status(page, rules):
+    page.title = 'A much, much longer title'
+    page.save_revision()
+    call_command('checklist_audit', '--save-status', '--root', str(page.pk), stdout=StringIO())
+    status = ChecklistStatus.objects.get(page=page)
+    assert status.num_errors == 1
@@ -0,0 +1,117 @@
+from unittest import mock
+
+import pytest
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.analysis import PageAnalysis
+from wagtail_checklist.rules import check_rules, register_error_rule, register_warning_rule
+from wagtail_checklist.terms import TermMatcher, forbid_terms, require_terms
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def test_whole_words():
+    matcher = TermMatcher(['mongoose', 'Guaranteed Returns', 'risk free', 'cat'])
+    text = 'Our mongooses offer guaranteed   returns, RISK-FREE! Concatenate the Mongoose.'
+    assert matcher.find(text) == ['Guaranteed Returns', 'risk free', 'mongoose']
+    assert matcher.find(text, first_only=True) == ['Guaranteed Returns']
+    assert matcher.contains(text)
+    assert not matcher.contains('A cattle farm')
+
+
+def test_whole_words_overlapping_terms():
+    matcher = TermMatcher(['new', 'new york', 'york times', 'new york times'])
+    assert matcher.find('The New York Times') == ['new', 'new york', 'new york times', 'york times']
+
+
+def test_whole_words_in_analysis_words():
+    page = mock.Mock()
+    page.body = '<p>A <b>Risk</b> free investment</p>'
+    matcher = TermMatcher(['risk free'])
+    assert matcher.find_words(PageAnalysis(page).field('body').words) == ['risk free']
+
+
+def test_case_sensitive():
+    matcher = TermMatcher(['NASA', 'nasa'], ignore_case=False)
+    assert matcher.find('nasa and NASA') == ['nasa', 'NASA']
+    assert not matcher.contains('Nasa')
+
+
+def test_duplicate_terms():
+    assert TermMatcher(['Mongoose', 'mongoose']).find('MONGOOSE') == ['Mongoose']
+    assert TermMatcher(['Mongoose', 'mongoose'], whole_words=False).find('MONGOOSE') == ['Mongoose']
+
+
+@pytest.mark.parametrize('term', ['!!!', '', 'e-mail', 'C++', "don't"])
+def test_whole_words_rejects_terms_which_are_not_words(term):
+    with pytest.raises(ValueError):
+        TermMatcher(['mongoose', term])
+
+
+def test_substrings_accept_terms_which_are_not_words():
+    matcher = TermMatcher(['e-mail', 'C++'], whole_words=False)
+    assert matcher.find('Send an E-mail about C++, not C') == ['e-mail', 'C++']
+    assert not matcher.contains('Send an e mail about C')
+
+
+def test_substrings():
+    matcher = TermMatcher(['he', 'she', 'his', 'hers', 'cat'], whole_words=False)
+    assert matcher.find('Ushers concatenate') == ['she', 'he', 'hers', 'cat']
+    assert matcher.find('ushers', first_only=True) == ['she']
+    assert matcher.find('dog') == []
+
+
+def test_substrings_match_naive_search():
+    terms = ['ab', 'abc', 'bca', 'c', 'caab', 'aaa', 'bb']
+    text = 'abcaabbbcaaaabca'
+    matcher = TermMatcher(terms, whole_words=False)
+    assert sorted(matcher.find(text)) == sorted(term for term in terms if term in text)
+
+
+def test_substrings_cannot_find_words():
+    with pytest.raises(ValueError):
+        TermMatcher(['mongoose'], whole_words=False).find_words(['mongoose'])
+
+
+def test_term_rules():
+    register_error_rule(Page, 'body', 'Body must not contain banned words', uses_analysis=True)(
+        forbid_terms('body', ['mongoose', 'risk free'])
+    )
+    register_warning_rule(Page, 'body', 'Body should mention the news')(require_terms('body', ['news', 'breaking']))
+    register_warning_rule(Page, 'body', 'Body should mention NASA')(
+        require_terms('body', ['NASA'], ignore_case=False, whole_words=False)
+    )
+
+    page = mock.Mock()
+    page.body = '<p>Breaking: a <i>risk free</i> trip to the nasa moon base</p>'
+    error_results, warning_results = check_rules(Page, page, mock.Mock())
+    assert not error_results[0].is_valid
+    assert warning_results[0].is_valid
+    assert not warning_results[1].is_valid
+
+
+def test_term_rules_find_terms():
+    validate_no_terms = forbid_terms('body', ['mongoose', 'risk free', 'cat'])
+    validate_has_term = require_terms('body', ['news', 'NASA'], ignore_case=False, whole_words=False)
+
+    page = mock.Mock()
+    page.body = '<p>A <i>risk free</i> mongoose, for NASA</p>'
+    analysis = PageAnalysis(page)
+    assert validate_no_terms.find_terms(page) == ['risk free', 'mongoose']
+    assert validate_no_terms.find_terms(page, analysis) == ['risk free', 'mongoose']
+    assert validate_has_term.find_terms(page) == ['NASA']
@@ -0,0 +1,142 @@
+import socket
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from wagtail.core.models import Page
+
+from wagtail_checklist import rules as rule_module
+from wagtail_checklist.declarative import LengthRule
+from wagtail_checklist.rules import Rule, check_rules, register_error_rule
+from wagtail_checklist.timings import (RuleTimingStats, StatsdTimingSink, get_rule_label, get_timing_stats,
+                                       record_rule_timing, reset_timing_stats)
+
+
+def setup_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    reset_timing_stats()
+
+
+def teardown_function(function):
+    # Reset the global rule stores
+    rule_module.error_rules_registry = {}
+    rule_module.warning_rules_registry = {}
+    rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+
+
+def validate_title_length(page, parent):
+    return len(page.title) < 20
+
+
+def test_check_rules_records_timings():
+    register_error_rule(Page, 'title', 'Title should be short')(validate_title_length)
+    page = mock.Mock()
+    page.title = 'Short'
+    check_rules(Page, page, mock.Mock())
+    check_rules(Page, page, mock.Mock())
+    stats = get_timing_stats()[('title', 'Title should be short')]
+    assert stats['count'] == 2
+    assert 0 <= stats['p50'] <= stats['p99'] <= stats['max']
+
+
+def test_check_rules_records_declarative_rule_timings():
+    register_error_rule(Page, 'title', 'Title cannot be longer than 20 characters')(LengthRule('title', max=20))
+    page = mock.Mock()
+    page.title = 'Short'
+    check_rules(Page, page, mock.Mock())
+    assert get_timing_stats()[('title', 'Title cannot be longer than 20 characters')]['count'] == 1
+
+
+def test_timing_stats_percentiles():
+    stats = RuleTimingStats(max_samples=100)
+    for milliseconds in range(1, 201):
+        stats.add(milliseconds / 1000)
+
+    # Only the most recent samples are kept, but every call is counted
+    assert stats.as_dict() == {
+        'count': 200,
+        'mean': pytest.approx(0.1005),
+        'p50': 0.15,
+        'p95': 0.195,
+        'p99': 0.199,
+        'max': 0.2,
+    }
+
+
+@mock.patch('wagtail_checklist.timings.logger')
+def test_slow_rule_warning(mock_logger):
+    rule = Rule(validate_title_length, 'title', 'Title should be short')
+    with override_settings(WAGTAIL_CHECKLIST_SLOW_RULE_THRESHOLD=0.5):
+        record_rule_timing(rule, 0.1)
+        mock_logger.warning.assert_not_called()
+        record_rule_timing(rule, 1)
+        mock_logger.warning.assert_called_once()
+
+
+@mock.patch('wagtail_checklist.timings.logger')
+def test_failing_sink(mock_logger):
+    rule = Rule(validate_title_length, 'title', 'Title should be short')
+    sinks = ['wagtail_checklist.tests.test_checklist_timings.FailingSink']
+    with override_settings(WAGTAIL_CHECKLIST_TIMING_SINKS=sinks):
+        record_rule_timing(rule, 0.1)
+
+    mock_logger.exception.assert_called_once()
+
+
+class FailingSink:
+    def record(self, rule, seconds):
+        raise ValueError()
+
+
+def test_statsd_sink():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(1)
+    port = receiver.getsockname()[1]
+    rule = Rule(validate_title_length, 'Page title', 'Title should be short')
+    try:
+        with override_settings(WAGTAIL_CHECKLIST_STATSD_HOST='127.0.0.1', WAGTAIL_CHECKLIST_STATSD_PORT=port):
+            StatsdTimingSink().record(rule, 0.0125)
+
+        assert receiver.recv(1024) == b'wagtail_checklist.rules.page_title.validate_title_length:12.500|ms'
+    finally:
+        receiver.close()
+
+
+def test_get_rule_label():
+    rule = Rule(validate_title_length, 'Page title!', 'Title should be short')
+    assert get_rule_label(rule) == 'page_title.validate_title_length'
+
+
+@pytest.mark.django_db
+def test_timings_command():
+    root_page = Page(title='Root')
+    Page.add_root(instance=root_page)
+    index_page = Page(title='Blog index')
+    root_page.add_child(instance=index_page)
+    index_page.add_child(instance=Page(title='A very long title indeed'))
+    register_error_rule(Page, 'title', 'Title should be short')(validate_title_length)
+    register_error_rule(Page, 'title', 'Title cannot be longer than 30 characters')(LengthRule('title', max=30))
+
+    stdout = StringIO()
+    call_command('checklist_timings', '--root', str(index_page.pk), stdout=stdout)
+    header, *rows = stdout.getvalue().splitlines()
+    assert header.split('\t') == ['rule', 'calls', 'p50', 'p95', 'p99', 'max', 'mean']
+    # Declarative rules are checked a column of pages at a time, and timed once per column
+    assert sorted(row.split('\t')[:2] for row in rows) == [
+        ['title - Title cannot be longer than 30 characters', '1'],
+        ['title - Title should be short', '2'],
+    ]
+
+
+@override_settings(WAGTAIL_CHECKLIST_TIMING_SINKS=['wagtail_checklist.timings.LoggingTimingSink'])
+def test_timings_command_without_aggregating_sink():
+    with pytest.raises(CommandError):
+        call_command('checklist_timings', stdout=StringIO())
@@ -3,11 +3,17 @@ from unittest import mock
 
 import pytest
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
 from django.urls import reverse
 from wagtail.core.models import Page
 
 from wagtail_checklist import rules as rule_module
+from wagtail_checklist.result_cache import get_result_cache_stats, reset_result_cache_stats
 from wagtail_checklist.rules import register_error_rule, register_warning_rule
+from wagtail_checklist.snapshots import get_fingerprint
 
 
 def setup_function(function):
@@ -15,6 +21,9 @@ def setup_function(function):
     rule_module.error_rules_registry = {}
     rule_module.warning_rules_registry = {}
     rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
+    cache.clear()
+    reset_result_cache_stats()
 
 
 def teardown_function(function):
@@ -22,6 +31,7 @@ def teardown_function(function):
     rule_module.error_rules_registry = {}
     rule_module.warning_rules_registry = {}
     rule_module.ignored_rules_registry = {}
+    rule_module.rule_plan_cache = {}
 
 
 @pytest.fixture()
@@ -202,3 +212,415 @@ def test_validate_create_page_with_rules_and_errors(mock_logger, post_checklist_
         }
     }
     assert actual_data == expected_data
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=0)
+def test_validate_edit_page_incremental(post_checklist_api, page):
+    """
+    Ensure that a client which sends back a fingerprint only has changed rules re-checked.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'title', 'Title should be short', fields=['title'])
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 20
+
+    @register_error_rule(Page, 'slug', 'Slug should be short', fields=['slug'])
+    def validate_slug_length(page, parent):
+        checked_rules.append('slug')
+        return len(page.slug) < 20
+
+    url = 'http://example.com/admin/pages/{}/edit/'.format(page.pk)
+    response = post_checklist_api({
+        'url': url,
+        'action': 'EDIT',
+        'fingerprint': None,
+        'page': {'title': 'Short title', 'slug': 'short'},
+    })
+    assert response.status_code == 200
+    assert checked_rules == ['title', 'slug']
+    fingerprint = response.data['fingerprint']
+
+    checked_rules.clear()
+    response = post_checklist_api({
+        'url': url,
+        'action': 'EDIT',
+        'fingerprint': fingerprint,
+        'page': {'title': 'A much, much longer title', 'slug': 'short'},
+    })
+    assert response.status_code == 200
+    assert checked_rules == ['title']
+    assert response.data['checklist'] == {
+        'title': [{'isValid': False, 'hasError': False, 'message': 'Title should be short', 'type': 'ERROR'}],
+        'slug': [{'isValid': True, 'hasError': False, 'message': 'Slug should be short', 'type': 'ERROR'}],
+    }
+    assert response.data['fingerprint'] != fingerprint
+
+    # An unknown fingerprint should check every rule
+    checked_rules.clear()
+    response = post_checklist_api({
+        'url': url,
+        'action': 'EDIT',
+        'fingerprint': 'expired',
+        'page': {'title': 'Short title', 'slug': 'short'},
+    })
+    assert response.status_code == 200
+    assert checked_rules == ['title', 'slug']
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=0)
+def test_validate_edit_page_changed_fields(post_checklist_api, page):
+    """
+    Ensure that a request with only the changed fields is checked against the full page data,
+    rebuilt from the request with the same fingerprint.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'title', 'Title should be short', fields=['title'])
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 20
+
+    @register_error_rule(Page, 'slug', 'Slug should be short', fields=['slug'])
+    def validate_slug_length(page, parent):
+        checked_rules.append('slug')
+        return len(page.slug) < 20
+
+    url = 'http://example.com/admin/pages/{}/edit/'.format(page.pk)
+    full_page_data = {'title': 'A much, much longer title', 'slug': 'short'}
+    response = post_checklist_api({
+        'url': url,
+        'action': 'EDIT',
+        'fingerprint': None,
+        'page': {'title': 'Short title', 'slug': 'short', 'search_description': 'Removed'},
+    })
+    assert response.status_code == 200
+    fingerprint = response.data['fingerprint']
+
+    checked_rules.clear()
+    response = post_checklist_api({
+        'url': url,
+        'action': 'EDIT',
+        'fingerprint': fingerprint,
+        'changed': {'title': 'A much, much longer title'},
+        'removed': ['search_description'],
+    })
+    assert response.status_code == 200
+    assert checked_rules == ['title']
+    assert response.data['checklist']['title'][0]['isValid'] is False
+    assert response.data['fingerprint'] == get_fingerprint(url, 'EDIT', full_page_data)
+
+
+@pytest.mark.django_db
+def test_validate_edit_page_changed_fields_expired(post_checklist_api, page):
+    """
+    Ensure that clients are asked for the full page data if the snapshot has expired.
+    """
+    response = post_checklist_api({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'fingerprint': 'expired',
+        'changed': {'title': 'My cool blog'},
+    })
+    assert response.status_code == 409
+    assert response.data['detail'].code == 'snapshot_expired'
+
+
+@pytest.mark.django_db
+def test_validate_edit_page_requires_page(post_checklist_api, page):
+    response = post_checklist_api({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'fingerprint': None,
+    })
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=60)
+def test_validate_edit_page_result_cache(post_checklist_api, page):
+    """
+    Ensure that identical requests are answered from the result cache, without checking rules.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 20
+
+    data = {
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': 'Short title', 'slug': 'short'},
+    }
+    first_response = post_checklist_api(data)
+    second_response = post_checklist_api(data)
+    assert first_response.status_code == 200
+    assert second_response.status_code == 200
+    assert first_response.data == second_response.data
+    assert checked_rules == ['title']
+    assert get_result_cache_stats() == {'hits': 1, 'misses': 1}
+
+    # Changing the page data should check the rules again
+    data['page']['title'] = 'A much, much longer title'
+    response = post_checklist_api(data)
+    assert response.data['checklist']['title'][0]['isValid'] is False
+    assert checked_rules == ['title', 'title']
+    assert get_result_cache_stats() == {'hits': 1, 'misses': 2}
+
+
+@pytest.mark.django_db
+def test_validate_edit_page_result_cache_disabled(post_checklist_api, page):
+    """
+    Ensure that the result cache is only used when RESULT_CACHE_TIMEOUT is set.
+    """
+    checked_rules = []
+
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        checked_rules.append('title')
+        return len(page.title) < 20
+
+    data = {
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': 'Short title', 'slug': 'short'},
+    }
+    post_checklist_api(data)
+    post_checklist_api(data)
+    assert checked_rules == ['title', 'title']
+    assert get_result_cache_stats() == {'hits': 0, 'misses': 0}
+
+
+@pytest.fixture
+def post_batch_checklist_api(client, user):
+    client.force_login(user)
+    checklist_url = reverse('wagtail_checklist_batch_api')
+
+    def post(data):
+        return client.post(checklist_url, data=json.dumps(data), content_type='application/json')
+
+    return post
+
+
+def read_json_lines(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db
+def test_validate_batch_requires_pages(post_batch_checklist_api):
+    response = post_batch_checklist_api({'pages': []})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_validate_batch_saved_pages(post_batch_checklist_api, page, parent_page):
+    """
+    Ensure that saved pages are checked against the registered rules, in the requested order.
+    """
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 10
+
+    response = post_batch_checklist_api({'pages': [page.pk, parent_page.pk, 1234]})
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert read_json_lines(response) == [
+        {
+            'id': page.pk,
+            'checklist': {
+                'title': [{'isValid': False, 'hasError': False, 'message': 'Title should be short', 'type': 'ERROR'}],
+            },
+        },
+        {'id': parent_page.pk, 'error': 'Page must have a parent'},
+        {'id': 1234, 'error': 'Page not found'},
+    ]
+
+
+@pytest.mark.django_db
+def test_validate_batch_payloads(post_batch_checklist_api, page, parent_page):
+    """
+    Ensure that page data from the editor is checked, as it is by the single page API.
+    """
+    edit_url = 'http://example.com/admin/pages/{}/edit/'.format(page.pk)
+    create_url = 'http://example.com/admin/pages/add/wagtailcore/page/{}/'.format(parent_page.pk)
+    response = post_batch_checklist_api({
+        'payloads': [
+            {'url': edit_url, 'action': 'EDIT', 'page': {'title': page.title, 'slug': page.slug}},
+            {'url': create_url, 'action': 'CREATE', 'page': {'title': 'My cool blog', 'slug': ''}},
+        ],
+    })
+    assert response.status_code == 200
+    assert read_json_lines(response) == [
+        {'url': edit_url, 'checklist': {}},
+        {
+            'url': create_url,
+            'checklist': {
+                'slug': [{'isValid': False, 'hasError': False, 'message': 'This field is required.', 'type': 'ERROR'}],
+            },
+        },
+    ]
+
+
+@pytest.mark.django_db
+def test_validate_batch_payloads_unknown_model(post_batch_checklist_api, page, parent_page):
+    """
+    Ensure that a payload for an unknown page model gives an error for that payload, and the rest are still checked.
+    """
+    unknown_url = 'http://example.com/admin/pages/add/wagtailcore/notapage/{}/'.format(parent_page.pk)
+    stale_content_type = ContentType.objects.create(app_label='wagtailcore', model='removedpage')
+    stale_url = 'http://example.com/admin/pages/add/wagtailcore/removedpage/{}/'.format(parent_page.pk)
+    edit_url = 'http://example.com/admin/pages/{}/edit/'.format(page.pk)
+    response = post_batch_checklist_api({
+        'payloads': [
+            {'url': unknown_url, 'action': 'CREATE', 'page': {'title': 'My cool blog', 'slug': 'my-cool-blog'}},
+            {'url': stale_url, 'action': 'CREATE', 'page': {'title': 'My cool blog', 'slug': 'my-cool-blog'}},
+            {'url': edit_url, 'action': 'EDIT', 'page': {'title': page.title, 'slug': page.slug}},
+        ],
+    })
+    assert response.status_code == 200
+    assert stale_content_type.model_class() is None
+    assert read_json_lines(response) == [
+        {'url': unknown_url, 'error': 'Page could not be checked'},
+        {'url': stale_url, 'error': 'Page could not be checked'},
+        {'url': edit_url, 'checklist': {}},
+    ]
+
+
+@pytest.fixture
+def post_stream_checklist_api(client, user):
+    client.force_login(user)
+    checklist_url = reverse('wagtail_checklist_stream_api')
+
+    def post(data):
+        return client.post(checklist_url, data=json.dumps(data), content_type='application/json')
+
+    return post
+
+
+def read_server_sent_events(response):
+    content = b''.join(response.streaming_content).decode()
+    events = []
+    for message in content.strip().split('\n\n'):
+        event_line, data_line = message.split('\n')
+        events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+
+    return events
+
+
+@pytest.mark.django_db
+def test_validate_stream(post_stream_checklist_api, page):
+    """
+    Ensure that each rule result is streamed as an event, followed by the full checklist.
+    """
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 10
+
+    @register_warning_rule(Page, 'slug', 'Slug should be short')
+    def validate_slug_length(page, parent):
+        return len(page.slug) < 100
+
+    response = post_stream_checklist_api({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': page.title, 'slug': page.slug},
+        'fingerprint': None,
+    })
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+    events = read_server_sent_events(response)
+    assert events[:2] == [
+        ('result', {
+            'key': 'rule:0', 'name': 'title', 'isValid': False, 'hasError': False,
+            'message': 'Title should be short', 'type': 'ERROR',
+        }),
+        ('result', {
+            'key': 'rule:1', 'name': 'slug', 'isValid': True, 'hasError': False,
+            'message': 'Slug should be short', 'type': 'WARNING',
+        }),
+    ]
+    event, data = events[2]
+    assert event == 'done'
+    assert data['fingerprint']
+    assert data['checklist'] == {
+        'title': [{'isValid': False, 'hasError': False, 'message': 'Title should be short', 'type': 'ERROR'}],
+        'slug': [{'isValid': True, 'hasError': False, 'message': 'Slug should be short', 'type': 'WARNING'}],
+    }
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_PROFILING='always')
+def test_validate_stream_closed_before_sent(post_stream_checklist_api, page):
+    """
+    Ensure that the request profile stops counting queries when the response is closed without being sent.
+    """
+    response = post_stream_checklist_api({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': page.title, 'slug': page.slug},
+    })
+    assert response.status_code == 200
+    assert connection.execute_wrappers
+
+    response.close()
+    assert connection.execute_wrappers == []
+
+
+@pytest.mark.django_db
+def test_validate_stream_missing_page(post_stream_checklist_api):
+    response = post_stream_checklist_api({
+        'url': 'http://example.com/admin/pages/1234/edit/',
+        'action': 'EDIT',
+        'page': {'title': 'My cool blog', 'slug': 'my-cool-blog'},
+    })
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@override_settings(WAGTAIL_CHECKLIST_PROFILING='header', WAGTAIL_CHECKLIST_RESULT_CACHE_TIMEOUT=0)
+def test_validate_edit_page_profile(client, user, page):
+    """
+    Ensure that requests with the profile header receive a breakdown of the time taken by each phase.
+    """
+    @register_error_rule(Page, 'title', 'Title should be short')
+    def validate_title_length(page, parent):
+        return len(page.title) < 20
+
+    client.force_login(user)
+    data = json.dumps({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': page.title, 'slug': page.slug},
+    })
+    checklist_url = reverse('wagtail_checklist_api')
+    response = client.post(checklist_url, data=data, content_type='application/json')
+    assert 'profile' not in response.data
+    assert not response.has_header('Server-Timing')
+
+    response = client.post(checklist_url, data=data, content_type='application/json', HTTP_X_CHECKLIST_PROFILE='1')
+    profile = response.data['profile']
+    assert [phase['name'] for phase in profile['phases']] == [
+        'parse', 'validate', 'url', 'page', 'cache', 'form_class', 'form', 'rules', 'serialize',
+    ]
+    page_phase = profile['phases'][3]
+    assert page_phase['queries'] >= 1
+    assert profile['queries'] >= page_phase['queries']
+    assert [(rule['name'], rule['message']) for rule in profile['rules']] == [('title', 'Title should be short')]
+    assert response['Server-Timing'].startswith('parse;dur=')
+
+
+@pytest.mark.django_db
+def test_checklist_api_requires_admin_access(client, page):
+    client.force_login(User.objects.create(username='reader'))
+    response = client.post(reverse('wagtail_checklist_api'), data=json.dumps({
+        'url': 'http://example.com/admin/pages/{}/edit/'.format(page.pk),
+        'action': 'EDIT',
+        'page': {'title': page.title, 'slug': page.slug},
+    }), content_type='application/json')
+    assert response.status_code == 403
@@ -0,0 +1,177 @@
+"""
+Per-rule timing instrumentation.
+
+Every time a rule is checked, its wall time is sent to each sink listed in the TIMING_SINKS setting:
+  - LoggingTimingSink: logs each timing at DEBUG level
+  - StatsdTimingSink: sends each timing to a statsd server over UDP
+  - AggregatingTimingSink: keeps call counts and recent timings in this process, for get_timing_stats
+
+Rules which take longer than the SLOW_RULE_THRESHOLD setting are also logged as warnings.
+Rules checked by a process pool are timed in the worker process.
+"""
+import logging
+import re
+import socket
+import threading
+from collections import deque
+
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from .conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+# The sinks listed in the TIMING_SINKS setting, created on first use.
+timing_sinks = None
+timing_sinks_lock = threading.Lock()
+
+
+def get_rule_label(rule):
+    """
+    Returns a name for `rule` which can be used in metric names: its name and function name.
+    Rule names are not unique, since many rules can check the same field.
+    """
+    func_name = getattr(rule.func, '__name__', type(rule.func).__name__)
+    return '.'.join(re.sub(r'\W+', '_', part.lower()).strip('_') for part in (rule.name, func_name))
+
+
+def get_timing_sinks():
+    """
+    Returns the sinks listed in the TIMING_SINKS setting, creating them on first use.
+    """
+    global timing_sinks
+    sinks = timing_sinks
+    if sinks is not None:
+        return sinks
+
+    with timing_sinks_lock:
+        if timing_sinks is None:
+            timing_sinks = [import_string(path)() for path in get_setting('TIMING_SINKS')]
+
+        return timing_sinks
+
+
+def clear_timing_sinks(**kwargs):
+    """
+    Throw away the sinks, so that they are created again from the TIMING_SINKS setting.
+    """
+    global timing_sinks
+    with timing_sinks_lock:
+        timing_sinks = None
+
+
+def record_rule_timing(rule, seconds):
+    """
+    Sends the time taken to check `rule` to each sink, and warns if the rule was slow.
+    """
+    threshold = get_setting('SLOW_RULE_THRESHOLD')
+    if threshold is not None and seconds > threshold:
+        logger.warning('Slow rule %s - %s took %.1fms', rule.name, rule.message, seconds * 1000)
+
+    for sink in get_timing_sinks():
+        try:
+            sink.record(rule, seconds)
+        except Exception:
+            # Instrumentation must never break a checklist.
+            logger.exception('Failed to record timing for rule %s - %s', rule.name, rule.message)
+
+
+class LoggingTimingSink:
+    """
+    Logs the time taken by each rule at DEBUG level.
+    """
+    def record(self, rule, seconds):
+        logger.debug('Checked rule %s - %s in %.3fms', rule.name, rule.message, seconds * 1000)
+
+
+class StatsdTimingSink:
+    """
+    Sends the time taken by each rule to a statsd server, as a timer named
+    <STATSD_PREFIX>.<rule name>.<function name>. Statsd counts timers, so this also gives call counts.
+    """
+    def __init__(self):
+        self.address = (get_setting('STATSD_HOST'), get_setting('STATSD_PORT'))
+        self.prefix = get_setting('STATSD_PREFIX')
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def record(self, rule, seconds):
+        metric = '{}.{}:{:.3f}|ms'.format(self.prefix, get_rule_label(rule), seconds * 1000)
+        self.socket.sendto(metric.encode(), self.address)
+
+
+class AggregatingTimingSink:
+    """
+    Keeps the call count, total time and most recent timings of each rule in this process.
+    """
+    def __init__(self):
+        self.max_samples = get_setting('TIMING_SAMPLES')
+
+    def record(self, rule, seconds):
+        with timing_stats_lock:
+            try:
+                stats = timing_stats[rule.name, rule.message]
+            except KeyError:
+                stats = timing_stats[rule.name, rule.message] = RuleTimingStats(self.max_samples)
+
+            stats.add(seconds)
+
+
+class RuleTimingStats:
+    """
+    The call count, total time and most recent timings of one rule.
+    """
+    def __init__(self, max_samples):
+        self.count = 0
+        self.total = 0
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def get_percentile(self, percent):
+        """
+        Returns the nearest-rank percentile of the recent timings, in seconds.
+        """
+        samples = sorted(self.samples)
+        if not samples:
+            return None
+
+        rank = max(0, -(-len(samples) * percent // 100) - 1)
+        return samples[rank]
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.get_percentile(50),
+            'p95': self.get_percentile(95),
+            'p99': self.get_percentile(99),
+            'max': max(self.samples) if self.samples else None,
+        }
+
+
+# RuleTimingStats recorded by AggregatingTimingSink, keyed by rule name and message.
+timing_stats = {
+    # ('title', 'Title should be short'): <RuleTimingStats>,
+}
+timing_stats_lock = threading.Lock()
+
+
+def get_timing_stats():
+    """
+    Returns a dict of timing stats in seconds (count, mean, p50, p95, p99 and max), keyed by
+    rule name and message, for the rules checked in this process.
+    """
+    with timing_stats_lock:
+        return {key: stats.as_dict() for key, stats in timing_stats.items()}
+
+
+def reset_timing_stats():
+    with timing_stats_lock:
+        timing_stats.clear()
+
+
+setting_changed.connect(clear_timing_sinks)
@@ -4,4 +4,6 @@ from . import views
 
 urlpatterns = [
     url(r'api/$', views.ChecklistAPIEndpoint.as_view(), name='wagtail_checklist_api'),
+    url(r'api/stream/$', views.ChecklistStreamAPIEndpoint.as_view(), name='wagtail_checklist_stream_api'),
+    url(r'api/batch/$', views.BatchChecklistAPIEndpoint.as_view(), name='wagtail_checklist_batch_api'),
 ]
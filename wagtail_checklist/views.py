@@ -1,10 +1,16 @@
+import json
 import logging
 
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from wagtail.core.models import Page
 
-from .serializers import ChecklistSerializer
+from .permissions import can_access_admin
+from .profiling import get_request_profile
+from .serializers import BatchChecklistSerializer, ChecklistSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +24,7 @@ class WagtailLoginRequiredMixin(UserPassesTestMixin):
     raise_exception = False
 
     def test_func(self):
-        if not self.request.user:
-            return False
-
-        user_permissions = self.request.user.get_all_permissions()
-        return 'wagtailadmin.access_admin' in user_permissions
+        return can_access_admin(self.request.user)
 
 
 class WagtailLoginRequiredAPIMixin(WagtailLoginRequiredMixin):
@@ -40,7 +42,108 @@ class ChecklistAPIEndpoint(WagtailLoginRequiredAPIMixin, APIView):
     Returns set of validation errors / warnings.
     """
     def post(self, request, *args, **kwargs):
-        serializer = ChecklistSerializer(data=request.data)
+        profile = get_request_profile(request)
+        try:
+            serializer = get_checklist_serializer(request, profile)
+            response_data = serializer.create(serializer.validated_data)
+        finally:
+            profile.stop()
+
+        response = Response(response_data, status=200)
+        if profile.enabled:
+            response['Server-Timing'] = profile.get_server_timing()
+
+        return response
+
+
+class BatchChecklistAPIEndpoint(WagtailLoginRequiredAPIMixin, APIView):
+    """
+    Receives a list of Wagtail Page ids and / or page data.
+    Streams back a set of validation errors / warnings for each page, one JSON object per line.
+    """
+    def post(self, request, *args, **kwargs):
+        serializer = BatchChecklistSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        checklists = serializer.iter_checklists(serializer.validated_data)
+        lines = (json.dumps(checklist) + '\n' for checklist in checklists)
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson', status=200)
+
+
+def get_checklist_serializer(request, profile):
+    """
+    Returns a ChecklistSerializer for the request data, which has been validated.
+    """
+    with profile.phase('parse'):
+        data = request.data
+
+    with profile.phase('validate'):
+        serializer = ChecklistSerializer(data=data, context={'profile': profile})
         serializer.is_valid(raise_exception=True)
-        response_data = serializer.create(serializer.validated_data)
-        return Response(response_data, status=200)
+
+    return serializer
+
+
+def format_server_sent_event(event, data):
+    """
+    Returns an event in the text/event-stream format.
+    """
+    return 'event: {}\ndata: {}\n\n'.format(event, json.dumps(data))
+
+
+def iter_server_sent_events(events, profile):
+    """
+    Yields each (event, data) tuple in the text/event-stream format.
+    The request profile is stopped once the stream has finished.
+    """
+    try:
+        for event, data in events:
+            yield format_server_sent_event(event, data)
+    finally:
+        profile.stop()
+
+
+class ProfiledStream:
+    """
+    The content of a streaming response, which stops the request profile when the response is closed.
+    A generator which was never started doesn't run its `finally` when it is closed, so a response
+    which is closed before it is sent must stop the profile itself.
+    """
+    def __init__(self, lines, profile):
+        self.lines = lines
+        self.profile = profile
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def close(self):
+        try:
+            self.lines.close()
+        finally:
+            self.profile.stop()
+
+
+class ChecklistStreamAPIEndpoint(WagtailLoginRequiredAPIMixin, APIView):
+    """
+    Receives Wagtail Page data from the admin edit / create page.
+    Streams back each validation error / warning as server-sent events, as soon as it has been checked,
+    followed by the full checklist. Used by editors when no WebSocket connection is available.
+    """
+    def post(self, request, *args, **kwargs):
+        profile = get_request_profile(request)
+        try:
+            serializer = get_checklist_serializer(request, profile)
+            page_class, page, parent_page = serializer.get_page(serializer.validated_data)
+        except Page.DoesNotExist:
+            profile.stop()
+            raise NotFound('Page not found')
+        except Exception:
+            profile.stop()
+            raise
+
+        events = serializer.iter_events(serializer.validated_data, page_class, page, parent_page)
+        lines = ProfiledStream(iter_server_sent_events(events, profile), profile)
+        response = StreamingHttpResponse(lines, content_type='text/event-stream', status=200)
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
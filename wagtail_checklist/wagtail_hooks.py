@@ -4,6 +4,10 @@ from django.contrib.staticfiles.templatetags.staticfiles import static
 from django.urls import reverse
 from wagtail.core import hooks
 
+from .conf import get_setting
+from .publishing import enforce_checklist, should_enforce_checklist
+from .serializers import PageActions
+
 
 @hooks.register('insert_editor_js')
 def editor_js():
@@ -13,6 +17,8 @@ def editor_js():
     # Load data for checklist app into client
     frontend_data = {
         'API_URL': reverse('wagtail_checklist_api'),
+        'STREAM_URL': reverse('wagtail_checklist_stream_api'),
+        'WEBSOCKET_URL': get_setting('WEBSOCKET_URL'),
     }
     load_js_data = '<script>var CHECKLIST = JSON.parse(\'{json}\')</script>'.format(
         json=json.dumps(frontend_data)
@@ -22,3 +28,21 @@ def editor_js():
     src = static('wagtail_checklist/js/wagtail_checklist.js')
     js_code = '<script type="text/javascript" defer src="{src}"></script>'.format(src=src)
     return load_js_data + js_code
+
+
+@hooks.register('before_edit_page')
+def enforce_checklist_before_edit(request, page):
+    """
+    Check the page's error rules before it is published from the edit view.
+    """
+    if should_enforce_checklist(request):
+        enforce_checklist(request, type(page), page, page.get_parent(), PageActions.EDIT)
+
+
+@hooks.register('before_create_page')
+def enforce_checklist_before_create(request, parent_page, page_class):
+    """
+    Check the page's error rules before it is published from the create view.
+    """
+    if should_enforce_checklist(request):
+        enforce_checklist(request, page_class, page_class(owner=request.user), parent_page, PageActions.CREATE)